@@ -0,0 +1,323 @@
+"""
+Benchmarks the whole pipeline: rescan-producer queues subreddit rescans,
+subreddit-rescanner fetches and stores the posts, rescan-producer queues their
+post rescans and post-rescanner fetches and stores every comment.
+
+The services run in this process against stand-ins: a fake Reddit HTTP server
+(standins/fake_reddit.py) and an in-process broker (standins/broker.py). Postgres
+is real; point DB_* at a local, disposable database, as its tables are truncated.
+
+Reports posts/sec, comments/sec, DB rows/sec and p50/p99 message latency (from
+being published to being handled) per stage.
+
+Usage, from the repository root:
+
+    set -a; source source/.env.example; set +a
+    DB_HOSTNAME=localhost python benchmarks/bench_pipeline.py --subreddits 4 --posts 200 --comments 20 --depth 3
+"""
+import argparse
+import importlib
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+from typing import Callable, Dict, List
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "source"))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+# measure the services, not the rate limiter or the log output
+os.environ.update({
+    "RATE_LIMIT_INITIAL_RPS": "1000000",
+    "RATE_LIMIT_MAX_RPS": "1000000",
+    "RATE_LIMIT_BURST": "1000000",
+    "HTTP_CASSETTE_MODE": "off",
+    "IS_DEV": "true"
+})
+os.environ.setdefault("TALOS_COMPONENT_NAME", "bench")
+
+from psycopg2.extensions import AsIs  # noqa: E402
+
+from talos.api import Requests  # noqa: E402
+from talos.components import consumer_component  # noqa: E402
+from talos.config import Settings  # noqa: E402
+from talos.db import ContextDatabase  # noqa: E402
+from talos.logger import logger, LogLevel  # noqa: E402
+
+from standins.broker import InProcessBroker, InProcessRabbitMQ, get_in_process_pool  # noqa: E402
+from standins.fake_reddit import FakeReddit, FakeRedditServer, LocalRedditAdapter, TreeShape  # noqa: E402
+
+TABLES = (
+    Settings.SUBSCRIPTIONS_TABLE,
+    Settings.SUBREDDIT_RESCAN_TABLE,
+    Settings.INITIAL_POSTS_TABLE,
+    Settings.POST_RESCAN_TABLE,
+    Settings.UPDATED_POSTS_TABLE,
+    Settings.SCRAPED_COMMENTS_TABLE
+)
+
+
+def load_service(image: str, module: str):
+    """
+    Imports the entrypoint module of a service from its image. Every service has
+    its own top-level `lib` package, so those of the previous service are
+    unloaded first; modules keep references to the `lib` they were imported with.
+    RabbitMQ and its pool are replaced with the in-process stand-ins throughout
+    the service.
+    """
+    for name in [name for name in sys.modules if name == "lib" or name.startswith("lib.")]:
+        del sys.modules[name]
+
+    src = str(ROOT / "source" / "docker-images" / image / "src")
+    sys.path.insert(0, src)
+    try:
+        service = importlib.import_module(module)
+    finally:
+        sys.path.remove(src)
+
+    for name, loaded in list(sys.modules.items()):
+        if name == module or name.startswith("lib."):
+            if hasattr(loaded, "RabbitMQ"):
+                loaded.RabbitMQ = InProcessRabbitMQ
+            if hasattr(loaded, "get_pool"):
+                loaded.get_pool = get_in_process_pool
+
+    return service
+
+
+def reset_database(subreddits: int) -> None:
+    with ContextDatabase() as cdb:
+        cdb.execute((ROOT / "benchmarks" / "standins" / "schema.sql").read_text())
+        cdb.execute(
+            "TRUNCATE %s RESTART IDENTITY CASCADE",
+            (AsIs(", ".join(TABLES)),)
+        )
+
+        for index in range(subreddits):
+            cdb.execute(
+                "INSERT INTO %s (subreddit) VALUES (%s)",
+                (AsIs(Settings.SUBSCRIPTIONS_TABLE), f"bench{index}")
+            )
+
+
+def count_rows() -> Dict[str, int]:
+    counts = {}
+
+    with ContextDatabase() as cdb:
+        for table in TABLES:
+            cdb.execute("SELECT COUNT(*) FROM %s", (AsIs(table),), auto_commit=False)
+            counts[table] = cdb.fetchone()[0]
+
+    return counts
+
+
+def percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    return ordered[round(percent / 100 * (len(ordered) - 1))]
+
+
+class Stage:
+    """
+    Drains a queue with `workers` instances of a consumer service, each on its
+    own thread with its own Requests, until the queue is empty and no message is
+    being handled (handling a message may publish more to the same queue).
+    Services in batch mode are handed up to batch_size messages at once, and
+    messages they requeue are published again.
+    """
+
+    def __init__(self, broker: InProcessBroker, queue_name: str, create_component: Callable, workers: int, reddit_address: str):
+        self.broker = broker
+        self.queue_name = queue_name
+        self.create_component = create_component
+        self.workers = workers
+        self.reddit_address = reddit_address
+
+        self.latencies: List[float] = []
+        self.failures = 0
+        self.requests: List[Requests] = []
+
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def run(self) -> float:
+        """
+        Returns:
+            float: The time taken to drain the queue, in seconds.
+        """
+        start = time.perf_counter()
+
+        threads = [threading.Thread(target=self._work) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.perf_counter() - start
+
+        for requests_obj in self.requests:
+            requests_obj.close()
+
+        return elapsed
+
+    def _work(self) -> None:
+        requests_obj = Requests()
+        requests_obj.session.mount("https://", LocalRedditAdapter(
+            self.reddit_address,
+            pool_maxsize=Settings.REQUESTS_POOL_MAXSIZE
+        ))
+
+        component = self.create_component()
+        component.requests_obj = requests_obj
+
+        with self._lock:
+            self.requests.append(requests_obj)
+
+        batch_size = getattr(component, "batch_size", 1)
+
+        while True:
+            with self._lock:
+                items = []
+                while len(items) < batch_size:
+                    item = self.broker.get(self.queue_name)
+                    if item is None:
+                        break
+                    items.append(item)
+
+                if not items and self._in_flight == 0:
+                    return
+                self._in_flight += len(items)
+
+            if not items:
+                time.sleep(0.001)
+                continue
+
+            messages = [message for _, message in items]
+            outcomes = [True] * len(items)
+            try:
+                if batch_size > 1:
+                    outcomes = component.handle_batch_with_retry(messages)
+                else:
+                    component.handle_one_pass_with_retry(messages[0])
+            except Exception:
+                logger.exception(f"Failed to handle messages={messages}.")
+                # dropped rather than requeued
+                outcomes = [None] * len(items)
+                self.failures += len(items)
+            finally:
+                with self._lock:
+                    self._in_flight -= len(items)
+                    for (published_at, message), outcome in zip(items, outcomes):
+                        if outcome:
+                            self.latencies.append(time.perf_counter() - published_at)
+                        elif outcome is False:
+                            self.broker.publish(self.queue_name, message)
+
+
+def summarise(name: str, stage: Stage, elapsed: float, rows_before: Dict[str, int], rows_after: Dict[str, int], **throughput) -> Dict:
+    rows_written = sum(rows_after[table] - rows_before[table] for table in TABLES)
+    bytes_received = sum(requests_obj.metrics["bytes_received"] for requests_obj in stage.requests)
+
+    return {
+        "stage": name,
+        "seconds": round(elapsed, 3),
+        "messages": len(stage.latencies),
+        "failures": stage.failures,
+        **{key: round(value / elapsed, 1) for key, value in throughput.items()},
+        "db_rows_per_sec": round(rows_written / elapsed, 1),
+        "latency_p50_ms": round(percentile(stage.latencies, 50) * 1000, 2),
+        "latency_p99_ms": round(percentile(stage.latencies, 99) * 1000, 2),
+        "http_mib_received": round(bytes_received / 2 ** 20, 2)
+    }
+
+
+def main(args: argparse.Namespace) -> List[Dict]:
+    shape = TreeShape(posts=args.posts, comments=args.comments, depth=args.depth, more_pages=args.more_pages)
+
+    broker = InProcessBroker()
+    InProcessRabbitMQ.broker = broker
+    # consumers publish through their own long-lived connection
+    consumer_component.RabbitMQ = InProcessRabbitMQ
+
+    rescan_producer = load_service("rescan-producer", "rescan_producer")
+    subreddit_rescanner = load_service("subreddit-rescanner", "subreddit_rescanner")
+    post_rescanner = load_service("post-rescanner", "post_rescanner")
+
+    producer = rescan_producer.RescanProducer(retry_attempts=3, time_between_attempts=1)
+
+    reset_database(args.subreddits)
+    results = []
+
+    with FakeRedditServer(FakeReddit(shape)) as server:
+        producer.produce_subreddit_rescans()
+
+        rows_before = count_rows()
+        stage = Stage(
+            broker, Settings.SUBREDDIT_RESCAN_QUEUE,
+            lambda: subreddit_rescanner.SubredditRescanner(3, 1, Settings.SUBREDDIT_RESCAN_QUEUE),
+            args.workers, server.address
+        )
+        elapsed = stage.run()
+        rows_after = count_rows()
+
+        posts = rows_after[Settings.INITIAL_POSTS_TABLE] - rows_before[Settings.INITIAL_POSTS_TABLE]
+        results.append(summarise("subreddit-rescanner", stage, elapsed, rows_before, rows_after, posts_per_sec=posts))
+
+        producer.produce_post_rescans()
+
+        rows_before = count_rows()
+        stage = Stage(
+            broker, Settings.POST_RESCAN_QUEUE,
+            lambda: post_rescanner.PostRescanner(3, 1, Settings.POST_RESCAN_QUEUE),
+            args.workers, server.address
+        )
+        elapsed = stage.run()
+        rows_after = count_rows()
+
+        posts = rows_after[Settings.UPDATED_POSTS_TABLE] - rows_before[Settings.UPDATED_POSTS_TABLE]
+        comments = rows_after[Settings.SCRAPED_COMMENTS_TABLE] - rows_before[Settings.SCRAPED_COMMENTS_TABLE]
+        results.append(summarise(
+            "post-rescanner", stage, elapsed, rows_before, rows_after,
+            posts_per_sec=posts, comments_per_sec=comments
+        ))
+
+    expected_posts = args.subreddits * shape.posts
+    expected_comments = expected_posts * shape.comments_per_post()
+    if posts != expected_posts or comments != expected_comments:
+        print(
+            f"warning: stored {posts}/{expected_posts} posts and {comments}/{expected_comments} comments",
+            file=sys.stderr
+        )
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subreddits", type=int, default=2)
+    parser.add_argument("--posts", type=int, default=100, help="Posts per subreddit.")
+    parser.add_argument("--comments", type=int, default=20, help="Comments per level of each comment tree.")
+    parser.add_argument("--depth", type=int, default=3, help="Levels in each comment tree, fetched via continueThreads.")
+    parser.add_argument("--more-pages", type=int, default=1, help="moreComments pages in each comment tree.")
+    parser.add_argument("--workers", type=int, default=1, help="Instances of each consumer service.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON, e.g. to compare runs.")
+    parser.add_argument("--verbose", action="store_true", help="Show the services' logs.")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.setLevel(LogLevel.EMERGENCY)
+
+    results = main(args)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print(result.pop("stage"))
+            for key, value in result.items():
+                print(f"  {key:<20} {value}")
@@ -0,0 +1,100 @@
+"""
+Compares the JSON backends in talos.util.serialization on Reddit API responses.
+
+Responses are read from a directory of recorded .json files if given, otherwise
+a postcomments-shaped response is generated. Each backend decodes the responses
+(as Requests does) and encodes every comment (as the db helpers do).
+
+Usage, from the repository root:
+
+    set -a; source source/.env.example; set +a
+    PYTHONPATH=source python benchmarks/bench_serialization.py [--responses DIR] [--repeat N]
+"""
+import argparse
+import pathlib
+import random
+import string
+import time
+from typing import Dict, List
+
+from talos.util.serialization import SERIALIZERS
+
+
+def generate_response(n_comments: int) -> Dict:
+    """
+    Generates a response shaped like gateway.reddit.com/desktopapi/v1/postcomments.
+    """
+    rng = random.Random(0)
+
+    def text(length: int) -> str:
+        return "".join(rng.choice(string.ascii_letters + " ") for _ in range(length))
+
+    comments = {}
+    for i in range(n_comments):
+        comment_id = f"t1_{i:06x}"
+        comments[comment_id] = {
+            "id": comment_id,
+            "parentId": f"t1_{rng.randrange(max(i, 1)):06x}" if i else None,
+            "postId": "t3_abcdef",
+            "author": text(12),
+            "created": 1690000000.0 + i,
+            "score": rng.randint(-50, 5000),
+            "depth": rng.randint(0, 10),
+            "isStickied": False,
+            "media": {
+                "richtextContent": {"document": [{"e": "par", "c": [{"e": "text", "t": text(rng.randint(20, 400))}]}]},
+                "type": "rtjson"
+            },
+            "next": {"id": f"t1_{i + 1:06x}"} if i + 1 < n_comments else None
+        }
+
+    return {
+        "posts": {"t3_abcdef": {"id": "t3_abcdef", "title": text(80), "numComments": n_comments}},
+        "comments": comments,
+        "moreComments": {},
+        "continueThreads": {}
+    }
+
+
+def load_responses(directory: str, n_comments: int) -> List[bytes]:
+    """
+    Returns:
+        List[bytes]: The raw bodies of the recorded responses, or of one generated response.
+    """
+    if directory:
+        return [path.read_bytes() for path in sorted(pathlib.Path(directory).glob("*.json"))]
+
+    return [SERIALIZERS["json"].dumps(generate_response(n_comments)).encode("utf-8")]
+
+
+def bench(responses: List[bytes], repeat: int) -> None:
+    total_bytes = sum(len(body) for body in responses)
+    print(f"{len(responses)} response(s), {total_bytes / 1024:.0f} KiB, best of {repeat}\n")
+    print(f"{'backend':<8} {'decode ms':>10} {'MiB/s':>8} {'encode ms':>10}")
+
+    for name, serializer in SERIALIZERS.items():
+        decode_times, encode_times = [], []
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decoded = [serializer.loads(body) for body in responses]
+            decode_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for response in decoded:
+                for comment in response.get("comments", {}).values():
+                    serializer.dumps(comment)
+            encode_times.append(time.perf_counter() - start)
+
+        decode, encode = min(decode_times), min(encode_times)
+        print(f"{name:<8} {decode * 1000:>10.2f} {total_bytes / decode / 2 ** 20:>8.1f} {encode * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", help="Directory of recorded response bodies (*.json).")
+    parser.add_argument("--comments", type=int, default=2000, help="Comments in the generated response.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bench(load_responses(args.responses, args.comments), args.repeat)
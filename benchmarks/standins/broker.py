@@ -0,0 +1,169 @@
+"""
+An in-process stand-in for RabbitMQ, with the interface of talos.queuing.RabbitMQ.
+Messages are held in memory with the time they were published, so the runner can
+measure how long each spent between being published and being handled.
+"""
+import collections
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from talos.exceptions.queuing import NotInitialisedException, UnknownQueueException
+
+
+class InProcessBroker:
+    """
+    The queues shared by every InProcessRabbitMQ, keyed by name, then by priority.
+    As with RabbitMQ priority queues, get() takes from the highest priority first.
+    """
+
+    def __init__(self):
+        self.queues: Dict[str, Dict[int, Deque[Tuple[float, str]]]] = collections.defaultdict(
+            lambda: collections.defaultdict(collections.deque)
+        )
+        self.published = collections.Counter()
+        self.lock = threading.Lock()
+
+    def publish(self, queue_name: str, message: str, priority: int = None) -> None:
+        with self.lock:
+            self.queues[queue_name][priority or 0].append((time.perf_counter(), message))
+            self.published[queue_name] += 1
+
+    def get(self, queue_name: str) -> Optional[Tuple[float, str]]:
+        """
+        Returns:
+            Optional[Tuple[float, str]]: The time the next message was published and the message,
+                or None if the queue is empty.
+        """
+        with self.lock:
+            for priority in sorted(self.queues[queue_name], reverse=True):
+                queue = self.queues[queue_name][priority]
+                if queue:
+                    return queue.popleft()
+
+            return None
+
+    def count(self, queue_name: str) -> int:
+        with self.lock:
+            return sum(len(queue) for queue in self.queues[queue_name].values())
+
+
+class InProcessRabbitMQ:
+    """
+    Replaces talos.queuing.RabbitMQ within the services under benchmark,
+    publishing to and consuming from `broker`.
+    """
+    broker: InProcessBroker = None
+
+    def __init__(self, queues: Tuple[str]):
+        if not isinstance(queues, tuple):
+            queues = (queues,)
+
+        self.queues = queues
+        self.connected = False
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disconnect()
+
+    def connect(self) -> None:
+        self.connected = True
+
+    def ensure_connected(self) -> None:
+        self.connected = True
+
+    def disconnect(self) -> None:
+        self.connected = False
+
+    def publish_message(self, queue_name: str, message: str, expiration_ms: int = None, priority: int = None) -> None:
+        self._validate(queue_name)
+        self.broker.publish(queue_name, message, priority)
+
+    def publish_messages(self, queue_name: str, messages: List[str], priorities: List[int] = None) -> None:
+        self.publish_batch(queue_name, messages, priorities=priorities)
+
+    def publish_batch(self, queue_name: str, messages: List[str], window: int = None, priorities: List[int] = None) -> List[bool]:
+        for message, priority in zip(messages, priorities or [None] * len(messages)):
+            self.publish_message(queue_name, message, priority=priority)
+
+        return [True] * len(messages)
+
+    def publish_delayed(self, queue_name: str, messages: List[str], due_at: List[datetime], priorities: List[int] = None, window: int = None) -> List[bool]:
+        # delays aren't simulated, messages are due as soon as they're published
+        return self.publish_batch(queue_name, messages, priorities=priorities)
+
+    def consume_one_message(self, queue_name: str) -> Optional[str]:
+        self._validate(queue_name)
+
+        item = self.broker.get(queue_name)
+        return item[1] if item else None
+
+    def consume_n_messages(self, queue_name: str, n: int) -> List[str]:
+        return [self.consume_one_message(queue_name) for _ in range(n)]
+
+    def continually_consume_messages(self, queue_name: str, callback_function: Callable, prefetch_count: int = 1, workers: int = 1) -> None:
+        self._validate(queue_name)
+
+        while True:
+            item = self.broker.get(queue_name)
+            if item is None:
+                time.sleep(0.01)
+                continue
+
+            callback_function(item[1])
+
+    def continually_consume_batches(
+        self,
+        queue_name: str,
+        callback_function: Callable,
+        batch_size: int,
+        batch_window_ms: int,
+        prefetch_count: int,
+        workers: int = 1
+    ) -> None:
+        self._validate(queue_name)
+
+        while True:
+            items = [self.broker.get(queue_name) for _ in range(batch_size)]
+            messages = [item[1] for item in items if item is not None]
+            if not messages:
+                time.sleep(batch_window_ms / 1000)
+                continue
+
+            for message, outcome in zip(messages, callback_function(messages)):
+                if not outcome:
+                    self.broker.publish(queue_name, message)
+
+    def get_message_count(self, queue_name: str) -> int:
+        self._validate(queue_name)
+        return self.broker.count(queue_name)
+
+    def _validate(self, queue_name: str) -> None:
+        if not self.connected:
+            raise NotInitialisedException()
+
+        if queue_name not in self.queues:
+            raise UnknownQueueException()
+
+
+class InProcessRabbitMQPool:
+    """
+    Replaces talos.queuing.RabbitMQPool, handing out InProcessRabbitMQ instances.
+    """
+
+    @contextmanager
+    def acquire(self, queues: Tuple[str]) -> Iterator[InProcessRabbitMQ]:
+        with InProcessRabbitMQ(queues) as rabbitmq:
+            yield rabbitmq
+
+    def close(self) -> None:
+        pass
+
+
+def get_in_process_pool() -> InProcessRabbitMQPool:
+    return InProcessRabbitMQPool()
@@ -0,0 +1,241 @@
+"""
+A local stand-in for the Reddit endpoints the services call, generating
+deterministic responses from the ids in each request:
+
+    GET  reddit.com/                                   homepage with an accessToken
+    POST gql.reddit.com/                               subreddit listing, paged by `after`
+    GET  gateway.reddit.com/desktopapi/v1/postcomments/<post>[/<parent>]
+    POST gateway.reddit.com/desktopapi/v1/morecomments/<post>
+
+Each post has a comment tree `depth` levels deep, with `comments` comments per
+level. The first level is returned by postcomments with `more_pages` moreComments
+stubs; every level but the last ends in a continueThread to the next.
+"""
+import base64
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+ORIGINAL_HOST_HEADER = "X-Original-Host"
+
+
+class TreeShape:
+    """
+    The generated data, per the benchmark parameters.
+    """
+
+    def __init__(self, posts: int, comments: int, depth: int, more_pages: int):
+        self.posts = posts
+        self.comments = comments
+        self.depth = depth
+        self.more_pages = more_pages
+
+    def comments_per_post(self) -> int:
+        return self.comments * (self.depth + self.more_pages)
+
+
+def _link(items: List[Tuple[str, Dict]]) -> Tuple[Dict, Dict, Dict]:
+    """
+    Chains the items with "next" pointers and splits them into the three comment
+    sections of a postcomments response.
+    """
+    sections = {"rawComment": {}, "moreComment": {}, "continueThread": {}}
+
+    for index, (kind, item) in enumerate(items):
+        if index + 1 < len(items):
+            item["next"] = {"id": items[index + 1][1]["id"]}
+        sections[kind][item["id"]] = item
+
+    return sections["rawComment"], sections["moreComment"], sections["continueThread"]
+
+
+class FakeReddit:
+    """
+    Generates the responses. Kept apart from the HTTP handler so the shape of
+    a benchmark is known to the runner too.
+    """
+    # older than the 7 days after which posts are rescanned, so rescans are due at once
+    CREATED_AT = (datetime.now(timezone.utc) - timedelta(days=8)).strftime("%Y-%m-%dT%H:%M:%S.%f%z")
+
+    def __init__(self, shape: TreeShape):
+        self.shape = shape
+
+    def homepage(self) -> bytes:
+        return b'<html><script>{"accessToken":"bench-token","expires":3600}</script></html>'
+
+    def listing(self, body: Dict) -> Dict:
+        variables = body["variables"]
+        subreddit = variables["name"]
+        page_size = variables.get("pageSize", 100)
+
+        start = 0
+        if variables.get("after"):
+            after = base64.b64decode(variables["after"]).decode("utf-8")
+            start = int(after.rsplit("_", 1)[1]) + 1
+
+        edges = [
+            {
+                "node": {
+                    "__typename": "SubredditPost",
+                    "id": f"t3_{subreddit}_{index}",
+                    "title": f"Post {index} in {subreddit}",
+                    "createdAt": self.CREATED_AT,
+                    "score": index
+                }
+            }
+            for index in range(start, min(start + page_size, self.shape.posts))
+        ]
+
+        return {"data": {"subredditInfoByName": {"elements": {"edges": edges}}}}
+
+    def postcomments(self, post_id: str, parent_id: str = None) -> Dict:
+        level = 0 if parent_id is None else int(parent_id.rsplit("_", 2)[1]) + 1
+        parent = parent_id
+
+        items = []
+        if parent_id is not None:
+            # a continued thread starts with the comment it continues from
+            items.append(("rawComment", self._comment(post_id, parent_id, None)))
+
+        for index in range(self.shape.comments):
+            comment = self._comment(post_id, f"t1_{post_id}_{level}_{index}", parent)
+            items.append(("rawComment", comment))
+            parent = comment["id"]
+
+        if level == 0:
+            for page in range(self.shape.more_pages):
+                items.append(("moreComment", {
+                    "id": f"more_{post_id}_{page}",
+                    "postId": post_id,
+                    "parentId": None,
+                    "token": f"{post_id}:{page}"
+                }))
+
+        if level + 1 < self.shape.depth:
+            items.append(("continueThread", {
+                "id": f"continue_{post_id}_{level}",
+                "postId": post_id,
+                "parentId": parent
+            }))
+
+        comments, more_comments, continue_threads = _link(items)
+        response = {
+            "comments": comments,
+            "moreComments": more_comments,
+            "continueThreads": continue_threads
+        }
+
+        if parent_id is None:
+            response["posts"] = {post_id: {"id": post_id, "title": "Updated", "numComments": self.shape.comments_per_post()}}
+
+        return response
+
+    def morecomments(self, post_id: str, body: Dict) -> Dict:
+        page = int(body["token"].rsplit(":", 1)[1])
+
+        items = [
+            ("rawComment", self._comment(post_id, f"t1_{post_id}_more{page}_{index}", None))
+            for index in range(self.shape.comments)
+        ]
+        comments, more_comments, continue_threads = _link(items)
+
+        return {"comments": comments, "moreComments": more_comments, "continueThreads": continue_threads}
+
+    def _comment(self, post_id: str, comment_id: str, parent_id: str) -> Dict:
+        return {
+            "id": comment_id,
+            "parentId": parent_id,
+            "postId": post_id,
+            "author": "bench",
+            "score": len(comment_id),
+            "media": {"richtextContent": {"document": [{"e": "par", "c": [{"e": "text", "t": "x" * 200}]}]}}
+        }
+
+
+class FakeRedditHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+    reddit: FakeReddit = None
+
+    def do_GET(self):
+        host = self.headers.get(ORIGINAL_HOST_HEADER, "")
+        parts = self.path.strip("/").split("/")
+
+        if host.endswith("gateway.reddit.com") and "postcomments" in parts:
+            index = parts.index("postcomments")
+            self._send_json(self.reddit.postcomments(*parts[index + 1:index + 3]))
+        else:
+            self._send(self.reddit.homepage(), "text/html")
+
+    def do_POST(self):
+        host = self.headers.get(ORIGINAL_HOST_HEADER, "")
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        parts = self.path.strip("/").split("/")
+
+        if host.startswith("gql."):
+            self._send_json(self.reddit.listing(body))
+        elif "morecomments" in parts:
+            self._send_json(self.reddit.morecomments(parts[parts.index("morecomments") + 1], body))
+        else:
+            self.send_error(404)
+
+    def _send_json(self, payload: Dict):
+        self._send(json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _send(self, payload: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeRedditServer:
+    """
+    Serves a FakeReddit on a random local port from a background thread.
+    """
+
+    def __init__(self, reddit: FakeReddit):
+        handler = type("Handler", (FakeRedditHandler,), {"reddit": reddit})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.address = f"127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class LocalRedditAdapter(HTTPAdapter):
+    """
+    Sends every request to the FakeRedditServer at `address` over plain HTTP,
+    passing the host it was meant for in a header. Mounted on a Requests session
+    in place of its https:// adapter.
+    """
+
+    def __init__(self, address: str, **kwargs):
+        super().__init__(**kwargs)
+        self.address = address
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        original = requests.utils.urlparse(request.url)
+
+        request = request.copy()
+        request.headers[ORIGINAL_HOST_HEADER] = original.netloc
+        request.url = original._replace(scheme="http", netloc=self.address).geturl()
+
+        return super().send(request, **kwargs)
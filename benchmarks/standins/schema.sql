@@ -0,0 +1,50 @@
+-- The tables the services read and write, per the queries in their db_helpers,
+-- named as in .env.example. Created by bench_pipeline.py if missing.
+
+CREATE TABLE IF NOT EXISTS subscriptions (
+    subreddit VARCHAR(30) PRIMARY KEY,
+    is_subscribed BOOLEAN NOT NULL DEFAULT TRUE,
+    time_between_scans INT NOT NULL DEFAULT 3600,
+    last_scanned TIMESTAMP,
+    is_currently_queued BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS subreddit_rescans (
+    id SERIAL PRIMARY KEY,
+    subreddit VARCHAR(30) NOT NULL,
+    ran_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS initial_posts (
+    id VARCHAR(40) NOT NULL,
+    metadata JSONB NOT NULL,
+    rescan_id INT NOT NULL REFERENCES subreddit_rescans(id)
+);
+
+CREATE TABLE IF NOT EXISTS post_rescans (
+    id SERIAL PRIMARY KEY,
+    scheduled_start_at TIMESTAMPTZ NOT NULL,
+    began_processing BOOLEAN NOT NULL DEFAULT FALSE,
+    started_at TIMESTAMP,
+    last_seen TIMESTAMP,
+    post_id VARCHAR(40) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS updated_posts (
+    id SERIAL PRIMARY KEY,
+    updated_metadata JSONB NOT NULL,
+    post_scan_id INT NOT NULL REFERENCES post_rescans(id)
+);
+
+CREATE TABLE IF NOT EXISTS scraped_comments (
+    id VARCHAR(80) NOT NULL,
+    parent_id VARCHAR(80),
+    comment_data JSONB NOT NULL,
+    post_scan_id INT NOT NULL REFERENCES post_rescans(id)
+);
+
+-- the unique indexes INITIAL_POSTS_CONFLICT_KEYS, UPDATED_POSTS_CONFLICT_KEYS and
+-- SCRAPED_COMMENTS_CONFLICT_KEYS require, see the README
+CREATE UNIQUE INDEX IF NOT EXISTS initial_posts_id ON initial_posts (id);
+CREATE UNIQUE INDEX IF NOT EXISTS updated_posts_post_scan_id ON updated_posts (post_scan_id);
+CREATE UNIQUE INDEX IF NOT EXISTS scraped_comments_id_post_scan_id ON scraped_comments (id, post_scan_id);
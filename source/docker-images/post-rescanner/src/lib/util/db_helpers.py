@@ -1,25 +1,27 @@
-import json
 from typing import List
 
 from psycopg2.extensions import AsIs
 
 from talos.db import ContextDatabase, TransactionalDatabase
 from talos.config import Settings
+from talos.util import serialization
 
 
 def insert_updated_post(tdb: TransactionalDatabase, post: dict, post_rescan_id: int) -> None:
     """
-    Inserts the new post meta data into the database.
+    Inserts the new post meta data into the database. With UPDATED_POSTS_CONFLICT_KEYS,
+    meta data already inserted for the post rescan, e.g. by a redelivered message, is skipped.
 
     Args:
         tdb (TransactionalDatabase): The current database transaction.
         post (dict): The JSON object containing the post meta data.
         post_rescan_id (int): The ID of the post rescan which the update is associated with.
     """
-    tdb.execute(
-        query="INSERT INTO %s (updated_metadata, post_scan_id) VALUES (%s, %s)",
-        params=(AsIs(Settings.UPDATED_POSTS_TABLE),
-                json.dumps(post), post_rescan_id)
+    tdb.insert_rows(
+        table=Settings.UPDATED_POSTS_TABLE,
+        columns=("updated_metadata", "post_scan_id"),
+        rows=[(serialization.dumps(post), post_rescan_id)],
+        on_conflict=Settings.UPDATED_POSTS_CONFLICT_KEYS
     )
 
 
@@ -53,16 +55,32 @@ def set_post_rescan_started(tdb: TransactionalDatabase, post_rescan_id: int) ->
 
 def insert_comments(tdb: TransactionalDatabase, comments: List[dict], post_rescan_id: int) -> None:
     """
-    Inserts a batch of comments - those in the API response - into the database.
+    Inserts a batch of comments - those in the API response - into the database,
+    in one COPY rather than a round trip per comment. With SCRAPED_COMMENTS_CONFLICT_KEYS,
+    which COPY can't honour, they are inserted with multi-row INSERTs instead, and
+    comments already inserted for the post rescan, e.g. by a redelivered message, are skipped.
 
     Args:
         tdb (TransactionalDatabase): The current database transaction.
         comments (List[dict]): A list of all the JSON comment objects to insert.
         post_rescan_id (int): The ID of the post rescan which the comments are associated with.
     """
-    for comment in comments:
-        tdb.execute(
-            query="INSERT INTO %s (id, parent_id, comment_data, post_scan_id) VALUES (%s, %s, %s, %s)",
-            params=(AsIs(Settings.SCRAPED_COMMENTS_TABLE),
-                    comment["id"], comment["parentId"], json.dumps(comment), post_rescan_id)
+    columns = ("id", "parent_id", "comment_data", "post_scan_id")
+    rows = [
+        (comment["id"], comment["parentId"], serialization.dumps(comment), post_rescan_id)
+        for comment in comments
+    ]
+
+    if Settings.SCRAPED_COMMENTS_CONFLICT_KEYS:
+        tdb.insert_rows(
+            table=Settings.SCRAPED_COMMENTS_TABLE,
+            columns=columns,
+            rows=rows,
+            on_conflict=Settings.SCRAPED_COMMENTS_CONFLICT_KEYS
+        )
+    else:
+        tdb.copy_rows(
+            table=Settings.SCRAPED_COMMENTS_TABLE,
+            columns=columns,
+            rows=rows
         )
@@ -1,56 +1,113 @@
-import json
-from typing import List
+from typing import List, Tuple, Union
 
 from talos.queuing import RabbitMQ
+from talos.queuing.messages import PostRescanType, encode_post_rescan, post_rescan_priority
 from talos.config import Settings
 
-def queue_more_comments_scan(rabbitmq: RabbitMQ, more_comments: List[dict], post_rescan_id: int) -> None:
+def more_comments_messages(more_comments: List[dict], post_rescan_id: int, depth: int) -> List[Tuple[Union[str, bytes], int]]:
+    """
+    Builds the POST_RESCAN_QUEUE messages with the API requests to fetch nested
+    'show more' comment sections.
+
+    Args:
+        more_comments (List[Dict]): List of moreComment objects.
+        post_rescan_id (int): The ID of the post rescan which the comments originated.
+        depth (int): The depth of the requests, one more than that of the request which found them.
+
+    Returns:
+        List[Tuple[Union[str, bytes], int]]: A message per moreComment object, see
+            encode_post_rescan(), and its priority, see post_rescan_priority().
+    """
+    priority = post_rescan_priority(PostRescanType.MORE, depth)
+
+    return [
+        (encode_post_rescan(
+            post_id=comment["postId"],
+            post_rescans_id=post_rescan_id,
+            type=PostRescanType.MORE,
+            token=comment["token"],
+            depth=depth
+        ), priority) for comment in more_comments
+    ]
+
+def continue_thread_messages(continue_threads: List[dict], post_rescan_id: int, depth: int) -> List[Tuple[Union[str, bytes], int]]:
+    """
+    Builds the POST_RESCAN_QUEUE messages with the API requests to fetch nested
+    'continue thread' comment sections.
+
+    Args:
+        continue_threads (List[Dict]): List of continueThread objects.
+        post_rescan_id (int): The ID of the post rescan which the comments originated.
+        depth (int): The depth of the requests, one more than that of the request which found them.
+
+    Returns:
+        List[Tuple[Union[str, bytes], int]]: A message per continueThread object, see
+            encode_post_rescan(), and its priority, see post_rescan_priority().
+    """
+    priority = post_rescan_priority(PostRescanType.CONTINUE, depth)
+
+    return [
+        (encode_post_rescan(
+            post_id=comment["postId"],
+            post_rescans_id=post_rescan_id,
+            type=PostRescanType.CONTINUE,
+            parent_id=comment["parentId"],
+            depth=depth
+        ), priority) for comment in continue_threads
+    ]
+
+def queue_post_rescan_messages(rabbitmq: RabbitMQ, messages: List[Tuple[Union[str, bytes], int]]) -> None:
+    """
+    Queues messages into POST_RESCAN_QUEUE as one confirmed batch.
+
+    Args:
+        rabbitmq (RabbitMQ): The active RabbitMQ instance used to publish the messages.
+        messages (List[Tuple[Union[str, bytes], int]]): The messages and their priorities,
+            e.g. from more_comments_messages().
+
+    Raises:
+        PublishNotConfirmed (RabbitMQNonFatalException): If any message was not confirmed.
+    """
+    rabbitmq.publish_messages(
+        queue_name=Settings.POST_RESCAN_QUEUE,
+        messages=[message for message, _ in messages],
+        priorities=[priority for _, priority in messages]
+    )
+
+def queue_more_comments_scan(rabbitmq: RabbitMQ, more_comments: List[dict], post_rescan_id: int, depth: int) -> None:
     """
     Queues into POST_RESCAN_QUEUE subsequent API requests to fetch nested 'show more'
-    comment sections.
+    comment sections, as one confirmed batch.
 
     Args:
         rabbitmq (RabbitMQ): The active RabbitMQ instance used to publish the message.
         more_comments (List[Dict]): List of moreComment objects.
         post_rescan_id (int): The ID of the post rescan which the comments originated.
+        depth (int): The depth of the requests, see more_comments_messages().
+
+    Raises:
+        PublishNotConfirmed (RabbitMQNonFatalException): If any message was not confirmed.
     """
-    for comment in more_comments:
-        rabbitmq.publish_message(
-            queue_name=Settings.POST_RESCAN_QUEUE,
-            message=json.dumps({
-                "post_id": comment["postId"],
-                "post_rescans_id": post_rescan_id,
-                "type": "more",
-                "api_request": {
-                    "url": f"https://gateway.reddit.com/desktopapi/v1/morecomments/{comment['postId']}",
-                    "method": 1,  # Requests.TYPE_POST,
-                    "body": {
-                        "token": comment["token"]
-                    }
-                }
-            })
-        )
-
-def queue_continue_thread_scan(rabbitmq: RabbitMQ, continue_threads: List[dict], post_rescan_id: int) -> None:
+    queue_post_rescan_messages(
+        rabbitmq=rabbitmq,
+        messages=more_comments_messages(more_comments, post_rescan_id, depth)
+    )
+
+def queue_continue_thread_scan(rabbitmq: RabbitMQ, continue_threads: List[dict], post_rescan_id: int, depth: int) -> None:
     """
     Queues into POST_RESCAN_QUEUE subsequent API requests to fetch nested 'continue thread'
-    comment sections.
+    comment sections, as one confirmed batch.
 
     Args:
         rabbitmq (RabbitMQ): The active RabbitMQ instance used to publish the message.
         continue_threads (List[Dict]): List of continueThread objects.
         post_rescan_id (int): The ID of the post rescan which the comments originated.
+        depth (int): The depth of the requests, see continue_thread_messages().
+
+    Raises:
+        PublishNotConfirmed (RabbitMQNonFatalException): If any message was not confirmed.
     """
-    for comment in continue_threads:
-        rabbitmq.publish_message(
-            queue_name=Settings.POST_RESCAN_QUEUE,
-            message=json.dumps({
-                "post_id": comment["postId"],
-                "post_rescans_id": post_rescan_id,
-                "type": "continue",
-                "api_request": {
-                    "url": f"https://gateway.reddit.com/desktopapi/v1/postcomments/{comment['postId']}/{comment['parentId']}",
-                    "method": 0,  # Requests.TYPE_GET
-                }
-            })
-        )
\ No newline at end of file
+    queue_post_rescan_messages(
+        rabbitmq=rabbitmq,
+        messages=continue_thread_messages(continue_threads, post_rescan_id, depth)
+    )
@@ -1,3 +1,4 @@
+from talos.components import Supervisor
 from talos.config import Settings
 
 from post_rescanner import PostRescanner
@@ -9,4 +10,4 @@ if __name__ == "__main__":
         producing_queue=Settings.POST_RESCAN_QUEUE
     )
 
-    post_rescanner.run()
+    Supervisor(post_rescanner).run()
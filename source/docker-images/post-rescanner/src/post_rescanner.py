@@ -1,13 +1,13 @@
-import json
 import sys
-import time
-from typing import Tuple
+from typing import List, Optional, Tuple, Union
 
 from talos.components import ConsumerComponent
 from talos.config import Settings
+from talos.exceptions.base import NonFatalException
+from talos.exceptions.queuing import UnknownMessageFormat
+from talos.queuing.messages import decode_post_rescan
 from talos.logger import logger
 from talos.api import Requests
-from talos.queuing import RabbitMQ
 from talos.db import ContextDatabase, TransactionalDatabase
 
 from lib.util import CommentCollector, db_helpers, queue_helpers
@@ -23,7 +23,14 @@ class PostRescanner(ConsumerComponent):
             time_between_attempts (int): The time to wait between attempts in seconds.
             producing_queue (str): The name of the queue from which to receive data.
         """
-        super().__init__(retry_attempts, time_between_attempts, producing_queue)
+        super().__init__(
+            retry_attempts,
+            time_between_attempts,
+            producing_queue,
+            # enough deliveries for every worker to fill a batch
+            prefetch_count=max(Settings.CONSUMER_PREFETCH_COUNT, Settings.POST_RESCAN_BATCH_SIZE * Settings.CONSUMER_WORKERS),
+            batch_size=Settings.POST_RESCAN_BATCH_SIZE
+        )
         Settings.validate()
 
     def handle_critical_error(self) -> None:
@@ -33,22 +40,31 @@ class PostRescanner(ConsumerComponent):
         logger.alert("handle_critical_error() hit. Exiting...")
         sys.exit(1)
 
-    def collect_post_data(self, message: dict) -> Tuple[dict, dict, dict, dict]:
+    def collect_post_data(self, message: dict) -> Tuple[Optional[dict], dict, dict, dict]:
         """
         Collects all data from Reddit using the information in the RabbitMQ message.
 
         Args:
-            message (str): The message from the POST_RESCAN_QUEUE
+            message (dict): The decoded message from the POST_RESCAN_QUEUE, see decode_post_rescan().
 
         Returns:
-            Tuple[Dict, Dict, Dict, Dict]: response, reaw_comments, more_comments, continue_threads
+            Tuple[Optional[Dict], Dict, Dict, Dict]: post (the updated post of a 'base layer'
+                message, otherwise None), raw_comments, more_comments, continue_threads
+
+        Raises:
+            KeyError: If a 'base layer' response is missing the post.
         """
         response = self.requests_obj.send_from_message(message["api_request"])
         raw_comments, more_comments, continue_threads = CommentCollector(
             api_response=response
         ).collect_comments()
 
-        return response, raw_comments, more_comments, continue_threads
+        post = response["posts"][message["post_id"]] if message["type"] == "base" else None
+
+        if message["type"] == "continue":
+            raw_comments.pop(0)  # duplicate root in continue thread
+
+        return post, raw_comments, more_comments, continue_threads
 
     def handle_base_layer_message(self, tdb: TransactionalDatabase, post: dict, post_rescan_id: int) -> None:
         """
@@ -70,10 +86,11 @@ class PostRescanner(ConsumerComponent):
             post_rescan_id=post_rescan_id
         )
 
-    def process_found_comments(self, tdb: TransactionalDatabase, raw_comments: dict, more_comments: dict, continue_threads: dict, post_rescan_id: int) -> None:
+    def process_found_comments(self, tdb: TransactionalDatabase, raw_comments: dict, more_comments: dict, continue_threads: dict, post_rescan_id: int, depth: int) -> List[Tuple[Union[str, bytes], int]]:
         """
-        Inserts the raw_comments into the database, and queues subsequent requests
-        for nested moreComments and continueThreads.
+        Inserts the raw_comments into the database, and builds the subsequent requests
+        for nested moreComments and continueThreads, which the caller queues with
+        queue_helpers.queue_post_rescan_messages().
 
         Args:
             tdb (TransactionalDatabase): The current database transaction.
@@ -81,6 +98,10 @@ class PostRescanner(ConsumerComponent):
             more_comments (dict): The objects used to fetch moreComments.
             continue_threads (dict): The objects used to fetch continueThreads.
             post_rescan_id (int): The post rescan ID these comments are associated with.
+            depth (int): The depth of the request which found the comments.
+
+        Returns:
+            List[Tuple[Union[str, bytes], int]]: The subsequent messages and their priorities.
         """
         db_helpers.insert_comments(
             tdb=tdb,
@@ -88,26 +109,54 @@ class PostRescanner(ConsumerComponent):
             post_rescan_id=post_rescan_id
         )
 
-        with RabbitMQ((Settings.POST_RESCAN_QUEUE,)) as rabbitmq:
-            queue_helpers.queue_more_comments_scan(
-                rabbitmq=rabbitmq,
-                more_comments=more_comments,
-                post_rescan_id=post_rescan_id
-            )
+        return (
+            queue_helpers.more_comments_messages(more_comments, post_rescan_id, depth + 1)
+            + queue_helpers.continue_thread_messages(continue_threads, post_rescan_id, depth + 1)
+        )
+
+    def store_post_data(self, tdb: TransactionalDatabase, message: dict, post: Optional[dict], raw_comments: dict, more_comments: dict, continue_threads: dict) -> List[Tuple[Union[str, bytes], int]]:
+        """
+        Stores the data collect_post_data() collected for a message, see
+        handle_base_layer_message() and process_found_comments().
+
+        Args:
+            tdb (TransactionalDatabase): The current database transaction.
+            message (dict): The decoded message the data was collected for.
+            post (Optional[dict]): The updated post, if a 'base layer' message.
+            raw_comments (dict): The comments found in the post.
+            more_comments (dict): The objects used to fetch moreComments.
+            continue_threads (dict): The objects used to fetch continueThreads.
+
+        Returns:
+            List[Tuple[Union[str, bytes], int]]: The subsequent messages and their priorities.
+        """
+        post_rescan_id = message["post_rescans_id"]
 
-            queue_helpers.queue_continue_thread_scan(
-                rabbitmq=rabbitmq,
-                continue_threads=continue_threads,
+        if post is not None:  # base layer contains updated post
+            self.handle_base_layer_message(
+                tdb=tdb,
+                post=post,
                 post_rescan_id=post_rescan_id
             )
 
-    def _handle_one_pass(self, message: str) -> None:
+        return self.process_found_comments(
+            tdb,
+            raw_comments,
+            more_comments,
+            continue_threads,
+            post_rescan_id,
+            message["depth"],
+        )
+
+    def _handle_one_pass(self, message: bytes) -> None:
         """
-        Receives a rescan message from POST_RESCAN_QUEUE, of the following structure;
+        Receives a rescan message from POST_RESCAN_QUEUE, which decode_post_rescan()
+        reads into the following structure, whichever format it was sent in;
 
             "post_id": ...,
             "post_rescans_id": ...,
             "type": ...,
+            "depth": ...,
             "api_request": {
                 "url": f"https://gateway.reddit.com/desktopapi/v1/...",
                 "method": 1,  # Requests.TYPE_POST,
@@ -119,45 +168,81 @@ class PostRescanner(ConsumerComponent):
         It uses this to then send the API request, fetching 'base layer' data or nested
         comment data. Within the base layer data is the 'aged' post meta data, which is
         inserted into UPDATED_POSTS_TABLE, as well as unnested comments. Any nested comments
-        present in the comment section is then requeued again into POST_RESCAN_QUEUE.
+        present in the comment section is then requeued again into POST_RESCAN_QUEUE, at a
+        priority by depth, see post_rescan_priority().
 
         Args:
-            message (str): The message containing the information required to rescan.
+            message (bytes): The message containing the information required to rescan.
         """
-        message = json.loads(message)
-        post_rescan_id = message["post_rescans_id"]
+        message = decode_post_rescan(message)
 
         logger.info(
-            f"Processing post_rescan={post_rescan_id} (post_id={message['post_id']})..."
+            f"Processing post_rescan={message['post_rescans_id']} (post_id={message['post_id']})..."
         )
 
-        response, raw_comments, more_comments, continue_threads = self.collect_post_data(
-            message)
+        post, raw_comments, more_comments, continue_threads = self.collect_post_data(message)
+
+        with TransactionalDatabase() as tdb:
+            subsequent_messages = self.store_post_data(tdb, message, post, raw_comments, more_comments, continue_threads)
+
+            # the consumer connection, POST_RESCAN_QUEUE is also the producing queue
+            queue_helpers.queue_post_rescan_messages(
+                rabbitmq=self.get_rabbitmq(),
+                messages=subsequent_messages
+            )
+
+        logger.info(
+            f"Processed {len(raw_comments)} comments, queued a further {len(subsequent_messages)} requests."
+        )
+
+    def _handle_batch(self, messages: List[bytes]) -> List[bool]:
+        """
+        Handles a batch of rescan messages from POST_RESCAN_QUEUE as _handle_one_pass() does,
+        but stores every response in one transaction and queues all of the subsequent
+        requests as one publish batch, rather than a transaction and publish per message.
+
+        A message whose API request fails with a NonFatalException is requeued. One which
+        can't be decoded, or whose response is missing data, would fail on every delivery,
+        so it is logged and dropped rather than requeued. The rest of the batch is stored.
+
+        Args:
+            messages (List[bytes]): The messages containing the information required to rescan.
+
+        Returns:
+            List[bool]: For each message, True if it was handled or dropped, False to requeue it.
+        """
+        outcomes = [True] * len(messages)
+        collected = []
+
+        for index, message in enumerate(messages):
+            try:
+                message = decode_post_rescan(message)
+                collected.append((message, *self.collect_post_data(message)))
+            except NonFatalException:
+                logger.notice(f"Failed to fetch post_rescan={message['post_rescans_id']}, requeueing it.")
+                outcomes[index] = False
+            except (UnknownMessageFormat, ValueError, KeyError, IndexError) as e:
+                logger.error(f"Failed to handle post rescan message={message}: {e!r}, dropping it.")
+
+        subsequent_messages = []
+        comment_count = 0
 
-        if message["type"] == "continue":
-            raw_comments.pop(0)  # duplicate root in continue thread
-        
         with TransactionalDatabase() as tdb:
-            if message["type"] == "base":
-                self.handle_base_layer_message(  # base layer contains updated post
-                    tdb=tdb,
-                    post=response["posts"][message["post_id"]],
-                    post_rescan_id=post_rescan_id
-                )
-
-            self.process_found_comments(
-                tdb,
-                raw_comments,
-                more_comments,
-                continue_threads,
-                post_rescan_id,
+            for message, post, raw_comments, more_comments, continue_threads in collected:
+                subsequent_messages += self.store_post_data(tdb, message, post, raw_comments, more_comments, continue_threads)
+                comment_count += len(raw_comments)
+
+            # the consumer connection, POST_RESCAN_QUEUE is also the producing queue
+            queue_helpers.queue_post_rescan_messages(
+                rabbitmq=self.get_rabbitmq(),
+                messages=subsequent_messages
             )
 
         logger.info(
-            f"Processed {len(raw_comments)} comments, queued a further {len(more_comments) + len(continue_threads)} requests. " +
-            f"Sleeping for {Settings.TIME_BETWEEN_POST_RESCANS}s..."
+            f"Processed {len(collected)} post rescans with {comment_count} comments, queued a further {len(subsequent_messages)} requests."
         )
-        time.sleep(Settings.TIME_BETWEEN_POST_RESCANS)
+
+        return outcomes
 
     def run(self):
         # Persistent object for token rotation.
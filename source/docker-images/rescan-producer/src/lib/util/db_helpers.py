@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Iterator, List, Tuple
 
 from psycopg2.extensions import AsIs
 
@@ -7,21 +7,21 @@ from talos.config import Settings
 from talos.logger import logger
 
 
-def fetch_subscriptions() -> Tuple[str]:
+def iter_subscriptions() -> Iterator[List[Tuple]]:
     """
-    Fetches from SUBSCRIPTIONS_TABLE all due subreddit rescans, so that they
-    can be queued and consumed by subreddit-rescanner.
+    Streams from SUBSCRIPTIONS_TABLE all subscriptions, so that the due subreddit
+    rescans can be queued and consumed by subreddit-rescanner.
+
+    Yields:
+        List[Tuple]: The next chunk of subscriptions, see BaseDatabase.iter_rows().
     """
     with ContextDatabase() as db:
-        db.execute(
+        for subscriptions in db.iter_rows(
             query="SELECT * FROM %s",
-            params=(AsIs(Settings.SUBSCRIPTIONS_TABLE),),
-            auto_commit=False
-        )
-
-        subscriptions = db.fetchall()
-        logger.debug(f"Found subscriptions: {subscriptions}.")
-        return subscriptions
+            params=(AsIs(Settings.SUBSCRIPTIONS_TABLE),)
+        ):
+            logger.debug(f"Found subscriptions: {subscriptions}.")
+            yield subscriptions
 
 
 def mark_subscription_queued(subreddit: str) -> None:
@@ -39,33 +39,38 @@ def mark_subscription_queued(subreddit: str) -> None:
         )
 
 
-def fetch_due_post_rescans() -> Tuple[str]:
+def iter_due_post_rescans() -> Iterator[List[Tuple[int, str]]]:
     """
-    Fetches from POST_RESCAN_TABLE all due post rescans, so that they can
+    Streams from POST_RESCAN_TABLE all due post rescans, so that they can
     be queued and consumed by post-rescanner.
+
+    Yields:
+        List[Tuple[int, str]]: The next chunk of post rescans, the ID of each and of
+            its post, see BaseDatabase.iter_rows().
     """
     with ContextDatabase() as db:
-        db.execute(
-            query="SELECT * FROM %s WHERE began_processing=FALSE AND scheduled_start_at <= NOW();",
-            params=(AsIs(Settings.POST_RESCAN_TABLE),),
-            auto_commit=False
-        )
-
-        post_rescans = db.fetchall()
-        logger.debug(f"Found post rescans: {post_rescans}")
-        return post_rescans
+        for post_rescans in db.iter_rows(
+            query="SELECT id, post_id FROM %s WHERE began_processing=FALSE AND scheduled_start_at <= NOW()",
+            params=(AsIs(Settings.POST_RESCAN_TABLE),)
+        ):
+            logger.debug(f"Found post rescans: {post_rescans}")
+            yield post_rescans
 
 
-def mark_post_rescan_queued(cdb: ContextDatabase, post_rescan_id: int) -> None:
+def mark_post_rescans_queued(post_rescan_ids: List[int]) -> None:
     """
-    Updates the POST_RESCAN_TABLE table to update the last time this post
-    rescan was seen by the system.
+    Updates the POST_RESCAN_TABLE table to mark these post rescans as queued,
+    and update the last time they were seen by the system, in one statement.
 
     Args:
-        post_rescan_id (int): The ID of the post rescan to mark as touched.
+        post_rescan_ids (List[int]): The IDs of the post rescans to mark as queued.
     """
-    cdb.execute(
-        query="UPDATE %s SET began_processing=TRUE, last_seen=NOW() WHERE id=%s",
-        params=(AsIs(Settings.POST_RESCAN_TABLE), post_rescan_id),
-        auto_commit=False
-    )
+    if not post_rescan_ids:
+        return
+
+    with ContextDatabase() as cdb:
+        cdb.execute(
+            query="UPDATE %s SET began_processing=TRUE, last_seen=NOW() WHERE id = ANY(%s)",
+            params=(AsIs(Settings.POST_RESCAN_TABLE), post_rescan_ids),
+            auto_commit=True
+        )
@@ -1,35 +1,48 @@
-import json
-from typing import Dict
+from typing import List, Tuple
 
-from talos.queuing import RabbitMQ
+from talos.queuing import RabbitMQ, get_pool
+from talos.queuing.messages import PostRescanType, encode_post_rescan, post_rescan_priority
 from talos.config import Settings
+from talos.util import serialization
 
 
 def queue_subreddit_rescan(subreddit: str) -> None:
     """
     Adds the subreddit to the subreddit rescan queue, which is consumed
-    by `subreddit-rescanner`.
+    by `subreddit-rescanner`. Publishes on a pooled connection, so a pass over
+    every subscription reuses one connection rather than opening one per subreddit.
     """
-    with RabbitMQ(queues=(Settings.SUBREDDIT_RESCAN_QUEUE,)) as queue:
+    with get_pool().acquire(queues=(Settings.SUBREDDIT_RESCAN_QUEUE,)) as queue:
         queue.publish_message(
             queue_name=Settings.SUBREDDIT_RESCAN_QUEUE,
-            message=json.dumps({
+            message=serialization.dumps({
                 "subreddit": subreddit
             })
         )
 
 
-def queue_post_rescan(rabbitmq: RabbitMQ, api_request: Dict, post_id: str, post_rescan_id: int):
+def queue_post_rescans(rabbitmq: RabbitMQ, post_rescans: List[Tuple[int, str]]) -> List[bool]:
     """
-    Adds the API request to fetch the updated post meta data and
-    comments to the post rescan queue, which is consumed by `post-rescanner`.
+    Adds the API requests to fetch the updated post meta data and comments
+    of each post to the post rescan queue, which is consumed by `post-rescanner`.
+    The messages, see encode_post_rescan(), are published as one confirmed batch, at
+    the highest priority so that they are not held up behind nested comment requests.
+
+    Args:
+        rabbitmq (RabbitMQ): The active RabbitMQ instance used to publish the messages.
+        post_rescans (List[Tuple[int, str]]): The ID of each post rescan, and of its post.
+
+    Returns:
+        List[bool]: For each post rescan, True if its message was confirmed by the broker.
     """
-    rabbitmq.publish_message(
+    return rabbitmq.publish_batch(
         queue_name=Settings.POST_RESCAN_QUEUE,
-        message=json.dumps({
-            "post_id": post_id,
-            "post_rescans_id": post_rescan_id,
-            "type": "base",
-            "api_request": api_request
-        })
+        messages=[
+            encode_post_rescan(
+                post_id=post_id,
+                post_rescans_id=post_rescan_id,
+                type=PostRescanType.BASE
+            ) for post_rescan_id, post_id in post_rescans
+        ],
+        priorities=[post_rescan_priority(PostRescanType.BASE, depth=0)] * len(post_rescans)
     )
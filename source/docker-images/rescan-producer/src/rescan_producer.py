@@ -3,8 +3,7 @@ import sys
 
 from talos.config import Settings
 from talos.components import ProducerComponent
-from talos.queuing import RabbitMQ
-from talos.db import ContextDatabase
+from talos.queuing import get_pool
 from talos.logger import logger
 
 from lib.util import db_helpers, logic_helpers, queue_helpers
@@ -23,7 +22,9 @@ class RescanProducer(ProducerComponent):
     We produce to the POST_RESCAN_QUEUE by reading from the POST_RESCANS_TABLE,
     finding individual posts which have a scheduled 'rescan' time. This rescan
     fetches the post meta data again, as well as comments, once the post is 7
-    days old, or older. This allows engagement to develop.
+    days old, or older. This allows engagement to develop. With
+    POST_RESCAN_SCHEDULING=broker, subreddit-rescanner publishes post rescans
+    delayed until due instead, and they are not polled for.
     """
 
     def __init__(self, retry_attempts, time_between_attempts):
@@ -51,50 +52,46 @@ class RescanProducer(ProducerComponent):
         """
         logger.info("Checking for due subreddit rescans...")
 
-        subscriptions = db_helpers.fetch_subscriptions()
-        for subscription in subscriptions:
-            subreddit = subscription[0]
+        for subscriptions in db_helpers.iter_subscriptions():
+            for subscription in subscriptions:
+                subreddit = subscription[0]
 
-            if logic_helpers.is_rescan_required(subscription):
-                queue_helpers.queue_subreddit_rescan(subreddit)
-                db_helpers.mark_subscription_queued(subreddit)
+                if logic_helpers.is_rescan_required(subscription):
+                    queue_helpers.queue_subreddit_rescan(subreddit)
+                    db_helpers.mark_subscription_queued(subreddit)
 
-                logger.info(f"Queued rescan for {subreddit}.")
+                    logger.info(f"Queued rescan for {subreddit}.")
 
     def produce_post_rescans(self) -> None:
         """
         Reads from the POST_RESCANS_TABLE, where the scheduled time has passed.
         For each of these rescans, we queue the message with an API request which
-        contains updated post meta data, as well as comments.
+        contains updated post meta data, as well as comments. Only rescans whose
+        message the broker confirmed are marked queued, the rest are retried on
+        the next pass.
         """
         logger.info("Checking for due post rescans...")
 
-        due_post_rescans = db_helpers.fetch_due_post_rescans()
-        if not due_post_rescans:
-            return
-
-        with RabbitMQ(queues=(Settings.POST_RESCAN_QUEUE,)) as rabbitmq:
-            with ContextDatabase() as cdb:
-                for due_post_rescan in due_post_rescans:
-                    post_rescan_id, _, _, _, _, post_id = due_post_rescan
-
-                    queue_helpers.queue_post_rescan(
-                        rabbitmq=rabbitmq,
-                        api_request={
-                            "url": f"https://gateway.reddit.com/desktopapi/v1/postcomments/{post_id}",
-                            "method": 0  # Requests.TYPE_GET
-                        },
-                        post_id=post_id,
-                        post_rescan_id=post_rescan_id
-                    )
-                    db_helpers.mark_post_rescan_queued(
-                        cdb=cdb,
-                        post_rescan_id=post_rescan_id
-                    )
-
-                cdb.commit()
-
-        logger.info(f"Queued {len(due_post_rescans)} post rescans.")
+        queued = found = 0
+
+        with get_pool().acquire(queues=(Settings.POST_RESCAN_QUEUE,)) as rabbitmq:
+            # streamed a chunk at a time, each marked queued once published, so a
+            # backlog is neither held in memory nor requeued in full after a failure
+            for post_rescans in db_helpers.iter_due_post_rescans():
+                confirmed = queue_helpers.queue_post_rescans(
+                    rabbitmq=rabbitmq,
+                    post_rescans=post_rescans
+                )
+
+                db_helpers.mark_post_rescans_queued([
+                    post_rescan_id for (post_rescan_id, _), is_confirmed in zip(post_rescans, confirmed) if is_confirmed
+                ])
+
+                queued += confirmed.count(True)
+                found += len(post_rescans)
+
+        if found:
+            logger.info(f"Queued {queued} of {found} post rescans.")
 
     def _handle_one_pass(self):
         """
@@ -103,7 +100,8 @@ class RescanProducer(ProducerComponent):
         logger.notice("Beginning one pass.")
 
         self.produce_subreddit_rescans()
-        self.produce_post_rescans()
+        if Settings.POST_RESCAN_SCHEDULING == "poll":
+            self.produce_post_rescans()
 
         logger.notice(
             f"Pass complete. Sleeping for {Settings.RESCAN_PRODUCER_SLEEP_TIME_SECS} seconds.")
@@ -1,11 +1,11 @@
 from typing import List, Tuple, Union, Dict
-import json
 from datetime import datetime
 
 from psycopg2.extensions import AsIs
 
 from talos.db import ContextDatabase, TransactionalDatabase
 from talos.config import Settings
+from talos.util import serialization
 from talos.logger import logger
 
 
@@ -64,36 +64,58 @@ def create_subreddit_rescan_entry(tdb: TransactionalDatabase, subreddit: str) ->
     return tdb.fetchone()[0]
 
 
-def create_initial_post_entry(tdb: TransactionalDatabase, post_data: Dict, rescan_id: int):
+def create_initial_post_entries(tdb: TransactionalDatabase, posts: List[Dict], rescan_id: int) -> List[Dict]:
     """
-    Creates a scraped post entry in the 'scraped_posts' table.
+    Creates a scraped post entry in the 'scraped_posts' table for each post, in
+    as few statements as DB_INSERT_PAGE_SIZE allows. With INITIAL_POSTS_CONFLICT_KEYS,
+    posts which already have an entry, e.g. from a redelivered rescan message, are skipped.
 
     Args:
         tdb (TransactionalDatabase): The database instance with an active transaction to write data.
-        post_data (dict): The post object, containing it's ID.
+        posts (List[dict]): The post objects, each containing its ID.
         rescan_id (int): The ID of the rescan previously created in the transaction.
+
+    Returns:
+        List[dict]: The posts for which an entry was created.
     """
-    tdb.execute(
-        query="INSERT INTO %s (id, metadata, rescan_id) VALUES (%s, %s, %s)",
-        params=(AsIs(Settings.INITIAL_POSTS_TABLE),
-                post_data["id"], json.dumps(post_data), rescan_id)
+    inserted = tdb.insert_rows(
+        table=Settings.INITIAL_POSTS_TABLE,
+        columns=("id", "metadata", "rescan_id"),
+        rows=[(post["id"], serialization.dumps(post), rescan_id) for post in posts],
+        returning=("id",),
+        on_conflict=Settings.INITIAL_POSTS_CONFLICT_KEYS
     )
 
+    inserted_ids = {post_id for post_id, in inserted}
+    return [post for post in posts if post["id"] in inserted_ids]
+
 
-def create_post_rescan_entry(tdb: TransactionalDatabase, scheduled_start_at: datetime, post_id: str):
+def create_post_rescan_entries(tdb: TransactionalDatabase, post_rescans: List[Tuple[str, datetime]], is_queued: bool = False) -> List[int]:
     """
-    Creates an post rescan entry in the 'post_rescans' table.
+    Creates a post rescan entry in the 'post_rescans' table for each post, in as
+    few statements as DB_INSERT_PAGE_SIZE allows.
 
     Args:
         tdb (TransactionalDatabase): The database instance with an active transaction to write data.
-        scheduled_start_at (datetime): The time for which the post should be rescanned.
-        post_id (str): The ID of the post to be rescanned.
+        post_rescans (List[Tuple[str, datetime]]): The ID of each post to be rescanned,
+            and the time for which it should be rescanned.
+        is_queued (bool = False): Whether the rescans are queued along with the entries, so
+            that rescan-producer doesn't queue them again, see POST_RESCAN_SCHEDULING.
+
+    Returns:
+        List[int]: The ID of each created post rescan entry, in the order of `post_rescans`.
     """
-    tdb.execute(
-        query="INSERT INTO %s (scheduled_start_at, post_id) VALUES (%s, %s)",
-        params=(AsIs(Settings.POST_RESCAN_TABLE), scheduled_start_at, post_id)
+    inserted = tdb.insert_rows(
+        table=Settings.POST_RESCAN_TABLE,
+        columns=("scheduled_start_at", "post_id", "began_processing", "last_seen"),
+        rows=[(scheduled_start_at, post_id, is_queued, is_queued) for post_id, scheduled_start_at in post_rescans],
+        template="(%s, %s, %s, CASE WHEN %s THEN NOW() END)",
+        returning=("id", "post_id")
     )
 
+    post_rescan_ids = {post_id: post_rescan_id for post_rescan_id, post_id in inserted}
+    return [post_rescan_ids[post_id] for post_id, _ in post_rescans]
+
 
 def mark_subreddit_rescan_processed(tdb: TransactionalDatabase, subreddit: str):
     """
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import List, Tuple
+
+from talos.queuing import RabbitMQ
+from talos.queuing.messages import PostRescanType, encode_post_rescan, post_rescan_priority
+from talos.config import Settings
+from talos.exceptions.queuing import PublishNotConfirmed
+from talos.logger import logger
+
+
+def queue_scheduled_post_rescans(rabbitmq: RabbitMQ, post_rescans: List[Tuple[int, str, datetime]]) -> None:
+    """
+    Publishes the API requests to fetch the updated post meta data and comments of
+    each post to the post rescan queue, held by the broker until each is due, so that
+    rescan-producer doesn't have to poll POST_RESCAN_TABLE for them. Used when
+    POST_RESCAN_SCHEDULING=broker, see RabbitMQ.publish_delayed().
+
+    Args:
+        rabbitmq (RabbitMQ): The active RabbitMQ instance used to publish the messages.
+        post_rescans (List[Tuple[int, str, datetime]]): The ID of each post rescan, of its
+            post, and the time it's scheduled for.
+
+    Raises:
+        PublishNotConfirmed (RabbitMQNonFatalException): If any message was not confirmed.
+    """
+    confirmed = rabbitmq.publish_delayed(
+        queue_name=Settings.POST_RESCAN_QUEUE,
+        messages=[
+            encode_post_rescan(
+                post_id=post_id,
+                post_rescans_id=post_rescan_id,
+                type=PostRescanType.BASE
+            ) for post_rescan_id, post_id, _ in post_rescans
+        ],
+        due_at=[scheduled_start_at for _, _, scheduled_start_at in post_rescans],
+        priorities=[post_rescan_priority(PostRescanType.BASE, depth=0)] * len(post_rescans)
+    )
+
+    if not all(confirmed):
+        logger.error(f"{confirmed.count(False)} of {len(post_rescans)} scheduled post rescans were not confirmed.")
+        raise PublishNotConfirmed()
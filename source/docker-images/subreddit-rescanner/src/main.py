@@ -1,3 +1,4 @@
+from talos.components import Supervisor
 from talos.config import Settings
 
 from subreddit_rescanner import SubredditRescanner
@@ -9,4 +10,5 @@ if __name__ == "__main__":
         producing_queue=Settings.SUBREDDIT_RESCAN_QUEUE
     )
     
-    subreddit_rescanner.run()
+    # runs as a single instance, see the README, supervised only to restart it
+    Supervisor(subreddit_rescanner, workers=1).run()
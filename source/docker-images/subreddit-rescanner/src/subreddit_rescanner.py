@@ -1,14 +1,14 @@
-import json
 import sys
 
 from talos.config import Settings
+from talos.util import serialization
 from talos.logger import logger
 from talos.components import ConsumerComponent
 from talos.db import TransactionalDatabase
 from talos.api import Requests
 
 from lib.api import PostCollector
-from lib.util import db_helpers, time_helpers
+from lib.util import db_helpers, queue_helpers, time_helpers
 
 
 class SubredditRescanner(ConsumerComponent):
@@ -18,6 +18,9 @@ class SubredditRescanner(ConsumerComponent):
 
     Then, it gets the newest, unseen, posts from this subreddit. It writes these
     to the INITIAL_POSTS_TABLE, schedules a post rescan in POST_RESCANS_TABLE.
+    With POST_RESCAN_SCHEDULING=broker, it also publishes each post rescan to
+    POST_RESCAN_QUEUE, held by the broker until due, rather than leaving
+    rescan-producer to poll for it.
     """
 
     def __init__(self, retry_attempts: int, time_between_attempts: int, producing_queue: str):
@@ -29,7 +32,14 @@ class SubredditRescanner(ConsumerComponent):
             time_between_attempts (int): The time to wait between attempts in seconds.
             producing_queue (str): The name of the queue from which to receive data.
         """
-        super().__init__(retry_attempts, time_between_attempts, producing_queue)
+        self.schedules_post_rescans = Settings.POST_RESCAN_SCHEDULING == "broker"
+
+        super().__init__(
+            retry_attempts,
+            time_between_attempts,
+            producing_queue,
+            publishing_queues=(Settings.POST_RESCAN_QUEUE,) if self.schedules_post_rescans else ()
+        )
         Settings.validate()
 
     def handle_critical_error(self):
@@ -48,7 +58,7 @@ class SubredditRescanner(ConsumerComponent):
         Args:
             message (str): The message containing the subreddit from which to fetch posts.
         """
-        subreddit = json.loads(message)["subreddit"]
+        subreddit = serialization.loads(message)["subreddit"]
         logger.info(
             f"Received rescan request for {subreddit}. Running rescan..."
         )
@@ -63,18 +73,32 @@ class SubredditRescanner(ConsumerComponent):
             rescan_id = db_helpers.create_subreddit_rescan_entry(
                 tdb, subreddit)
 
-            for post in posts:
-                db_helpers.create_initial_post_entry(
-                    tdb=tdb,
-                    post_data=post,
-                    rescan_id=rescan_id,
-                )
-                db_helpers.create_post_rescan_entry(
-                    tdb=tdb,
-                    scheduled_start_at=time_helpers.get_scheduled_scrape_time(
-                        post),
-                    post_id=post["id"]
+            # posts already stored, e.g. by an earlier delivery of this message, are
+            # skipped along with their post rescans
+            posts = db_helpers.create_initial_post_entries(
+                tdb=tdb,
+                posts=posts,
+                rescan_id=rescan_id
+            )
+
+            scheduled = [(post["id"], time_helpers.get_scheduled_scrape_time(post)) for post in posts]
+            post_rescan_ids = db_helpers.create_post_rescan_entries(
+                tdb=tdb,
+                post_rescans=scheduled,
+                is_queued=self.schedules_post_rescans
+            )
+            post_rescans = [
+                (post_rescan_id, post_id, scheduled_start_at)
+                for post_rescan_id, (post_id, scheduled_start_at) in zip(post_rescan_ids, scheduled)
+            ]
+
+            if self.schedules_post_rescans and post_rescans:
+                # published before committing, so a failed publish rolls back the entries
+                queue_helpers.queue_scheduled_post_rescans(
+                    rabbitmq=self.get_rabbitmq(),
+                    post_rescans=post_rescans
                 )
+
             db_helpers.mark_subreddit_rescan_processed(tdb, subreddit)
 
         logger.info(
@@ -0,0 +1,5 @@
+from token_broker import TokenBrokerComponent
+
+if __name__ == "__main__":
+    token_broker = TokenBrokerComponent(retry_attempts=3, time_between_attempts=5)
+    token_broker.run()
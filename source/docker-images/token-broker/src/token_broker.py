@@ -0,0 +1,62 @@
+import time
+import sys
+
+from talos.config import Settings
+from talos.components import ProducerComponent
+from talos.queuing import RabbitMQ
+from talos.api import Requests
+from talos.api.token_broker import TokenBroker
+from talos.logger import logger
+
+
+class TokenBrokerComponent(ProducerComponent):
+    """
+    This is an optional component, used when TOKEN_SOURCE=broker.
+
+    The purpose of the TokenBrokerComponent is to produce tokens to TOKEN_QUEUE,
+    which are consumed by the token pools of post-rescanner and subreddit-rescanner
+    workers. Tokens are scraped once here rather than by every worker, which cuts
+    homepage fetches and lets newly scaled workers start with a token immediately.
+    """
+
+    def __init__(self, retry_attempts, time_between_attempts):
+        """
+        Initializes the TokenBrokerComponent object.
+
+        Args:
+            retry_attempts (int): The number of retry attempts for handling errors.
+            time_between_attempts (int): The time to wait between attempts in seconds.
+        """
+        super().__init__(retry_attempts, time_between_attempts)
+        Settings.validate()
+
+    def handle_critical_error(self):
+        """
+        Handles critical errors which could not be retried.
+        """
+        logger.alert("handle_critical_error() hit. Exiting...")
+        sys.exit(1)
+
+    def readiness_probes(self):
+        """
+        Only waits on RabbitMQ, as the broker doesn't use the database.
+        """
+        return {"rabbitmq": RabbitMQ.is_ready}
+
+    def _handle_one_pass(self):
+        """
+        Handles one pass of the run loop, topping up TOKEN_QUEUE with new tokens.
+        """
+        with RabbitMQ(queues=(Settings.TOKEN_QUEUE,)) as rabbitmq:
+            minted = self.token_broker.top_up(rabbitmq)
+
+        logger.info(
+            f"Minted {minted} tokens. Sleeping for {Settings.TOKEN_BROKER_SLEEP_TIME_SECS} seconds.")
+        time.sleep(Settings.TOKEN_BROKER_SLEEP_TIME_SECS)
+
+    def run(self):
+        # Always scrapes tokens itself, regardless of TOKEN_SOURCE.
+        self.requests_obj = Requests()
+        self.token_broker = TokenBroker(generate_token=self.requests_obj._generate_token)
+
+        super().run()
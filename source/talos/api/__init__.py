@@ -1 +1,2 @@
-from .requests import Requests
\ No newline at end of file
+from .requests import Requests
+from .async_requests import AsyncRequests
@@ -0,0 +1,81 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Union
+
+import requests
+
+from talos.logger import logger
+from talos.config import Settings
+
+from .requests import Requests
+
+
+class AsyncRequests:
+    """
+    An asyncio counterpart to Requests, allowing many requests to be in flight
+    from a single event loop.
+
+    Each request is executed on a worker thread by a shared Requests object, so
+    the pooled session, token rotation and mapping of errors to APIFatalException
+    and APINonFatalException are identical to the synchronous client.
+
+    Args:
+        max_concurrency (int): The maximum number of requests in flight at once.
+        requests_obj (Requests = None): An existing Requests object to share, e.g. to
+            share tokens with synchronous callers. One is created if not given.
+    """
+
+    def __init__(self, max_concurrency: int = Settings.ASYNC_REQUESTS_MAX_CONCURRENCY, requests_obj: Requests = None):
+        self.requests = requests_obj if requests_obj is not None else Requests()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="talos-requests"
+        )
+
+    async def send(self, url: str, type: int, body: dict = None, is_json: bool = False, with_auth: bool = False) -> Union[requests.Response, Dict]:
+        """
+        Awaitable version of Requests.send(), see its documentation.
+
+        Raises:
+            InvalidRequestType (APIFatalException): Raised if the `type` parameter is unknown.
+            APINonFatalException: For transient errors which may be resolved by retry.
+            APIFatalException: For errors which cannot be resolved by retry.
+        """
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(
+                self.requests.send,
+                url=url,
+                type=type,
+                body=body,
+                is_json=is_json,
+                with_auth=with_auth
+            )
+        )
+
+    async def send_from_message(self, message: dict) -> dict:
+        """
+        Awaitable version of Requests.send_from_message(), see its documentation.
+
+        Args:
+            message (dict): The API request object as part of the RabbitMQ message.
+        """
+        return await self.send(
+            url=message["url"],
+            type=message["method"],
+            body=message.get("body"),
+            is_json=True,
+            with_auth=True
+        )
+
+    def close(self) -> None:
+        """
+        Waits for in flight requests to finish, then closes the underlying session.
+        """
+        self._executor.shutdown(wait=True)
+        self.requests.close()
+
+        logger.debug("Closed AsyncRequests.")
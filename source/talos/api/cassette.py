@@ -0,0 +1,164 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from talos.logger import logger
+from talos.config import Settings
+from talos.exceptions.api import CassetteNotFound
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    A transport adapter which records responses to disk, or replays them
+    without touching the network, for benchmarking offline.
+
+    Each request is keyed by its method, URL and body, ignoring headers so that
+    the token a request was recorded with does not matter on replay. A cassette
+    is one JSON file per key in `directory`, holding the decompressed body, as
+    text if it is UTF-8 so that recordings are readable, otherwise base64-encoded.
+
+    Args:
+        mode (str): "record" to send requests and save their responses, or
+            "replay" to serve saved responses.
+        directory (str): The directory cassettes are saved to and replayed from.
+        latency_ms (int): The delay added before each replayed response, simulating the network.
+        **kwargs: Passed to HTTPAdapter, used when recording.
+    """
+    MODE_RECORD = "record"
+    MODE_REPLAY = "replay"
+    DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+    def __init__(
+        self,
+        mode: str = Settings.HTTP_CASSETTE_MODE,
+        directory: str = Settings.HTTP_CASSETTE_DIR,
+        latency_ms: int = Settings.HTTP_CASSETTE_LATENCY_MS,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+
+        self.mode = mode
+        self.directory = directory
+        self.latency_ms = latency_ms
+
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """
+        Records or replays the response to a request, per `mode`.
+
+        Raises:
+            CassetteNotFound (APIFatalException): If replaying a request which was never recorded.
+        """
+        path = os.path.join(self.directory, self.get_key(request) + ".json")
+
+        if self.mode == self.MODE_REPLAY:
+            return self._replay(request, path)
+
+        response = super().send(request, **kwargs)
+        self._record(request, response, path)
+
+        return response
+
+    @classmethod
+    def get_key(cls, request: requests.PreparedRequest) -> str:
+        """
+        Hashes the method, URL and body of a request. JSON bodies are normalised,
+        so the key does not depend on the serializer the body was encoded with.
+
+        Returns:
+            str: The key of the cassette for the request.
+        """
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True).encode("utf-8")
+        except ValueError:
+            pass
+
+        digest = hashlib.sha256()
+        for part in (request.method.encode("utf-8"), request.url.encode("utf-8"), body):
+            digest.update(part)
+            digest.update(b"\0")
+
+        return digest.hexdigest()
+
+    def _record(self, request: requests.PreparedRequest, response: requests.Response, path: str) -> None:
+        """
+        Saves a response, reading its body. The body is then served from memory,
+        so the response can still be streamed by the caller.
+        """
+        content = response.content
+
+        try:
+            body = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"body": base64.b64encode(content).decode("ascii")}
+
+        cassette = {
+            "request": {
+                "method": request.method,
+                "url": request.url
+            },
+            "response": {
+                "status_code": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    name: value for name, value in response.headers.items()
+                    if name.lower() not in self.DROPPED_HEADERS
+                },
+                **body
+            }
+        }
+
+        # write then rename, so a concurrent replay never reads half a cassette, to a
+        # temporary file of its own so that concurrent recorders of a key don't clobber it
+        with tempfile.NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as file:
+            json.dump(cassette, file, indent=2)
+        os.replace(file.name, path)
+
+        logger.debug(f"Recorded cassette for url={request.url} to path={path}.")
+
+        response.raw = io.BytesIO(content)
+        response._content = False
+        response._content_consumed = False
+
+    def _replay(self, request: requests.PreparedRequest, path: str) -> requests.Response:
+        """
+        Builds a response from a saved cassette, after the simulated latency.
+        """
+        try:
+            with open(path) as file:
+                cassette = json.load(file)["response"]
+        except FileNotFoundError:
+            logger.error(f"No cassette recorded for {request.method} url={request.url}.")
+            raise CassetteNotFound()
+
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        response = requests.Response()
+        response.status_code = cassette["status_code"]
+        response.reason = cassette["reason"]
+        response.headers = CaseInsensitiveDict(cassette["headers"])
+        if "text" in cassette:
+            response.raw = io.BytesIO(cassette["text"].encode("utf-8"))
+        else:
+            response.raw = io.BytesIO(base64.b64decode(cassette["body"]))
+        response.url = request.url
+        response.request = request
+        response.connection = self
+
+        logger.debug(f"Replayed cassette for url={request.url} from path={path}.")
+
+        return response
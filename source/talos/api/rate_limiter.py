@@ -0,0 +1,177 @@
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from talos.logger import logger
+from talos.config import Settings
+
+
+class TokenBucket:
+    """
+    A token bucket refilled at `rate` tokens per second, holding at most `capacity`.
+
+    Args:
+        rate (float): The sustained number of requests per second.
+        capacity (float): The number of requests which may be sent in a burst.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.paused_until = 0.0
+        self.updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Takes a token from the bucket, going into debt if it is empty so that
+        concurrent callers queue up behind one another.
+
+        Returns:
+            float: The time in seconds to wait before sending the request.
+        """
+        now = time.monotonic()
+
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops requests from being sent for `seconds`.
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    """
+    Rate limits requests with a token bucket per endpoint (host) and token.
+
+    The rate of each endpoint adapts to Reddit's responses; it increases
+    additively while requests succeed and halves on a 429. The bucket of a
+    token is further limited by its x-ratelimit-remaining and x-ratelimit-reset
+    headers, and paused until the reset once it has no requests remaining.
+
+    Args:
+        initial_rate (float): The requests per second each endpoint starts at.
+        max_rate (float): The requests per second each endpoint may increase to.
+        burst (float): The capacity of each bucket.
+    """
+    MIN_RATE = 0.1
+    INCREASE_STEP = 0.1
+    DECREASE_FACTOR = 0.5
+    DEFAULT_PAUSE_SECS = 1.0
+    BUCKET_IDLE_SECS = 300
+
+    def __init__(
+        self,
+        initial_rate: float = Settings.RATE_LIMIT_INITIAL_RPS,
+        max_rate: float = Settings.RATE_LIMIT_MAX_RPS,
+        burst: float = Settings.RATE_LIMIT_BURST
+    ):
+        self.initial_rate = initial_rate
+        self.max_rate = max_rate
+        self.burst = burst
+
+        self.endpoint_rates: Dict[str, float] = {}
+        self.buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+
+        self._lock = threading.Lock()
+
+    def wait(self, url: str, token: Optional[str] = None) -> None:
+        """
+        Blocks until a request may be sent to the endpoint of `url` with `token`.
+
+        Args:
+            url (str): The URL the request will be sent to.
+            token (Optional[str]): The token the request will be sent with, if any.
+        """
+        with self._lock:
+            delay = self._get_bucket(url, token).reserve()
+
+        if delay > 0:
+            logger.debug(f"Rate limited, waiting {delay:.2f}s before sending to url={url}.")
+            time.sleep(delay)
+
+    def update(self, url: str, token: Optional[str], status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Adapts the rate of the endpoint and token to a response.
+
+        Args:
+            url (str): The URL the request was sent to.
+            token (Optional[str]): The token the request was sent with, if any.
+            status_code (int): The status code of the response.
+            headers (Mapping[str, str]): The headers of the response.
+        """
+        endpoint = urlparse(url).netloc
+        remaining = self._parse_header(headers, "x-ratelimit-remaining")
+        reset = self._parse_header(headers, "x-ratelimit-reset")
+
+        with self._lock:
+            bucket = self._get_bucket(url, token)
+            rate = self.endpoint_rates[endpoint]
+
+            if status_code == 429:
+                rate = max(self.MIN_RATE, rate * self.DECREASE_FACTOR)
+                bucket.pause(
+                    self._parse_header(headers, "retry-after") or reset or self.DEFAULT_PAUSE_SECS
+                )
+                logger.notice(f"Received 429 from endpoint={endpoint}, decreased rate to {rate:.2f}/s.")
+            else:
+                rate = min(self.max_rate, rate + self.INCREASE_STEP)
+
+            self.endpoint_rates[endpoint] = rate
+            bucket.rate = rate
+
+            if remaining is not None and reset:
+                if remaining < 1:
+                    bucket.pause(reset)
+                else:
+                    bucket.rate = max(self.MIN_RATE, min(rate, remaining / reset))
+
+    def _get_bucket(self, url: str, token: Optional[str]) -> TokenBucket:
+        """
+        Gets the bucket for the endpoint of `url` and `token`, creating it at the
+        endpoint's current rate if needed. Must be called holding self._lock.
+        """
+        endpoint = urlparse(url).netloc
+        key = (endpoint, token)
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self._discard_idle_buckets()
+
+            rate = self.endpoint_rates.setdefault(endpoint, self.initial_rate)
+            bucket = self.buckets[key] = TokenBucket(rate=rate, capacity=self.burst)
+
+        return bucket
+
+    def _discard_idle_buckets(self) -> None:
+        """
+        Removes buckets of tokens no longer in use, since tokens are rotated.
+        Must be called holding self._lock.
+        """
+        cutoff = time.monotonic() - self.BUCKET_IDLE_SECS
+
+        self.buckets = {
+            key: bucket for key, bucket in self.buckets.items()
+            if bucket.updated_at >= cutoff or bucket.paused_until >= time.monotonic()
+        }
+
+    def _parse_header(self, headers: Mapping[str, str], name: str) -> Optional[float]:
+        """
+        Returns:
+            Optional[float]: The numeric value of a header, or None if it is absent or malformed.
+        """
+        value = headers.get(name)
+        if value is None:
+            return None
+
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
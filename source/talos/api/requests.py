@@ -1,24 +1,74 @@
+import threading
+import time
+
 import requests
 import regex
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 from typing import Dict, Union
 
 from talos.logger import logger
 from talos.config import Settings
 from talos.exceptions.api import *
 from talos.util.decorators import retry_exponential
+from talos.util import serialization
+
+from .token_pool import TokenPool
+from .token_broker import BrokeredTokenSource
+from .rate_limiter import RateLimiter
+from .cassette import CassetteAdapter
 
 
 class Requests:
     """
     A class which proxies requests to the 'requests' library with error handling
-    and token generation.
+    and token rotation, using tokens from a background-refreshed TokenPool. The
+    pool scrapes its own tokens, or with TOKEN_SOURCE=broker consumes tokens
+    minted by the token-broker component.
+
+    Requests are sent through a persistent session, so keep-alive connections
+    to each host are pooled and reused for the lifetime of the object. The object
+    is safe to share between threads, see AsyncRequests.
+
+    Requests are rate limited per endpoint and token by a RateLimiter, which
+    adapts to 429s and x-ratelimit-* headers.
+
+    Responses are compressed (gzip/deflate, and br if brotli is installed) and
+    streamed; JSON responses are decompressed chunk by chunk into one buffer which
+    is parsed in place, rather than buffering the body, then its text, then parsing.
+    Totals of the bytes received, bytes decoded and time spent streaming and
+    decoding bodies are kept in `metrics`.
+
+    With HTTP_CASSETTE_MODE=record or replay, responses are recorded to or
+    replayed from disk by a CassetteAdapter. Replayed requests are not rate
+    limited, as they never reach Reddit.
     """
     TYPE_GET = 0
     TYPE_POST = 1
+    STREAM_CHUNK_SIZE = 64 * 1024
 
     def __init__(self):
-        self.requests_on_token = 0
-        self._current_token = None
+        self.session = self._create_session()
+        self.token_pool = TokenPool(
+            generate_token=BrokeredTokenSource() if Settings.TOKEN_SOURCE == "broker" else self._generate_token
+        )
+        self.rate_limiter = RateLimiter() if Settings.HTTP_CASSETTE_MODE != CassetteAdapter.MODE_REPLAY else None
+
+        self.metrics = {
+            "responses": 0,
+            "bytes_received": 0,
+            "bytes_decoded": 0,
+            "decode_seconds": 0.0
+        }
+        self._metrics_lock = threading.Lock()
+
+    def close(self) -> None:
+        """
+        Closes the session, releasing all pooled connections, and stops refreshing tokens.
+        """
+        self.token_pool.stop()
+        self.session.close()
 
     def send(self, url: str, type: int, body: dict = None, is_json: bool = False, with_auth: bool = False):
         """
@@ -37,16 +87,21 @@ class Requests:
 
         Raises:
             InvalidRequestType (APIFatalException): Raised if the `type` parameter is unknown.
+            RateLimited (APINonFatalException): Raised if Reddit responded with a 429.
             APINonFatalException: For transient errors which may be resolved by retry.
             APIFatalException: For errors which cannot be resolved by retry.
         """
         headers = self._generate_headers() if with_auth else None
+        token = headers["Authorization"] if headers else None
         response = None
 
         logger.debug(
             f"Preparing request with url={url} type={type} is_json={is_json} with_auth={with_auth} body={body} headers={headers}."
         )
 
+        if self.rate_limiter:
+            self.rate_limiter.wait(url, token)
+
         if type == self.TYPE_GET:
             response: requests.Response = self._get(
                 url=url,
@@ -61,14 +116,20 @@ class Requests:
         else:
             raise InvalidRequestType()
 
-        if with_auth:
-            self.requests_on_token += 1
+        if self.rate_limiter:
+            self.rate_limiter.update(url, token, response.status_code, response.headers)
+        if response.status_code == 429:
+            response.close()
+            logger.notice(f"Rate limited by Reddit on url={url}.")
+            raise RateLimited()
 
-        logger.debug(
-            f"Request sent. requests_on_token={self.requests_on_token}. Returning..."
-        )
+        logger.debug("Request sent. Returning...")
+
+        if not is_json:
+            self._read(response)
+            return response
 
-        return response if not is_json else response.json()
+        return self._decode(response)
 
     def send_from_message(self, message: dict) -> dict:
         """
@@ -94,7 +155,7 @@ class Requests:
     @log_reraise_non_fatal_exception
     def _get(self, url: str, headers: dict = None) -> requests.Response:
         """
-        Sends a GET request using the requests library. Has it's own function for
+        Sends a GET request using the pooled session. Has it's own function for
         the purpose of reraising custom exceptions.
 
         Args:
@@ -106,16 +167,17 @@ class Requests:
         """
         logger.debug(f"Sending GET with url={url}...")
 
-        return requests.get(
+        return self.session.get(
             url=url,
-            headers=headers
+            headers=headers,
+            stream=True
         )
 
     @log_reraise_fatal_exception
     @log_reraise_non_fatal_exception
     def _post(self, url: str, body: dict, headers: dict = None) -> requests.Response:
         """
-        Sends a POST request using the requests library. Has it's own function for
+        Sends a POST request using the pooled session. Has it's own function for
         the purpose of reraising custom exceptions.
 
         Args:
@@ -128,30 +190,124 @@ class Requests:
         """
         logger.debug(f"Sending POST with url={url}...")
 
-        return requests.post(
+        return self.session.post(
             url=url,
-            json=body,
-            headers=headers
+            data=serialization.dumps(body).encode("utf-8") if body is not None else None,
+            headers={**(headers or {}), "Content-Type": "application/json"},
+            stream=True
         )
 
-    def _get_token(self) -> str:
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def _decode(self, response: requests.Response) -> Dict:
+        """
+        Streams a JSON response, decompressing each chunk into a buffer as it
+        arrives, and parses the buffer with the configured serializer, see
+        talos.util.serialization. Has it's own function for the purpose of
+        reraising custom exceptions.
+
+        Args:
+            response (requests.Response): The streamed response to parse.
+
+        Returns:
+            Dict: The parsed response.
+        """
+        start = time.perf_counter()
+
+        with response:
+            buffer = bytearray()
+            for chunk in response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE):
+                buffer += chunk
+
+            parsed = serialization.loads(buffer)
+
+        self._record_metrics(response, len(buffer), time.perf_counter() - start)
+
+        return parsed
+
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def _read(self, response: requests.Response) -> None:
         """
-        Compares the requests made with the requests per token setting to either
-        generate a new token, or return the current.
+        Reads the whole of a streamed response, so that its connection is released
+        back to the pool. Has it's own function for the purpose of reraising custom
+        exceptions.
+
+        Args:
+            response (requests.Response): The streamed response to read.
+        """
+        start = time.perf_counter()
+        content = response.content
+
+        self._record_metrics(response, len(content), time.perf_counter() - start)
+
+    def _record_metrics(self, response: requests.Response, bytes_decoded: int, decode_seconds: float) -> None:
+        """
+        Adds a response to the totals in `metrics`. The bytes received are those
+        read from the socket, i.e. before decompression.
+        """
+        bytes_received = response.raw.tell() if hasattr(response.raw, "tell") else bytes_decoded
+
+        with self._metrics_lock:
+            self.metrics["responses"] += 1
+            self.metrics["bytes_received"] += bytes_received
+            self.metrics["bytes_decoded"] += bytes_decoded
+            self.metrics["decode_seconds"] += decode_seconds
+
+        logger.debug(
+            f"Decoded response bytes_received={bytes_received} bytes_decoded={bytes_decoded} decode_seconds={decode_seconds:.4f}."
+        )
+
+    def _create_session(self) -> requests.Session:
+        """
+        Creates a session with a keep-alive connection pool per host, sized per
+        Settings.REQUESTS_POOL_CONNECTIONS and Settings.REQUESTS_POOL_MAXSIZE.
+        Connection failures and gateway errors are retried by urllib3 up to
+        Settings.REQUESTS_MAX_RETRIES times before surfacing as exceptions.
+        Compressed responses are accepted in every encoding urllib3 can decode.
+        If Settings.HTTP_CASSETTE_MODE is not "off", a CassetteAdapter is mounted
+        in place of the HTTPAdapter.
 
         Returns:
-            str: The Bearer authorization token found.
+            requests.Session: The session which all requests are sent through.
+        """
+        retries = Retry(
+            total=Settings.REQUESTS_MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=False,  # retry POST too, our POSTs are queries
+            raise_on_status=False
+        )
+        adapter_class = HTTPAdapter if Settings.HTTP_CASSETTE_MODE == "off" else CassetteAdapter
+        adapter = adapter_class(
+            pool_connections=Settings.REQUESTS_POOL_CONNECTIONS,
+            pool_maxsize=Settings.REQUESTS_POOL_MAXSIZE,
+            max_retries=retries
+        )
+
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    def _get_token(self) -> str:
         """
-        if self.requests_on_token % Settings.REQUESTS_PER_TOKEN == 0:
-            self._current_token = self._generate_token()
+        Takes the next token in rotation from the token pool, counting the request
+        against it. Tokens are generated in the background, so this only blocks
+        while the pool is empty on startup.
 
-        return self._current_token
+        Returns:
+            str: The Bearer authorization token.
+        """
+        return self.token_pool.acquire()
 
     @retry_exponential(minimum_wait_time=1, maximum_wait_time=30, exception_types=(APINonFatalException,))
     def _generate_token(self) -> str:
         """
-        Fetches a token from Reddit by parsing the homepage HTML. Sets the token
-        in self._current_token.
+        Fetches a token from Reddit by parsing the homepage HTML. Called by the
+        token pool's refresh thread, or by the token broker.
 
         Raises:
             TokenNotFound (APINonFatalException): If no token is found, a non-fatal
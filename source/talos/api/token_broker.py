@@ -0,0 +1,99 @@
+import time
+from typing import Callable
+
+from talos.logger import logger
+from talos.config import Settings
+from talos.queuing import RabbitMQ
+from talos.exceptions.api import TokenNotFound
+from talos.util import serialization
+
+from .token_pool import Token
+
+
+class TokenBroker:
+    """
+    Mints tokens once and distributes them to workers through TOKEN_QUEUE, so
+    that workers do not each scrape their own tokens. Each message is a lease
+    on one token for REQUESTS_PER_TOKEN requests, consumed by a BrokeredTokenSource.
+
+    Args:
+        generate_token (Callable[[], str]): Fetches a new token, e.g. Requests._generate_token.
+        queue_depth (int): The number of unconsumed tokens to keep in TOKEN_QUEUE.
+    """
+
+    def __init__(self, generate_token: Callable[[], str], queue_depth: int = Settings.TOKEN_BROKER_QUEUE_DEPTH):
+        self.generate_token = generate_token
+        self.queue_depth = queue_depth
+
+    def top_up(self, rabbitmq: RabbitMQ) -> int:
+        """
+        Mints and publishes tokens until TOKEN_QUEUE holds `queue_depth` tokens.
+        Tokens are published with a TTL of TOKEN_LIFETIME_SECS, so the broker
+        drops them if they expire before being consumed.
+
+        Args:
+            rabbitmq (RabbitMQ): The active RabbitMQ instance used to publish the tokens.
+
+        Returns:
+            int: The number of tokens published.
+        """
+        to_mint = self.queue_depth - rabbitmq.get_message_count(Settings.TOKEN_QUEUE)
+
+        for _ in range(to_mint):
+            rabbitmq.publish_message(
+                queue_name=Settings.TOKEN_QUEUE,
+                message=serialization.dumps({
+                    "token": self.generate_token(),
+                    "uses": Settings.REQUESTS_PER_TOKEN,
+                    "expires_at": time.time() + Settings.TOKEN_LIFETIME_SECS
+                }),
+                expiration_ms=Settings.TOKEN_LIFETIME_SECS * 1000
+            )
+
+        return max(to_mint, 0)
+
+
+class BrokeredTokenSource:
+    """
+    Consumes token leases published by a TokenBroker. Used in place of
+    Requests._generate_token by the TokenPool when TOKEN_SOURCE=broker.
+
+    The connection is kept open between calls, and only used from the token
+    pool's refresh thread.
+    """
+
+    def __init__(self):
+        self.rabbitmq = RabbitMQ((Settings.TOKEN_QUEUE,))
+
+    def __call__(self) -> Token:
+        """
+        Consumes the next unexpired token from TOKEN_QUEUE.
+
+        Returns:
+            Token: The token, with its remaining uses and expiry.
+
+        Raises:
+            TokenNotFound (APINonFatalException): If TOKEN_QUEUE is empty.
+        """
+        try:
+            self.rabbitmq.connect()
+
+            while True:
+                message = self.rabbitmq.consume_one_message(Settings.TOKEN_QUEUE)
+                if message is None:
+                    logger.notice(f"No tokens in queue={Settings.TOKEN_QUEUE}.")
+                    raise TokenNotFound()
+
+                lease = serialization.loads(message)
+                token = Token(
+                    value=lease["token"],
+                    uses_remaining=lease["uses"],
+                    expires_at=lease["expires_at"]
+                )
+
+                if token.is_usable():
+                    logger.debug("Consumed a token from the token broker.")
+                    return token
+        except Exception:
+            self.rabbitmq.disconnect()
+            raise
@@ -0,0 +1,246 @@
+import threading
+import time
+from typing import Callable, List, Union
+
+from talos.logger import logger
+from talos.config import Settings
+from talos.exceptions.api import InvalidTokenPoolConfig, TokenNotFound
+
+
+class Token:
+    """
+    A token and its usage.
+
+    Args:
+        value (str): The Bearer authorization token.
+        uses_remaining (int): The number of requests which may still be sent with the token.
+        expires_at (float): The UNIX time after which the token should no longer be used.
+    """
+
+    def __init__(self, value: str, uses_remaining: int, expires_at: float):
+        self.value = value
+        self.uses_remaining = uses_remaining
+        self.expires_at = expires_at
+
+    def is_usable(self) -> bool:
+        """
+        Returns:
+            bool: True if the token has uses remaining and has not expired.
+        """
+        return self.uses_remaining > 0 and time.time() < self.expires_at
+
+    def is_healthy(self, refresh_ahead: int, expiry_margin_secs: int) -> bool:
+        """
+        Args:
+            refresh_ahead (int): The number of remaining uses at or below which the token
+                should be replaced.
+            expiry_margin_secs (int): The time before expiry at which the token should be replaced.
+
+        Returns:
+            bool: True if the token does not need replacing yet.
+        """
+        return self.uses_remaining > refresh_ahead and \
+            time.time() < self.expires_at - expiry_margin_secs
+
+
+class TokenPool:
+    """
+    Rotates between several live tokens, which are pre-fetched by a background
+    thread so that a request never waits on a token being generated, except
+    when the pool is empty on startup.
+
+    A replacement is fetched once a token has `refresh_ahead` uses left or is
+    close to expiry, so the pool keeps `size` healthy tokens at all times.
+
+    Args:
+        generate_token (Callable[[], Union[str, Token]]): Fetches a new token, e.g. Requests._generate_token,
+            or a Token with its own usage and expiry, e.g. BrokeredTokenSource.
+        size (int): The number of healthy tokens to keep in the pool.
+        refresh_ahead (int): The remaining uses at which a token is replaced ahead of time.
+        requests_per_token (int): The number of requests to send with each token.
+        token_lifetime_secs (int): The time after generation at which a token expires.
+
+    Raises:
+        InvalidTokenPoolConfig (APIFatalException): If a newly generated token would
+            never be healthy, as `refresh_ahead` is not below `requests_per_token`, or
+            `token_lifetime_secs` is not above EXPIRY_MARGIN_SECS, or `size` is below 1.
+    """
+    ACQUIRE_TIMEOUT_SECS = 60
+    EXPIRY_MARGIN_SECS = 60
+    RETRY_WAIT_SECS = 5
+
+    def __init__(
+        self,
+        generate_token: Callable[[], Union[str, Token]],
+        size: int = Settings.TOKEN_POOL_SIZE,
+        refresh_ahead: int = Settings.TOKEN_POOL_REFRESH_AHEAD,
+        requests_per_token: int = Settings.REQUESTS_PER_TOKEN,
+        token_lifetime_secs: int = Settings.TOKEN_LIFETIME_SECS
+    ):
+        if size < 1:
+            raise InvalidTokenPoolConfig(f"The token pool size must be at least 1, not {size}.")
+
+        if not 0 <= refresh_ahead < requests_per_token:
+            raise InvalidTokenPoolConfig(
+                f"TOKEN_POOL_REFRESH_AHEAD={refresh_ahead} must be at least 0 and below REQUESTS_PER_TOKEN={requests_per_token}."
+            )
+
+        if token_lifetime_secs <= self.EXPIRY_MARGIN_SECS:
+            raise InvalidTokenPoolConfig(
+                f"TOKEN_LIFETIME_SECS={token_lifetime_secs} must be above the expiry margin of {self.EXPIRY_MARGIN_SECS} seconds."
+            )
+
+        self.generate_token = generate_token
+        self.size = size
+        self.refresh_ahead = refresh_ahead
+        self.requests_per_token = requests_per_token
+        self.token_lifetime_secs = token_lifetime_secs
+
+        self.tokens: List[Token] = []
+        self._next_index = 0
+
+        self._condition = threading.Condition()
+        self._thread: threading.Thread = None
+        self._stopped = False
+
+    def start(self) -> None:
+        """
+        Starts the background refresh thread, if not already started.
+        """
+        with self._condition:
+            if self._thread is not None:
+                return
+
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run,
+                name="talos-token-pool",
+                daemon=True
+            )
+            self._thread.start()
+
+        logger.debug("Started token pool refresh thread.")
+
+    def stop(self) -> None:
+        """
+        Signals the background refresh thread to stop.
+        """
+        with self._condition:
+            self._stopped = True
+            self._thread = None
+            self._condition.notify_all()
+
+    def acquire(self) -> str:
+        """
+        Takes one use from the next token in rotation.
+
+        Returns:
+            str: The Bearer authorization token.
+
+        Raises:
+            TokenNotFound (APINonFatalException): If the pool stayed empty for
+            ACQUIRE_TIMEOUT_SECS, e.g. as Reddit is unreachable.
+        """
+        self.start()
+
+        deadline = time.monotonic() + self.ACQUIRE_TIMEOUT_SECS
+
+        with self._condition:
+            while True:
+                self._discard_unusable()
+
+                if self.tokens:
+                    token = self.tokens[self._next_index % len(self.tokens)]
+                    self._next_index += 1
+                    token.uses_remaining -= 1
+
+                    if self._needs_refresh():
+                        self._condition.notify_all()
+
+                    return token.value
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error("Timed out waiting for a token.")
+                    raise TokenNotFound()
+
+                logger.notice("Token pool is empty, waiting for a token...")
+                self._condition.notify_all()
+                self._condition.wait(timeout=remaining)
+
+    def _run(self) -> None:
+        """
+        The background refresh loop. Sleeps until a token needs replacing, or
+        periodically to check for expiry, then refills the pool.
+        """
+        while True:
+            with self._condition:
+                while not self._stopped and not self._needs_refresh():
+                    self._condition.wait(timeout=self.EXPIRY_MARGIN_SECS)
+
+                if self._stopped:
+                    return
+
+            if not self._refill():
+                with self._condition:
+                    self._condition.wait(timeout=self.RETRY_WAIT_SECS)
+
+    def _refill(self) -> bool:
+        """
+        Generates tokens until the pool holds `size` healthy tokens, generating at
+        most `size` per call, so that tokens which are unhealthy when generated,
+        e.g. brokered ones close to expiry, can't make it scrape without pause.
+
+        Returns:
+            bool: False if a token could not be generated, or the pool is still
+                short of healthy tokens.
+        """
+        for _ in range(self.size):
+            with self._condition:
+                if not self._needs_refresh():
+                    return True
+
+            try:
+                token = self.generate_token()
+            except Exception:
+                logger.error("Failed to generate a token for the token pool.")
+                return False
+
+            if not isinstance(token, Token):
+                token = Token(
+                    value=token,
+                    uses_remaining=self.requests_per_token,
+                    expires_at=time.time() + self.token_lifetime_secs
+                )
+
+            with self._condition:
+                self._discard_unusable()
+                self.tokens.append(token)
+                self._condition.notify_all()
+
+            logger.debug(f"Added a token to the pool, pool_size={len(self.tokens)}.")
+
+        with self._condition:
+            if not self._needs_refresh():
+                return True
+
+        logger.error(f"Generated {self.size} tokens without filling the token pool with healthy tokens.")
+        return False
+
+    def _needs_refresh(self) -> bool:
+        """
+        Must be called holding self._condition.
+
+        Returns:
+            bool: True if fewer than `size` tokens in the pool are healthy.
+        """
+        healthy = sum(
+            token.is_healthy(self.refresh_ahead, self.EXPIRY_MARGIN_SECS) for token in self.tokens
+        )
+        return healthy < self.size
+
+    def _discard_unusable(self) -> None:
+        """
+        Removes exhausted and expired tokens. Must be called holding self._condition.
+        """
+        self.tokens = [token for token in self.tokens if token.is_usable()]
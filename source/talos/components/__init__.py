@@ -1,3 +1,7 @@
 from .base_component import BaseComponent
 from .producer_component import ProducerComponent
-from .consumer_component import ConsumerComponent
\ No newline at end of file
+from .consumer_component import ConsumerComponent
+from .async_base_component import AsyncBaseComponent
+from .async_producer_component import AsyncProducerComponent
+from .async_consumer_component import AsyncConsumerComponent
+from .supervisor import Supervisor
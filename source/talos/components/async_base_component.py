@@ -0,0 +1,68 @@
+import asyncio
+from abc import abstractmethod
+
+from talos.components import BaseComponent
+from talos.exceptions.base import NonFatalException
+from talos.util.decorators import retry_fixed
+
+
+class AsyncBaseComponent(BaseComponent):
+    """
+    Abstract base class for asyncio components, which multiplex many passes
+    in one process on an event loop rather than blocking in one at a time.
+    _handle_one_pass() is a coroutine, and should await I/O, e.g. with
+    AsyncRequests, AsyncDatabase and AsyncRabbitMQ, rather than block on it.
+
+    Args:
+        retry_attempts: Number of attempts before stopping retries on _handle_one_pass().
+        time_between_attempts: Time in seconds between retry attempts on _handle_one_pass().
+    """
+
+    async def handle_one_pass_with_retry(self, *args, **kwargs):
+        """
+        Awaitable version of BaseComponent.handle_one_pass_with_retry(), the event
+        loop is free to run other passes between attempts.
+
+        Args:
+            args: Positional arguments to be passed to the _handle_one_pass method.
+            kwargs: Keyword arguments to be passed to the _handle_one_pass method.
+        """
+        @retry_fixed(retry_attempts=self.retry_attempts, time_between_attempts=self.time_between_attempts, exception_types=(NonFatalException,))
+        async def _handle_one_pass_with_retry(*args, **kwargs):
+            await self._handle_one_pass(*args, **kwargs)
+
+        await _handle_one_pass_with_retry(*args, **kwargs)
+
+    @abstractmethod
+    async def _handle_one_pass(self, *args, **kwargs):
+        """
+        Abstract coroutine for handling one pass of the component's main loop, such as
+        handling a message or reading from a table for tasks.
+        Must be implemented by subclasses, executed with retry by _run() in subclasses.
+
+        Args:
+            args: Positional arguments to be used by the method.
+            kwargs: Keyword arguments to be passed to the _handle_one_pass method.
+        """
+        pass
+
+    @abstractmethod
+    async def _run(self):
+        """
+        Abstract coroutine for the component's main loop, run on the event loop by run().
+        """
+        pass
+
+    def run(self):
+        """
+        Starts the component once its dependencies are ready, see BaseComponent.run(),
+        then runs _run() on a new event loop. Refers exceptions raised while waiting
+        to handle_critical_error().
+        """
+        try:
+            super().run()
+        except Exception as e:
+            self.route_error(e)
+            return
+
+        asyncio.run(self._run())
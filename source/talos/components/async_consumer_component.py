@@ -0,0 +1,71 @@
+from abc import abstractmethod
+from typing import Tuple
+
+from talos.components import AsyncBaseComponent
+from talos.config import Settings
+from talos.queuing import AsyncRabbitMQ
+
+
+class AsyncConsumerComponent(AsyncBaseComponent):
+    """
+    Abstract base class for asyncio consumer components, see ConsumerComponent.
+    Up to `max_concurrency` messages are handled at once on the event loop.
+
+    Args:
+        retry_attempts (int): Number of attempts before stopping retries on _handle_one_pass().
+        time_between_attempts (int): Time in seconds between retry attempts on _handle_one_pass().
+        producing_queue (str): The name of the queue to consume from, i.e. the producer.
+        publishing_queues (Tuple[str] = ()): Any other queues the component publishes to.
+        max_concurrency (int = Settings.ASYNC_CONSUMER_MAX_CONCURRENCY): The most messages handled at once.
+    """
+
+    def __init__(
+        self,
+        retry_attempts: int,
+        time_between_attempts: int,
+        producing_queue: str,
+        publishing_queues: Tuple[str] = (),
+        max_concurrency: int = Settings.ASYNC_CONSUMER_MAX_CONCURRENCY
+    ):
+        super().__init__(retry_attempts, time_between_attempts)
+
+        self.producing_queue = producing_queue
+        self.publishing_queues = tuple(queue for queue in publishing_queues if queue != producing_queue)
+        self.max_concurrency = max_concurrency
+        self.rabbitmq: AsyncRabbitMQ = None
+
+    @abstractmethod
+    def handle_critical_error(self):
+        """
+        Abstract method to handle critical errors which could not be retried.
+        Must be implemented by subclasses.
+        """
+        pass
+
+    @abstractmethod
+    async def _handle_one_pass(self, *args):
+        """
+        Abstract coroutine for handling one message from the queue. Publish with
+        self.rabbitmq, declared with producing_queue and publishing_queues.
+
+        Args:
+            args: Positional arguments to be used by the method.
+        """
+        pass
+
+    async def _run(self):
+        """
+        Continually consumes from self.producing_queue, handling up to max_concurrency
+        messages at once. Refers exceptions to handle_critical_error().
+        """
+        try:
+            self.rabbitmq = AsyncRabbitMQ((self.producing_queue, *self.publishing_queues))
+
+            async with self.rabbitmq as queue:
+                await queue.continually_consume_messages(
+                    queue_name=self.producing_queue,
+                    callback_function=self.handle_one_pass_with_retry,
+                    prefetch_count=self.max_concurrency
+                )
+        except Exception as e:
+            self.route_error(e)
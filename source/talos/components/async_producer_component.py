@@ -0,0 +1,45 @@
+from abc import abstractmethod
+
+from talos.components import AsyncBaseComponent
+
+
+class AsyncProducerComponent(AsyncBaseComponent):
+    """
+    Abstract base class for asyncio producer components, see ProducerComponent.
+
+    Args:
+        retry_attempts: Number of attempts before stopping retries on _handle_one_pass().
+        time_between_attempts: Time in seconds between retry attempts on _handle_one_pass().
+    """
+
+    @abstractmethod
+    def handle_critical_error(self):
+        """
+        Abstract method to handle critical errors which could not be retried.
+        Must be implemented by subclasses.
+        """
+        pass
+
+    @abstractmethod
+    async def _handle_one_pass(self, *args, **kwargs):
+        """
+        Abstract coroutine for handling one pass of the component's main loop, typically
+        reading from a table to produce tasks for queues.
+
+        Important: Should contain await asyncio.sleep(), as this is executed in a while true.
+
+        Args:
+            args: Positional arguments to be used by the method.
+            kwargs: Keyword arguments to be passed to the _handle_one_pass method.
+        """
+        pass
+
+    async def _run(self):
+        """
+        Continually runs one pass. Refers exceptions to handle_critical_error().
+        """
+        while True:
+            try:
+                await self.handle_one_pass_with_retry()
+            except Exception as e:
+                self.route_error(e)
@@ -1,9 +1,13 @@
 import time
 from abc import ABC, abstractmethod
+from typing import Callable, Dict
 
 from talos.config import Settings
+from talos.db.base_database import BaseDatabase
 from talos.logger import logger
 from talos.exceptions.base import FatalException, NonFatalException
+from talos.exceptions.components import DependenciesNotReadyException
+from talos.queuing.rabbitmq import RabbitMQ
 from talos.util.decorators import retry_fixed
 
 
@@ -15,10 +19,13 @@ class BaseComponent(ABC):
         retry_attempts: Number of attempts before stopping retries on _handle_one_pass().
         time_between_attempts: Time in seconds between retry attempts on _handle_one_pass().
     """
+    STARTUP_MIN_BACKOFF_SECS = 0.5
+    STARTUP_MAX_BACKOFF_SECS = 5
 
     def __init__(self, retry_attempts: int, time_between_attempts: int):
         self.retry_attempts = retry_attempts
         self.time_between_attempts = time_between_attempts
+        self.startup_timeout_secs = Settings.STARTUP_TIMEOUT_SECS
 
     def route_error(self, error: Exception):
         """
@@ -69,11 +76,55 @@ class BaseComponent(ABC):
         """
         pass
 
+    def readiness_probes(self) -> Dict[str, Callable[[], bool]]:
+        """
+        The dependencies waited on by wait_until_ready(), by default Postgres and RabbitMQ.
+        Overridden by components which don't use one of them.
+
+        Returns:
+            Dict[str, Callable[[], bool]]: A probe per dependency name, returning True once it's ready.
+        """
+        return {
+            "postgres": BaseDatabase.is_ready,
+            "rabbitmq": RabbitMQ.is_ready,
+        }
+
+    def wait_until_ready(self):
+        """
+        Probes the dependencies from readiness_probes() until they are all ready, backing off
+        from STARTUP_MIN_BACKOFF_SECS, doubling up to STARTUP_MAX_BACKOFF_SECS between rounds.
+
+        Raises:
+            DependenciesNotReadyException: If any dependency is not ready within `startup_timeout_secs`.
+        """
+        pending = self.readiness_probes()
+        deadline = time.monotonic() + self.startup_timeout_secs
+        backoff = self.STARTUP_MIN_BACKOFF_SECS
+
+        while True:
+            pending = {name: probe for name, probe in pending.items() if not probe()}
+            if not pending:
+                return
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DependenciesNotReadyException(list(pending), self.startup_timeout_secs)
+
+            logger.info(f"Waiting on {', '.join(pending)}, probing again in {backoff}s...")
+            time.sleep(min(backoff, remaining))
+            backoff = min(backoff * 2, self.STARTUP_MAX_BACKOFF_SECS)
+
     def run(self):
         """
-        Starts the component after a delay defined by Settings.STARTUP_SLEEP_TIME_SECS.
+        Starts the component once its dependencies are ready, see wait_until_ready().
         Subclasses call this implementation on start to reduce boiler plate.
+
+        Raises:
+            DependenciesNotReadyException: If the dependencies are not ready within `startup_timeout_secs`.
         """
-        logger.notice(f"{type(self).__name__} starting. Sleeping for {Settings.STARTUP_SLEEP_TIME_SECS}s while containers start up...")
+        logger.notice(f"{type(self).__name__} starting. Waiting on its dependencies...")
+
+        started_at = time.monotonic()
+        self.wait_until_ready()
 
-        time.sleep(Settings.STARTUP_SLEEP_TIME_SECS)
\ No newline at end of file
+        logger.notice(f"Dependencies of {type(self).__name__} ready after {time.monotonic() - started_at:.1f}s.")
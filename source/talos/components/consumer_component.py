@@ -1,7 +1,12 @@
 from abc import abstractmethod
+from typing import List, Tuple
 
 from talos.components import BaseComponent
+from talos.config import Settings
+from talos.exceptions.base import NonFatalException
+from talos.logger import logger
 from talos.queuing import RabbitMQ
+from talos.util.decorators import retry_fixed
 
 
 class ConsumerComponent(BaseComponent):
@@ -12,12 +17,59 @@ class ConsumerComponent(BaseComponent):
         retry_attempts (int): Number of attempts before stopping retries on _handle_one_pass().
         time_between_attempts (int): Time in seconds between retry attempts on _handle_one_pass().
         producing_queue (str): The name of the queue to consume from, i.e. the producer.
+        publishing_queues (Tuple[str] = ()): Any other queues the component publishes to.
+        prefetch_count (int = Settings.CONSUMER_PREFETCH_COUNT): The most unacknowledged messages delivered at once.
+        workers (int = Settings.CONSUMER_WORKERS): The number of messages handled concurrently, each
+            on its own thread, so _handle_one_pass() must be thread-safe when above 1.
+        batch_size (int = 1): If above 1, messages are handled in batches of up to this many by
+            _handle_batch(), e.g. to share one transaction, and `workers` batches are handled concurrently.
+        batch_window_ms (int = Settings.CONSUMER_BATCH_WINDOW_MS): The longest to wait for a batch to fill.
     """
 
-    def __init__(self, retry_attempts: int, time_between_attempts: int, producing_queue: str):
+    def __init__(
+        self,
+        retry_attempts: int,
+        time_between_attempts: int,
+        producing_queue: str,
+        publishing_queues: Tuple[str] = (),
+        prefetch_count: int = Settings.CONSUMER_PREFETCH_COUNT,
+        workers: int = Settings.CONSUMER_WORKERS,
+        batch_size: int = 1,
+        batch_window_ms: int = Settings.CONSUMER_BATCH_WINDOW_MS
+    ):
         super().__init__(retry_attempts, time_between_attempts)
 
         self.producing_queue = producing_queue
+        self.publishing_queues = tuple(queue for queue in publishing_queues if queue != producing_queue)
+        self.prefetch_count = prefetch_count
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_window_ms = batch_window_ms
+        self.rabbitmq: RabbitMQ = None
+
+    def get_rabbitmq(self) -> RabbitMQ:
+        """
+        Gets the long-lived RabbitMQ instance the component consumes with, declared
+        with producing_queue and publishing_queues, to publish from within
+        _handle_one_pass() rather than connecting for every message. Safe to publish
+        with from any worker, publishes are carried out by the consuming thread.
+
+        If the connection was lost, only the thread which owns it reconnects, as a
+        worker reconnecting would replace the connection the consuming thread is
+        still using.
+
+        Returns:
+            RabbitMQ: The connected RabbitMQ instance.
+
+        Raises:
+            RabbitMQNonFatalException: If the connection was lost and this is a worker
+                thread, so that the message is requeued.
+        """
+        if self.rabbitmq is None:
+            self.rabbitmq = RabbitMQ((self.producing_queue, *self.publishing_queues))
+
+        self.rabbitmq.ensure_connected(owner_only=True)
+        return self.rabbitmq
 
     @abstractmethod
     def handle_critical_error(self):
@@ -41,18 +93,74 @@ class ConsumerComponent(BaseComponent):
         """
         pass
 
-    def run(self):
+    def handle_batch_with_retry(self, messages: List[bytes]) -> List[bool]:
         """
-        Starts the consumer component, continually consuming one message from self.producing_queue.
-        Refers exceptions to handle_critical_error().
+        Handles a batch of messages with retry capabilities, see handle_one_pass_with_retry().
+        Called by run() in batch mode. Should not be implemented.
+
+        Args:
+            messages (List[bytes]): The messages in the batch.
+
+        Returns:
+            List[bool]: For each message, True if it was handled, False to requeue it.
         """
-        super().run()
+        @retry_fixed(retry_attempts=self.retry_attempts, time_between_attempts=self.time_between_attempts, exception_types=(NonFatalException,))
+        def _handle_batch_with_retry(messages):
+            return self._handle_batch(messages)
+
+        return _handle_batch_with_retry(messages)
 
+    def _handle_batch(self, messages: List[bytes]) -> List[bool]:
+        """
+        Handles a batch of messages in batch mode. By default, each is handled by
+        _handle_one_pass() in turn, and one which raises a NonFatalException is requeued
+        rather than retrying the whole batch. Subclasses override this to share work
+        across the batch, e.g. one database transaction and one publish batch.
+
+        Args:
+            messages (List[bytes]): The messages in the batch.
+
+        Returns:
+            List[bool]: For each message, True if it was handled, False to requeue it.
+        """
+        outcomes = []
+
+        for message in messages:
+            try:
+                self._handle_one_pass(message)
+                outcomes.append(True)
+            except NonFatalException:
+                logger.notice(f"Failed to handle message={message}, requeueing it.")
+                outcomes.append(False)
+
+        return outcomes
+
+    def run(self):
+        """
+        Starts the consumer component, continually consuming one message, or one batch
+        in batch mode, from self.producing_queue. Refers exceptions to handle_critical_error().
+        """
         try:
-            with RabbitMQ((self.producing_queue,)) as queue:
-                queue.continually_consume_messages(
-                    queue_name=self.producing_queue,
-                    callback_function=self.handle_one_pass_with_retry
-                )
+            super().run()
+
+            self.rabbitmq = RabbitMQ((self.producing_queue, *self.publishing_queues))
+
+            with self.rabbitmq as queue:
+                if self.batch_size > 1:
+                    queue.continually_consume_batches(
+                        queue_name=self.producing_queue,
+                        callback_function=self.handle_batch_with_retry,
+                        batch_size=self.batch_size,
+                        batch_window_ms=self.batch_window_ms,
+                        prefetch_count=self.prefetch_count,
+                        workers=self.workers
+                    )
+                else:
+                    queue.continually_consume_messages(
+                        queue_name=self.producing_queue,
+                        callback_function=self.handle_one_pass_with_retry,
+                        prefetch_count=self.prefetch_count,
+                        workers=self.workers
+                    )
         except Exception as e:
             self.route_error(e)
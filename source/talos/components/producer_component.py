@@ -42,7 +42,11 @@ class ProducerComponent(BaseComponent):
         Starts the producer component, continually running one pass.
         Refers exceptions to handle_critical_error().
         """
-        super().run()
+        try:
+            super().run()
+        except Exception as e:
+            self.route_error(e)
+            return
 
         while True:
             try:
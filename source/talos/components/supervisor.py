@@ -0,0 +1,152 @@
+import multiprocessing
+import multiprocessing.connection
+import signal
+import time
+from typing import List, Optional
+
+from talos.components import BaseComponent
+from talos.config import Settings
+from talos.exceptions.components import ConnectionBudgetExceeded
+from talos.logger import logger
+
+
+class Supervisor:
+    """
+    Runs a component in `workers` forked processes, sharing the parent's config
+    and imports, and restarts any which exit, e.g. through handle_critical_error().
+    This lets one container use every core of a node, paying interpreter startup,
+    and logging client initialisation once rather than per process.
+
+    A worker which exits within MIN_UPTIME_SECS of starting is restarted after a
+    backoff, doubling up to MAX_BACKOFF_SECS, so a persistent failure (e.g. the
+    broker being unreachable) doesn't restart it in a tight loop. SIGTERM and SIGINT
+    are forwarded to the workers.
+
+    Each worker has its own database pool, so a container may open up to `workers`
+    times DB_POOL_MAX_SIZE connections to Postgres, which must fit within
+    `db_connection_budget`, its share of the server's max_connections.
+
+    Args:
+        component (BaseComponent): The component to run, its run() is called in each worker.
+        workers (int = Settings.SUPERVISOR_WORKERS): The number of worker processes,
+            or 0 for one per core.
+        db_connection_budget (int = Settings.DB_CONNECTION_BUDGET): The most database
+            connections the workers may open between them.
+
+    Raises:
+        ConnectionBudgetExceeded (FatalException): If the workers' database pools could
+            open more than `db_connection_budget` connections.
+    """
+    MIN_UPTIME_SECS = 60
+    MAX_BACKOFF_SECS = 60
+    STOP_TIMEOUT_SECS = 30
+
+    def __init__(
+        self,
+        component: BaseComponent,
+        workers: int = Settings.SUPERVISOR_WORKERS,
+        db_connection_budget: int = Settings.DB_CONNECTION_BUDGET
+    ):
+        self.component = component
+        self.workers = workers or multiprocessing.cpu_count()
+
+        if self.workers * Settings.DB_POOL_MAX_SIZE > db_connection_budget:
+            raise ConnectionBudgetExceeded(self.workers, Settings.DB_POOL_MAX_SIZE, db_connection_budget)
+
+        self.processes: List[Optional[multiprocessing.Process]] = [None] * self.workers
+        self._started_at = [0.0] * self.workers
+        self._failures = [0] * self.workers
+        self._restart_at = [0.0] * self.workers
+        self._stopping = False
+
+        self._context = multiprocessing.get_context("fork")
+
+    def run(self) -> None:
+        """
+        Starts the workers, then restarts any which exit until SIGTERM or SIGINT
+        is received, at which point the workers are stopped.
+        """
+        logger.notice(f"Supervising {self.workers} workers of {type(self.component).__name__}.")
+
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        for index in range(self.workers):
+            self._start(index)
+
+        while not self._stopping:
+            self.supervise_once()
+
+        self.stop()
+
+    def supervise_once(self, timeout: float = 1) -> None:
+        """
+        Waits up to `timeout` seconds for a worker to exit, then starts the workers
+        due to be restarted.
+        """
+        sentinels = [process.sentinel for process in self.processes if process is not None]
+        multiprocessing.connection.wait(sentinels, timeout=timeout)
+
+        now = time.monotonic()
+        for index, process in enumerate(self.processes):
+            if process is not None and process.exitcode is not None:
+                self._schedule_restart(index, process, now)
+
+            if self.processes[index] is None and now >= self._restart_at[index] and not self._stopping:
+                self._start(index)
+
+    def stop(self) -> None:
+        """
+        Terminates the workers, killing any which have not exited within STOP_TIMEOUT_SECS.
+        """
+        self._stopping = True
+        alive = [process for process in self.processes if process is not None and process.is_alive()]
+
+        for process in alive:
+            process.terminate()
+
+        deadline = time.monotonic() + self.STOP_TIMEOUT_SECS
+        for process in alive:
+            process.join(max(deadline - time.monotonic(), 0))
+
+            if process.is_alive():
+                logger.error(f"Worker pid={process.pid} did not stop within {self.STOP_TIMEOUT_SECS}s, killing it.")
+                process.kill()
+                process.join()
+
+        logger.notice("Stopped all workers.")
+
+    def _start(self, index: int) -> None:
+        process = self._context.Process(
+            target=self._run_worker,
+            name=f"{type(self.component).__name__}-{index}",
+            daemon=False
+        )
+        process.start()
+
+        self.processes[index] = process
+        self._started_at[index] = time.monotonic()
+
+        logger.info(f"Started worker {index} pid={process.pid}.")
+
+    def _schedule_restart(self, index: int, process: multiprocessing.Process, now: float) -> None:
+        if now - self._started_at[index] < self.MIN_UPTIME_SECS:
+            self._failures[index] += 1
+        else:
+            self._failures[index] = 0
+
+        backoff = min(2 ** self._failures[index] - 1, self.MAX_BACKOFF_SECS)
+        self._restart_at[index] = now + backoff
+        self.processes[index] = None
+
+        logger.alert(f"Worker {index} pid={process.pid} exited with code {process.exitcode}, restarting in {backoff}s.")
+
+    def _run_worker(self) -> None:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        self.component.run()
+
+    def _handle_signal(self, signum, frame) -> None:
+        logger.notice(f"Received signal {signum}, stopping workers...")
+        self._stopping = True
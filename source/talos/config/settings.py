@@ -8,15 +8,30 @@ class Settings:
     DB_USER = os.getenv("DB_USER")
     DB_PASSWORD = os.getenv("DB_PASSWORD")
     DB_PORT = os.getenv("DB_PORT")
+    DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE"))
+    DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE"))
+    DB_POOL_MAX_LIFETIME_SECS = int(os.getenv("DB_POOL_MAX_LIFETIME_SECS"))
+    DB_INSERT_PAGE_SIZE = int(os.getenv("DB_INSERT_PAGE_SIZE"))
+    DB_FETCH_BATCH_SIZE = int(os.getenv("DB_FETCH_BATCH_SIZE"))
     
     RABBITMQ_HOSTNAME = os.getenv("RABBITMQ_HOSTNAME")
     RABBITMQ_MANAGEMENT_PORT = os.getenv("RABBITMQ_MANAGEMENT_PORT")
     RABBITMQ_SERVICE_PORT = os.getenv("RABBITMQ_SERVICE_PORT")
     RABBITMQ_EXCHANGE_NAME = os.getenv("RABBITMQ_EXCHANGE_NAME")
+    RABBITMQ_CONFIRM_WINDOW = int(os.getenv("RABBITMQ_CONFIRM_WINDOW"))
+    RABBITMQ_POOL_SIZE = int(os.getenv("RABBITMQ_POOL_SIZE"))
+    CONSUMER_PREFETCH_COUNT = int(os.getenv("CONSUMER_PREFETCH_COUNT"))
+    CONSUMER_WORKERS = int(os.getenv("CONSUMER_WORKERS"))
+    SUPERVISOR_WORKERS = int(os.getenv("SUPERVISOR_WORKERS"))
+    DB_CONNECTION_BUDGET = int(os.getenv("DB_CONNECTION_BUDGET"))
+    CONSUMER_BATCH_WINDOW_MS = int(os.getenv("CONSUMER_BATCH_WINDOW_MS"))
+    POST_RESCAN_BATCH_SIZE = int(os.getenv("POST_RESCAN_BATCH_SIZE"))
+    POST_RESCAN_MESSAGE_FORMAT = os.getenv("POST_RESCAN_MESSAGE_FORMAT")
+    POST_RESCAN_MAX_PRIORITY = int(os.getenv("POST_RESCAN_MAX_PRIORITY"))
+    POST_RESCAN_SCHEDULING = os.getenv("POST_RESCAN_SCHEDULING")
 
-    STARTUP_SLEEP_TIME_SECS = int(os.getenv("STARTUP_SLEEP_TIME_SECS"))
+    STARTUP_TIMEOUT_SECS = int(os.getenv("STARTUP_TIMEOUT_SECS"))
     RESCAN_PRODUCER_SLEEP_TIME_SECS = int(os.getenv("RESCAN_PRODUCER_SLEEP_TIME_SECS"))
-    TIME_BETWEEN_POST_RESCANS = int(os.getenv("TIME_BETWEEN_POST_RESCANS"))
 
     SUBSCRIPTIONS_TABLE = os.getenv("SUBSCRIPTIONS_TABLE")
     SUBREDDIT_RESCAN_TABLE = os.getenv("SUBREDDIT_RESCAN_TABLE")
@@ -24,13 +39,36 @@ class Settings:
     INITIAL_POSTS_TABLE = os.getenv("INITIAL_POSTS_TABLE")
     UPDATED_POSTS_TABLE = os.getenv("UPDATED_POSTS_TABLE")
     SCRAPED_COMMENTS_TABLE = os.getenv("SCRAPED_COMMENTS_TABLE")
+    INITIAL_POSTS_CONFLICT_KEYS = tuple(column for column in os.getenv("INITIAL_POSTS_CONFLICT_KEYS").split(",") if column)
+    UPDATED_POSTS_CONFLICT_KEYS = tuple(column for column in os.getenv("UPDATED_POSTS_CONFLICT_KEYS").split(",") if column)
+    SCRAPED_COMMENTS_CONFLICT_KEYS = tuple(column for column in os.getenv("SCRAPED_COMMENTS_CONFLICT_KEYS").split(",") if column)
 
     SUBREDDIT_RESCAN_QUEUE = os.getenv("SUBREDDIT_RESCAN_QUEUE")
     POST_RESCAN_QUEUE = os.getenv("POST_RESCAN_QUEUE")
+    TOKEN_QUEUE = os.getenv("TOKEN_QUEUE")
     
     MAX_POSTS_PER_REQUEST = int(os.getenv("MAX_POSTS_PER_REQUEST"))
     REQUESTS_PER_TOKEN = int(os.getenv("REQUESTS_PER_TOKEN"))
+    TOKEN_POOL_SIZE = int(os.getenv("TOKEN_POOL_SIZE"))
+    TOKEN_POOL_REFRESH_AHEAD = int(os.getenv("TOKEN_POOL_REFRESH_AHEAD"))
+    TOKEN_LIFETIME_SECS = int(os.getenv("TOKEN_LIFETIME_SECS"))
+    TOKEN_SOURCE = os.getenv("TOKEN_SOURCE")
+    TOKEN_BROKER_QUEUE_DEPTH = int(os.getenv("TOKEN_BROKER_QUEUE_DEPTH"))
+    TOKEN_BROKER_SLEEP_TIME_SECS = int(os.getenv("TOKEN_BROKER_SLEEP_TIME_SECS"))
+    REQUESTS_POOL_CONNECTIONS = int(os.getenv("REQUESTS_POOL_CONNECTIONS"))
+    REQUESTS_POOL_MAXSIZE = int(os.getenv("REQUESTS_POOL_MAXSIZE"))
+    REQUESTS_MAX_RETRIES = int(os.getenv("REQUESTS_MAX_RETRIES"))
+    ASYNC_REQUESTS_MAX_CONCURRENCY = int(os.getenv("ASYNC_REQUESTS_MAX_CONCURRENCY"))
+    ASYNC_DATABASE_MAX_CONCURRENCY = int(os.getenv("ASYNC_DATABASE_MAX_CONCURRENCY"))
+    ASYNC_CONSUMER_MAX_CONCURRENCY = int(os.getenv("ASYNC_CONSUMER_MAX_CONCURRENCY"))
+    RATE_LIMIT_INITIAL_RPS = float(os.getenv("RATE_LIMIT_INITIAL_RPS"))
+    RATE_LIMIT_MAX_RPS = float(os.getenv("RATE_LIMIT_MAX_RPS"))
+    RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST"))
     USER_AGENT = os.getenv("USER_AGENT")
+    JSON_SERIALIZER = os.getenv("JSON_SERIALIZER")
+    HTTP_CASSETTE_MODE = os.getenv("HTTP_CASSETTE_MODE")
+    HTTP_CASSETTE_DIR = os.getenv("HTTP_CASSETTE_DIR")
+    HTTP_CASSETTE_LATENCY_MS = int(os.getenv("HTTP_CASSETTE_LATENCY_MS"))
 
     COMPONENT_NAME = os.getenv("TALOS_COMPONENT_NAME")
     IS_DEV = os.getenv("IS_DEV").lower() in ("1", "true", "t")
@@ -1,2 +1,4 @@
 from .context_database import ContextDatabase
-from .transactional_database import TransactionalDatabase
\ No newline at end of file
+from .transactional_database import TransactionalDatabase
+from .async_database import AsyncDatabase
+from .pool import DatabasePool, get_pool
@@ -0,0 +1,86 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from talos.config import Settings
+from talos.logger import logger
+
+from .context_database import ContextDatabase
+from .transactional_database import TransactionalDatabase
+
+T = TypeVar("T")
+
+
+class AsyncDatabase:
+    """
+    An asyncio counterpart to ContextDatabase and TransactionalDatabase, allowing
+    many queries to be in flight from a single event loop.
+
+    psycopg2 blocks, so each call is executed on a worker thread with its own
+    connection, and the mapping of errors to DatabaseFatalException and
+    DatabaseNonFatalException is identical to the synchronous classes.
+
+    Args:
+        max_concurrency (int): The maximum number of connections in use at once.
+    """
+
+    def __init__(self, max_concurrency: int = Settings.ASYNC_DATABASE_MAX_CONCURRENCY):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="talos-database"
+        )
+
+    async def run(self, function: Callable[[ContextDatabase], T], *args: Any) -> T:
+        """
+        Calls `function` with a connected ContextDatabase, followed by `args`.
+
+        Args:
+            function (Callable[[ContextDatabase], T]): Runs the queries, e.g. a db_helpers function.
+            args: Positional arguments to be passed to `function`.
+
+        Returns:
+            T: The value returned by `function`.
+
+        Raises:
+            DatabaseNonFatalException: For non-fatal internal psycopg2 exceptions.
+            DatabaseFatalException: For fatal internal psycopg2 exceptions.
+        """
+        def call() -> T:
+            with ContextDatabase() as cdb:
+                return function(cdb, *args)
+
+        return await self._run(call)
+
+    async def run_transaction(self, function: Callable[[TransactionalDatabase], T], *args: Any) -> T:
+        """
+        Calls `function` within a transaction, committed if it returns and rolled
+        back if it raises.
+
+        Args:
+            function (Callable[[TransactionalDatabase], T]): Runs the queries of the transaction.
+            args: Positional arguments to be passed to `function`.
+
+        Returns:
+            T: The value returned by `function`.
+
+        Raises:
+            DatabaseNonFatalException: For non-fatal internal psycopg2 exceptions.
+            DatabaseFatalException: For fatal internal psycopg2 exceptions.
+        """
+        def call() -> T:
+            with TransactionalDatabase() as tdb:
+                return function(tdb, *args)
+
+        return await self._run(call)
+
+    def close(self) -> None:
+        """
+        Waits for in flight calls to finish.
+        """
+        self._executor.shutdown(wait=True)
+
+        logger.debug("Closed AsyncDatabase.")
+
+    async def _run(self, call: Callable[[], T]) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, call)
@@ -1,13 +1,26 @@
-from typing import List, Tuple
+import io
+import uuid
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Tuple
 
 import psycopg2
+import psycopg2.extras
 
 from talos.config.settings import Settings
 from talos.exceptions.db import *
 from talos.logger import logger
 
+from .pool import get_pool
+
 
 class BaseDatabase:
+    """
+    Connections are checked out of the process-wide DatabasePool by connect() and
+    returned by disconnect(), so entering a ContextDatabase or TransactionalDatabase
+    reuses an open connection rather than opening one.
+    """
+    PROBE_TIMEOUT_SECS = 5
+
     CONFIG = {
         "database": Settings.DB_USER,
         "host": Settings.DB_HOSTNAME,
@@ -23,18 +36,41 @@ class BaseDatabase:
         self.connection: psycopg2.connection = None
         self.cursor: psycopg2.cursor = None
 
+    @classmethod
+    def is_ready(cls) -> bool:
+        """
+        Probes whether the PostgreSQL database accepts connections, by opening
+        and closing one.
+
+        Returns:
+            bool: True if a connection was opened, False otherwise.
+        """
+        try:
+            psycopg2.connect(**cls.CONFIG, connect_timeout=cls.PROBE_TIMEOUT_SECS).close()
+        except psycopg2.Error as e:
+            logger.debug(f"Database is not ready: {e!r}.")
+            return False
+
+        return True
+
     @log_reraise_fatal_exception
     @log_reraise_non_fatal_exception
     def connect(self) -> None:
         """
-        Establishes a connection to the PostgreSQL database and creates a cursor.
+        Checks out a connection to the PostgreSQL database from the pool and creates a cursor.
 
         Raises:
+            DatabasePoolExhausted (DatabaseNonFatalException): If no pooled connection was free in time.
             DatabaseNonFatalException: For non-fatal internal psycopg2 exceptions.
             DatabaseFatalException: For fatal internal psycopg2 exceptions.
         """
-        if not self.connection or self.connection.closed:
-            self.connection = psycopg2.connect(**self.CONFIG)
+        if self.connection and self.connection.closed:
+            get_pool(self.CONFIG).checkin(self.connection)
+            self.connection = None
+            self.cursor = None
+
+        if not self.connection:
+            self.connection = get_pool(self.CONFIG).checkout()
 
         if not self.cursor or self.cursor.closed:
             self.cursor = self.connection.cursor()
@@ -45,7 +81,8 @@ class BaseDatabase:
     @log_reraise_non_fatal_exception
     def disconnect(self) -> None:
         """
-        Closes the cursor and the connection to the PostgreSQL database.
+        Closes the cursor and returns the connection to the pool, which rolls back
+        any uncommitted transaction.
 
         Raises:
             DatabaseNonFatalException: For non-fatal internal psycopg2 exceptions.
@@ -54,8 +91,11 @@ class BaseDatabase:
         if self.cursor and not self.cursor.closed:
             self.cursor.close()
 
-        if self.connection and not self.connection.closed:
-            self.connection.close()
+        if self.connection:
+            get_pool(self.CONFIG).checkin(self.connection)
+
+        self.connection = None
+        self.cursor = None
 
         logger.debug(f"Disconnected from database ({self.CONFIG['database']}).")
 
@@ -93,6 +133,39 @@ class BaseDatabase:
 
         return self.cursor.fetchall()
 
+    def iter_rows(self, query: str, params: Tuple = None, batch_size: int = Settings.DB_FETCH_BATCH_SIZE) -> Iterator[List[Tuple]]:
+        """
+        Executes a query with a server-side cursor, yielding its rows in chunks of up
+        to `batch_size`, one round trip each, so that only one chunk is held in memory
+        however many rows there are. The cursor lives in the connection's transaction,
+        so the chunks must be consumed before it is committed or rolled back, while
+        other queries may still be executed on the connection in between.
+
+        Args:
+            query (str): The SQL query to execute, a single SELECT.
+            params (Tuple, optional): Parameters to bind to the query.
+            batch_size (int = Settings.DB_FETCH_BATCH_SIZE): The most rows per chunk.
+
+        Yields:
+            List[Tuple]: The next chunk of rows of the query result set.
+
+        Raises:
+            DatabaseNonFatalException: For non-fatal internal psycopg2 exceptions.
+            DatabaseFatalException: For fatal internal psycopg2 exceptions.
+        """
+        cursor = self._open_server_cursor(query, params)
+
+        try:
+            while True:
+                rows = self._fetch_chunk(cursor, batch_size)
+                if not rows:
+                    return
+
+                yield rows
+        finally:
+            if not cursor.closed and not self.connection.closed:
+                cursor.close()
+
     @log_reraise_fatal_exception
     @log_reraise_non_fatal_exception
     def commit(self):
@@ -108,6 +181,119 @@ class BaseDatabase:
         self.connection.commit()
         logger.debug("Committed changes to the database.")
 
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def insert_rows(
+        self,
+        table: str,
+        columns: Tuple[str, ...],
+        rows: List[Tuple],
+        template: str = None,
+        returning: Tuple[str, ...] = None,
+        on_conflict: Tuple[str, ...] = None,
+        update: Tuple[str, ...] = None,
+        page_size: int = Settings.DB_INSERT_PAGE_SIZE
+    ) -> List[Tuple]:
+        """
+        Inserts rows with multi-row INSERT statements, `page_size` rows per round
+        trip, rather than one statement per row. Not committed, see commit().
+
+        Args:
+            table (str): The name of the table, trusted, e.g. from Settings.
+            columns (Tuple[str, ...]): The columns the values of each row are for.
+            rows (List[Tuple]): The rows, each with a value per placeholder of `template`.
+            template (str = None): The SQL of each row, e.g. "(%s, NOW())", by default
+                a placeholder per column.
+            returning (Tuple[str, ...] = None): The columns to return of each inserted row.
+            on_conflict (Tuple[str, ...] = None): The columns of a unique index or constraint,
+                rows which conflict on them are upserted rather than raising an error.
+                None or empty to insert every row.
+            update (Tuple[str, ...] = None): The columns a conflicting row updates the
+                existing row's with, by default it is skipped. Requires `on_conflict`.
+            page_size (int = Settings.DB_INSERT_PAGE_SIZE): The most rows per statement.
+
+        Returns:
+            List[Tuple]: The `returning` columns of each inserted or updated row, not of
+                those skipped, or an empty list if `returning` is None.
+
+        Raises:
+            DatabaseNonFatalException: For non-fatal internal psycopg2 exceptions.
+            DatabaseFatalException: For fatal internal psycopg2 exceptions.
+        """
+        self._validate_connection()
+        conflict = _on_conflict_clause(on_conflict, update)
+
+        if not rows:
+            return []
+
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s{conflict}"
+        if returning:
+            query += f" RETURNING {', '.join(returning)}"
+
+        inserted = psycopg2.extras.execute_values(
+            self.cursor,
+            query,
+            rows,
+            template=template,
+            page_size=page_size,
+            fetch=bool(returning)
+        )
+        logger.debug(f"Inserted {len(rows)} rows into {table}.")
+
+        return inserted if returning else []
+
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def copy_rows(self, table: str, columns: Tuple[str, ...], rows: Iterable[Tuple]) -> None:
+        """
+        Inserts rows with COPY FROM STDIN, streaming them in one round trip without
+        a statement to parse or plan, the fastest way to load many rows. Unlike
+        insert_rows() it can't skip or update rows which conflict, see `on_conflict`.
+        Not committed, see commit().
+
+        Args:
+            table (str): The name of the table, trusted, e.g. from Settings.
+            columns (Tuple[str, ...]): The columns the values of each row are for.
+            rows (Iterable[Tuple]): The rows, each with a value per column. Values are
+                written as text, so must be None, bool, datetime, or have a str() which
+                the column's type parses, e.g. JSON for JSONB.
+
+        Raises:
+            DatabaseNonFatalException: For non-fatal internal psycopg2 exceptions.
+            DatabaseFatalException: For fatal internal psycopg2 exceptions.
+        """
+        self._validate_connection()
+
+        data = io.StringIO()
+        count = 0
+        for row in rows:
+            data.write("\t".join(_copy_value(value) for value in row))
+            data.write("\n")
+            count += 1
+
+        if not count:
+            return
+
+        data.seek(0)
+        self.cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", data)
+        logger.debug(f"Copied {count} rows into {table}.")
+
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def _open_server_cursor(self, query: str, params: Tuple) -> psycopg2.extensions.cursor:
+        self._validate_connection()
+
+        cursor = self.connection.cursor(name=f"talos_{uuid.uuid4().hex}")
+        cursor.execute(query, params)
+        logger.debug(f"Executed query={query} with params={params} on a server-side cursor.")
+
+        return cursor
+
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def _fetch_chunk(self, cursor: psycopg2.extensions.cursor, batch_size: int) -> List[Tuple]:
+        return cursor.fetchmany(batch_size)
+
     def _validate_connection(self):
         """
         Checks if the connection and cursor are established.
@@ -118,3 +304,40 @@ class BaseDatabase:
         if not self.cursor or not self.connection:
             logger.error("Connection not initialised before attempting queries.")
             raise DatabaseNotInitialisedException()
+
+
+def _on_conflict_clause(on_conflict: Tuple[str, ...], update: Tuple[str, ...]) -> str:
+    if not on_conflict:
+        if update:
+            raise ValueError("Columns to update on conflict require the columns which conflict.")
+        return ""
+
+    clause = f" ON CONFLICT ({', '.join(on_conflict)})"
+    if not update:
+        return clause + " DO NOTHING"
+
+    return clause + " DO UPDATE SET " + ", ".join(f"{column} = EXCLUDED.{column}" for column in update)
+
+
+# backslash first, the escapes which follow introduce more
+COPY_ESCAPES = (("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r"))
+
+
+def _copy_value(value: Any) -> str:
+    """
+    Formats a value as a field of COPY's text format.
+    """
+    if value is None:
+        return "\\N"
+
+    if isinstance(value, bool):
+        return "t" if value else "f"
+
+    if isinstance(value, datetime):
+        value = value.isoformat()
+
+    value = str(value)
+    for character, escape in COPY_ESCAPES:
+        value = value.replace(character, escape)
+
+    return value
@@ -0,0 +1,249 @@
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import psycopg2
+import psycopg2.extensions
+
+from talos.config.settings import Settings
+from talos.exceptions.db import DatabasePoolExhausted
+from talos.logger import logger
+
+
+class DatabasePool:
+    """
+    Hands out connections from a set of persistent PostgreSQL connections, so that
+    ContextDatabase and TransactionalDatabase don't pay a TCP and authentication
+    round trip (and a backend process fork) each time they are entered.
+
+    Connections are opened lazily, up to `max_size`, and kept open while idle down to
+    `min_size`; idle ones beyond that are closed after MAX_IDLE_SECS. A connection is
+    health checked when checked out, and one idle for longer than HEALTH_CHECK_IDLE_SECS
+    is probed with a query, so that one dropped by the server is replaced rather than
+    handed out. Connections older than `max_lifetime_secs` are closed rather than
+    reused, bounding the memory a long-lived backend accumulates. Any transaction left
+    open is rolled back when a connection is returned.
+
+    Args:
+        config (dict): The keyword arguments of psycopg2.connect().
+        min_size (int): The fewest idle connections to keep open.
+        max_size (int): The most connections to have open.
+        max_lifetime_secs (int): The longest a connection is used for.
+    """
+    ACQUIRE_TIMEOUT_SECS = 30
+    MAX_IDLE_SECS = 300
+    HEALTH_CHECK_IDLE_SECS = 30
+
+    def __init__(
+        self,
+        config: dict,
+        min_size: int = Settings.DB_POOL_MIN_SIZE,
+        max_size: int = Settings.DB_POOL_MAX_SIZE,
+        max_lifetime_secs: int = Settings.DB_POOL_MAX_LIFETIME_SECS
+    ):
+        self.config = config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime_secs = max_lifetime_secs
+
+        # (connection, opened at, returned at), most recently returned last
+        self.idle: List[Tuple[psycopg2.extensions.connection, float, float]] = []
+        self._opened_at: Dict[int, float] = {}
+        self._created = 0
+        self._condition = threading.Condition()
+
+    def checkout(self) -> psycopg2.extensions.connection:
+        """
+        Takes a healthy connection from the pool, opening one if none are idle and
+        fewer than `max_size` are open.
+
+        Returns:
+            psycopg2.extensions.connection: The connection, with no transaction open.
+
+        Raises:
+            DatabasePoolExhausted (DatabaseNonFatalException): If no connection was
+                returned to the pool within ACQUIRE_TIMEOUT_SECS.
+            psycopg2.Error: If a connection could not be opened.
+        """
+        deadline = time.monotonic() + self.ACQUIRE_TIMEOUT_SECS
+
+        while True:
+            with self._condition:
+                entry = self._take_idle(deadline)
+
+            if entry is None:
+                return self._open()
+
+            connection, opened_at, returned_at = entry
+            if self._is_healthy(connection, opened_at, returned_at):
+                self._opened_at[id(connection)] = opened_at
+                return connection
+
+            self._discard(connection)
+
+    def checkin(self, connection: psycopg2.extensions.connection) -> None:
+        """
+        Returns a connection taken with checkout(), rolling back any transaction left
+        open. One which was closed, is in an unknown state, or has outlived
+        `max_lifetime_secs` is closed instead.
+
+        Args:
+            connection (psycopg2.extensions.connection): The connection.
+        """
+        opened_at = self._opened_at.pop(id(connection), None)
+        if opened_at is None:
+            logger.notice("A connection which was not checked out was returned to the database pool.")
+            return
+
+        if connection.closed or time.monotonic() - opened_at > self.max_lifetime_secs:
+            self._discard(connection)
+            return
+
+        try:
+            status = connection.info.transaction_status
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                self._discard(connection)
+                return
+
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except psycopg2.Error:
+            logger.notice("Failed to roll back a pooled database connection.")
+            self._discard(connection)
+            return
+
+        with self._condition:
+            self.idle.append((connection, opened_at, time.monotonic()))
+            expired = self._prune()
+            self._condition.notify()
+
+        for connection in expired:
+            self._close(connection)
+
+    def close(self) -> None:
+        """
+        Closes the idle connections.
+        """
+        with self._condition:
+            idle, self.idle = self.idle, []
+            self._created -= len(idle)
+            self._condition.notify_all()
+
+        for connection, _, _ in idle:
+            self._close(connection)
+
+    def _take_idle(self, deadline: float):
+        """
+        Takes the most recently returned idle connection, or reserves a slot for a new
+        one, returning None, if under `max_size`. Called with the condition held.
+        """
+        while True:
+            if self.idle:
+                return self.idle.pop()
+
+            if self._created < self.max_size:
+                self._created += 1
+                return None
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.error(f"No database connection was free within {self.ACQUIRE_TIMEOUT_SECS} seconds.")
+                raise DatabasePoolExhausted()
+
+            self._condition.wait(remaining)
+
+    def _open(self) -> psycopg2.extensions.connection:
+        try:
+            connection = psycopg2.connect(**self.config)
+        except BaseException:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+
+        self._opened_at[id(connection)] = time.monotonic()
+        return connection
+
+    def _is_healthy(self, connection: psycopg2.extensions.connection, opened_at: float, returned_at: float) -> bool:
+        now = time.monotonic()
+
+        if connection.closed or now - opened_at > self.max_lifetime_secs:
+            return False
+
+        if now - returned_at <= self.HEALTH_CHECK_IDLE_SECS:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+        except psycopg2.Error:
+            logger.notice("Pooled database connection failed its health check.")
+            return False
+
+        return True
+
+    def _prune(self) -> List[psycopg2.extensions.connection]:
+        """
+        Removes the idle connections which have outlived `max_lifetime_secs`, and those
+        idle for longer than MAX_IDLE_SECS beyond `min_size`, oldest returned first.
+        Called with the condition held; the connections are closed by the caller.
+        """
+        now = time.monotonic()
+        expired = []
+
+        for entry in list(self.idle):
+            connection, opened_at, returned_at = entry
+            surplus = len(self.idle) > self.min_size and now - returned_at > self.MAX_IDLE_SECS
+
+            if surplus or now - opened_at > self.max_lifetime_secs:
+                self.idle.remove(entry)
+                self._created -= 1
+                expired.append(connection)
+
+        return expired
+
+    def _discard(self, connection: psycopg2.extensions.connection) -> None:
+        with self._condition:
+            self._created -= 1
+            self._condition.notify()
+
+        self._close(connection)
+
+    def _close(self, connection: psycopg2.extensions.connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            logger.notice("Failed to close a pooled database connection.")
+
+
+_pool: DatabasePool = None
+_pool_pid: int = None
+_pool_lock = threading.Lock()
+
+# Pools inherited through a fork. Their connections share sockets with the parent's,
+# so they are kept referenced rather than collected, which would close them.
+_inherited_pools: List[DatabasePool] = []
+
+
+def get_pool(config: dict) -> DatabasePool:
+    """
+    Args:
+        config (dict): The keyword arguments of psycopg2.connect(), used if the pool is created.
+
+    Returns:
+        DatabasePool: The process-wide pool, created on first use. A forked child
+            creates its own, as connections cannot be shared across processes.
+    """
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            if _pool is not None:
+                _inherited_pools.append(_pool)
+
+            _pool = DatabasePool(config)
+            _pool_pid = os.getpid()
+
+        return _pool
@@ -1,3 +1,5 @@
+import json
+
 import requests
 
 from talos.exceptions.base import FatalException, NonFatalException
@@ -17,6 +19,7 @@ NON_FATAL_EXCEPTIONS = (
     requests.exceptions.SSLError,
     requests.exceptions.InvalidJSONError,
     requests.exceptions.JSONDecodeError,
+    json.JSONDecodeError,
 )
 
 FATAL_EXCEPTIONS = (
@@ -43,9 +46,18 @@ class APINonFatalException(NonFatalException):
 class TokenNotFound(APINonFatalException):
     pass
 
+class InvalidTokenPoolConfig(APIFatalException):
+    pass
+
+class RateLimited(APINonFatalException):
+    pass
+
 class InvalidRequestType(APIFatalException):
     pass
 
+class CassetteNotFound(APIFatalException):
+    pass
+
 
 log_reraise_non_fatal_exception = log_and_reraise_exception(
     to_catch=NON_FATAL_EXCEPTIONS,
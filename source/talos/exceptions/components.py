@@ -0,0 +1,18 @@
+from typing import List
+
+from talos.exceptions.base import FatalException
+
+
+class DependenciesNotReadyException(FatalException):
+    def __init__(self, dependencies: List[str], timeout_secs: int):
+        super().__init__(
+            f"Dependencies {', '.join(dependencies)} not ready within {timeout_secs} seconds."
+        )
+
+
+class ConnectionBudgetExceeded(FatalException):
+    def __init__(self, workers: int, pool_size: int, budget: int):
+        super().__init__(
+            f"{workers} workers with DB_POOL_MAX_SIZE={pool_size} may open {workers * pool_size} "
+            f"database connections, over DB_CONNECTION_BUDGET={budget}."
+        )
@@ -6,3 +6,10 @@ class EnvironmentVariableNotSetException(FatalException):
         super().__init__(
             f"Missing required environment variable {variable}."
         )
+
+
+class UnknownSerializer(FatalException):
+    def __init__(self, name):
+        super().__init__(
+            f"Unknown JSON serializer {name}, expected auto, orjson, ujson or json."
+        )
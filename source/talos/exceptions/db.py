@@ -21,6 +21,10 @@ class DatabaseNotInitialisedException(DatabaseFatalException):
     pass
 
 
+class DatabasePoolExhausted(DatabaseNonFatalException):
+    pass
+
+
 log_reraise_non_fatal_exception = log_and_reraise_exception(
     to_catch=NON_FATAL_EXCEPTIONS,
     should_raise=DatabaseNonFatalException
@@ -43,6 +43,18 @@ class UnknownQueueException(RabbitMQFatalException):
     pass
 
 
+class PublishNotConfirmed(RabbitMQNonFatalException):
+    pass
+
+
+class PoolExhausted(RabbitMQNonFatalException):
+    pass
+
+
+class UnknownMessageFormat(RabbitMQFatalException):
+    pass
+
+
 log_reraise_non_fatal_exception = log_and_reraise_exception(
     to_catch=NON_FATAL_EXCEPTIONS,
     should_raise=RabbitMQNonFatalException
@@ -1,4 +1,5 @@
 import logging
+import os
 
 import google.cloud.logging
 from talos.config import Settings
@@ -13,13 +14,32 @@ logging.getLogger('google.cloud').setLevel(logging.INFO)
 logger = logging.getLogger()
 logger.setLevel(logging.DEBUG)
 
-if not Settings.IS_DEV:
+
+def _create_cloud_handler() -> logging.Handler:
     client = google.cloud.logging.Client()
-    cloud_handler = google.cloud.logging.handlers.CloudLoggingHandler(
+    return google.cloud.logging.handlers.CloudLoggingHandler(
         client,
         name=Settings.COMPONENT_NAME
     )
+
+
+def _reinit_cloud_handler_after_fork() -> None:
+    """
+    The cloud handler ships records from a background thread over gRPC, neither of
+    which survive a fork, so a forked worker (see Supervisor) gets its own.
+    """
+    global cloud_handler
+
+    logger.removeHandler(cloud_handler)
+    cloud_handler = _create_cloud_handler()
     logger.addHandler(cloud_handler)
+
+
+if not Settings.IS_DEV:
+    cloud_handler = _create_cloud_handler()
+    logger.addHandler(cloud_handler)
+
+    os.register_at_fork(after_in_child=_reinit_cloud_handler_after_fork)
 else:
     stdout_handler = logging.StreamHandler()
     formatter = logging.Formatter(
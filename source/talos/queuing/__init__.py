@@ -1 +1,3 @@
-from .rabbitmq import RabbitMQ
\ No newline at end of file
+from .rabbitmq import RabbitMQ
+from .async_rabbitmq import AsyncRabbitMQ
+from .pool import RabbitMQPool, get_pool
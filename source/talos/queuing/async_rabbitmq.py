@@ -0,0 +1,131 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from talos.config import Settings
+from talos.logger import logger
+
+from .rabbitmq import RabbitMQ
+
+
+class AsyncRabbitMQ:
+    """
+    An asyncio counterpart to RabbitMQ, allowing many messages to be handled at
+    once from a single event loop.
+
+    The connection is owned by a dedicated thread, as pika's BlockingConnection is
+    not thread-safe. While consuming, that thread services the connection and each
+    delivery is handled by a task on the event loop, with at most `prefetch_count`
+    in flight; publishes are marshalled onto the thread. The mapping of errors to
+    RabbitMQFatalException and RabbitMQNonFatalException is identical to RabbitMQ.
+
+    Args:
+        queues (Tuple[str]): A tuple containing the names of the queues.
+    """
+
+    def __init__(self, queues: Tuple[str]):
+        self.rabbitmq = RabbitMQ(queues)
+        self.queues = self.rabbitmq.queues
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="talos-rabbitmq")
+        self._consuming = False
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+
+    async def connect(self) -> None:
+        """
+        Awaitable version of RabbitMQ.connect(), see its documentation.
+        """
+        await self._run_on_connection_thread(self.rabbitmq.connect)
+
+    async def disconnect(self) -> None:
+        """
+        Awaitable version of RabbitMQ.disconnect(), see its documentation.
+        """
+        await self._run_on_connection_thread(self.rabbitmq.disconnect)
+        self._executor.shutdown(wait=True)
+
+    async def publish_message(self, queue_name: str, message: str, expiration_ms: int = None, priority: int = None) -> None:
+        """
+        Awaitable version of RabbitMQ.publish_message(), see its documentation.
+        """
+        await self._publish(self.rabbitmq.publish_message, queue_name, message, expiration_ms, priority)
+
+    async def publish_messages(self, queue_name: str, messages: List[str], priorities: List[int] = None) -> None:
+        """
+        Awaitable version of RabbitMQ.publish_messages(), see its documentation.
+        """
+        await self._publish(self.rabbitmq.publish_messages, queue_name, messages, priorities)
+
+    async def publish_batch(self, queue_name: str, messages: List[str], window: int = Settings.RABBITMQ_CONFIRM_WINDOW, priorities: List[int] = None) -> List[bool]:
+        """
+        Awaitable version of RabbitMQ.publish_batch(), see its documentation.
+        """
+        return await self._publish(self.rabbitmq.publish_batch, queue_name, messages, window, priorities)
+
+    async def publish_delayed(self, queue_name: str, messages: List[str], due_at: List[datetime], priorities: List[int] = None) -> List[bool]:
+        """
+        Awaitable version of RabbitMQ.publish_delayed(), see its documentation.
+        """
+        return await self._publish(self.rabbitmq.publish_delayed, queue_name, messages, due_at, priorities)
+
+    async def continually_consume_messages(self, queue_name: str, callback_function: Callable[[bytes], Awaitable], prefetch_count: int) -> None:
+        """
+        Consumes messages from a specific queue indefinitely, awaiting the coroutine
+        function `callback_function` for each, with at most `prefetch_count` in flight.
+        Messages are (n)ack'd once awaited, see RabbitMQ.continually_dispatch_messages().
+
+        Args:
+            queue_name (str): The name of the queue to consume from.
+            callback_function (Callable[[bytes], Awaitable]): The coroutine function to be called for each message.
+            prefetch_count (int): The most messages handled at once.
+
+        Raises:
+            RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
+            RabbitMQFatalException: For fatal internal AMPQ exceptions, or if `callback_function` raised.
+        """
+        loop = asyncio.get_running_loop()
+
+        def dispatch(body: bytes, settle: Callable[[Optional[BaseException]], None]) -> None:
+            logger.debug(f"Received message {body}.")
+
+            future = asyncio.run_coroutine_threadsafe(callback_function(body), loop)
+            future.add_done_callback(
+                lambda done: settle(done.exception() if not done.cancelled() else asyncio.CancelledError())
+            )
+
+        logger.debug(f"Attempting to begin consuming from queue={queue_name} with prefetch_count={prefetch_count}.")
+
+        self._consuming = True
+        try:
+            await loop.run_in_executor(
+                self._executor,
+                functools.partial(self.rabbitmq.continually_dispatch_messages, queue_name, dispatch, prefetch_count)
+            )
+        except asyncio.CancelledError:
+            self.rabbitmq.stop_consuming()
+            raise
+        finally:
+            self._consuming = False
+
+    async def _run_on_connection_thread(self, function: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args))
+
+    async def _publish(self, function: Callable, *args: Any) -> Any:
+        """
+        Runs a publish on the connection's thread. While it is consuming, the call
+        is made from the default executor and RabbitMQ marshals it onto the thread.
+        """
+        if not self._consuming:
+            return await self._run_on_connection_thread(function, *args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(function, *args))
@@ -0,0 +1,183 @@
+import struct
+from enum import IntEnum
+from typing import Optional, Union
+
+from talos.config.settings import Settings
+from talos.exceptions.queuing import UnknownMessageFormat
+from talos.util import serialization
+
+GATEWAY_URL = "https://gateway.reddit.com/desktopapi/v1"
+
+# Requests.TYPE_GET and Requests.TYPE_POST
+METHOD_GET = 0
+METHOD_POST = 1
+
+
+class PostRescanType(IntEnum):
+    BASE = 0
+    MORE = 1
+    CONTINUE = 2
+
+
+# version byte, type byte, post rescan ID, (depth,) then each string as a length and UTF-8 bytes
+COMPACT_VERSION = 2
+COMPACT_HEADERS = {
+    1: struct.Struct("!BBQ"),
+    2: struct.Struct("!BBQH"),
+}
+COMPACT_LENGTH = struct.Struct("!H")
+MAX_DEPTH = 2 ** 16 - 1
+
+
+def encode_post_rescan(
+    post_id: str,
+    post_rescans_id: int,
+    type: PostRescanType,
+    token: str = None,
+    parent_id: str = None,
+    depth: int = 0,
+    format: str = Settings.POST_RESCAN_MESSAGE_FORMAT
+) -> Union[str, bytes]:
+    """
+    Builds a POST_RESCAN_QUEUE message for one API request. The compact format
+    carries only the IDs and token, the consumer rebuilds the request from them,
+    which makes messages a fraction of the size of JSON with the full URL.
+
+    Args:
+        post_id (str): The ID of the post to fetch comments from.
+        post_rescans_id (int): The ID of the post rescan the request belongs to.
+        type (PostRescanType): Whether to fetch the post, a 'show more' or a 'continue thread' section.
+        token (str = None): The token of the 'show more' section, for PostRescanType.MORE.
+        parent_id (str = None): The ID of the comment continued, for PostRescanType.CONTINUE.
+        depth (int = 0): How many requests led to this one, 0 for PostRescanType.BASE.
+        format (str = Settings.POST_RESCAN_MESSAGE_FORMAT): "compact", or "json" for
+            consumers which predate the compact format.
+
+    Returns:
+        Union[str, bytes]: The message, bytes if compact, str if JSON.
+    """
+    type = PostRescanType(type)
+    argument = {
+        PostRescanType.BASE: None,
+        PostRescanType.MORE: token,
+        PostRescanType.CONTINUE: parent_id,
+    }[type]
+
+    if format == "json":
+        return serialization.dumps({
+            "post_id": post_id,
+            "post_rescans_id": post_rescans_id,
+            "type": type.name.lower(),
+            "depth": depth,
+            "api_request": _api_request(post_id, type, argument)
+        })
+
+    header = COMPACT_HEADERS[COMPACT_VERSION].pack(COMPACT_VERSION, type, post_rescans_id, min(depth, MAX_DEPTH))
+    message = header + _pack_string(post_id)
+    if argument is not None:
+        message += _pack_string(argument)
+
+    return message
+
+
+def decode_post_rescan(message: Union[str, bytes, bytearray]) -> dict:
+    """
+    Reads a POST_RESCAN_QUEUE message of either format, rebuilding the API request
+    of a compact one, so that consumers handle both while producers are upgraded.
+
+    Args:
+        message (Union[str, bytes, bytearray]): The message body.
+
+    Returns:
+        dict: The message as JSON messages are structured, i.e. with "post_id",
+            "post_rescans_id", "type", "depth" and "api_request". Messages which
+            predate "depth" have a depth of 0.
+
+    Raises:
+        UnknownMessageFormat (RabbitMQFatalException): If the message is neither
+            JSON nor a known compact version.
+    """
+    if isinstance(message, str) or message[:1] == b"{":
+        decoded = serialization.loads(message)
+        decoded.setdefault("depth", 0)
+        return decoded
+
+    header = COMPACT_HEADERS.get(message[0] if message else None)
+    if header is None:
+        raise UnknownMessageFormat(f"Unknown post rescan message version {message[:1]}.")
+
+    try:
+        version, type, post_rescans_id, *depth = header.unpack_from(message)
+
+        type = PostRescanType(type)
+        post_id, offset = _unpack_string(message, header.size)
+        argument = _unpack_string(message, offset)[0] if type != PostRescanType.BASE else None
+    except (struct.error, ValueError) as e:
+        raise UnknownMessageFormat(f"Malformed post rescan message: {e}.") from e
+
+    return {
+        "post_id": post_id,
+        "post_rescans_id": post_rescans_id,
+        "type": type.name.lower(),
+        "depth": depth[0] if depth else 0,
+        "api_request": _api_request(post_id, type, argument)
+    }
+
+
+def post_rescan_priority(type: PostRescanType, depth: int, max_priority: int = Settings.POST_RESCAN_MAX_PRIORITY) -> int:
+    """
+    The priority to publish a post rescan message with. Base rescans take the highest,
+    so that one post's fan-out of nested sections can't hold up the rescans of others.
+    Nested sections are prioritised by depth, deepest first, so that threads already
+    underway finish before more are started, which bounds how many are queued.
+
+    Args:
+        type (PostRescanType): The type of the message.
+        depth (int): The depth of the message, see encode_post_rescan().
+        max_priority (int = Settings.POST_RESCAN_MAX_PRIORITY): The x-max-priority
+            of POST_RESCAN_QUEUE, 0 if it isn't a priority queue.
+
+    Returns:
+        int: The priority, from 0 to `max_priority`.
+    """
+    if type == PostRescanType.BASE:
+        return max_priority
+
+    return max(min(depth, max_priority - 1), 0)
+
+
+def _api_request(post_id: str, type: PostRescanType, argument: Optional[str]) -> dict:
+    if type == PostRescanType.MORE:
+        return {
+            "url": f"{GATEWAY_URL}/morecomments/{post_id}",
+            "method": METHOD_POST,
+            "body": {
+                "token": argument
+            }
+        }
+
+    if type == PostRescanType.CONTINUE:
+        return {
+            "url": f"{GATEWAY_URL}/postcomments/{post_id}/{argument}",
+            "method": METHOD_GET
+        }
+
+    return {
+        "url": f"{GATEWAY_URL}/postcomments/{post_id}",
+        "method": METHOD_GET
+    }
+
+
+def _pack_string(value: str) -> bytes:
+    encoded = value.encode("utf-8")
+    return COMPACT_LENGTH.pack(len(encoded)) + encoded
+
+
+def _unpack_string(message: bytes, offset: int):
+    (length,) = COMPACT_LENGTH.unpack_from(message, offset)
+    offset += COMPACT_LENGTH.size
+
+    if offset + length > len(message):
+        raise ValueError("string runs past the end of the message")
+
+    return bytes(message[offset:offset + length]).decode("utf-8"), offset + length
@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+import pika.exceptions
+
+from talos.config.settings import Settings
+from talos.exceptions.queuing import PoolExhausted
+from talos.logger import logger
+from talos.queuing.rabbitmq import RabbitMQ
+
+
+class RabbitMQPool:
+    """
+    Hands out RabbitMQ instances from a small set of persistent connections, so
+    that short-lived publishers don't open (and declare everything on) a new
+    connection each time.
+
+    pika's BlockingConnection is not thread-safe, so each instance, with its own
+    connection and channel, is used by one thread at a time, which adopts its
+    connection while it is checked out (see RabbitMQ.adopt_connection()).
+    Connections are opened lazily, up to `size`, and health checked when checked
+    out: one which was lost is reopened. Exchange and queue declarations are cached per connection
+    (see RabbitMQ._declare()), so each is declared once per connection.
+
+    Args:
+        size (int): The most connections to keep open.
+    """
+    ACQUIRE_TIMEOUT_SECS = 30
+
+    def __init__(self, size: int = Settings.RABBITMQ_POOL_SIZE):
+        self.size = size
+
+        self.idle: List[RabbitMQ] = []
+        self._created = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def acquire(self, queues: Tuple[str]) -> Iterator[RabbitMQ]:
+        """
+        Checks out a connected RabbitMQ instance which may use `queues`, which are
+        declared if not yet declared on its connection. The instance is returned to
+        the pool afterwards, or discarded if an exception was raised while it was out.
+
+        Args:
+            queues (Tuple[str]): A tuple containing the names of the queues.
+
+        Yields:
+            RabbitMQ: The connected instance.
+
+        Raises:
+            PoolExhausted (RabbitMQNonFatalException): If no instance was returned
+                to the pool within ACQUIRE_TIMEOUT_SECS.
+            RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
+            RabbitMQFatalException: For fatal internal AMPQ exceptions.
+        """
+        if not isinstance(queues, tuple):
+            queues = (queues,)
+
+        rabbitmq = self._checkout()
+        rabbitmq.adopt_connection()
+        try:
+            self._check_health(rabbitmq)
+            rabbitmq.add_queues(queues)
+
+            yield rabbitmq
+        except BaseException:
+            self._discard(rabbitmq)
+            raise
+
+        self._checkin(rabbitmq)
+
+    def close(self) -> None:
+        """
+        Disconnects the idle instances.
+        """
+        with self._condition:
+            idle, self.idle = self.idle, []
+            self._created -= len(idle)
+            self._condition.notify_all()
+
+        for rabbitmq in idle:
+            self._disconnect(rabbitmq)
+
+    def _checkout(self) -> RabbitMQ:
+        """
+        Takes the most recently returned idle instance, whose connection is the
+        least likely to have timed out, or creates one if under `size`.
+        """
+        deadline = time.monotonic() + self.ACQUIRE_TIMEOUT_SECS
+
+        with self._condition:
+            while True:
+                if self.idle:
+                    return self.idle.pop()
+
+                if self._created < self.size:
+                    self._created += 1
+                    return RabbitMQ(queues=())
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error(f"No RabbitMQ connection was free within {self.ACQUIRE_TIMEOUT_SECS} seconds.")
+                    raise PoolExhausted()
+
+                self._condition.wait(remaining)
+
+    def _checkin(self, rabbitmq: RabbitMQ) -> None:
+        with self._condition:
+            self.idle.append(rabbitmq)
+            self._condition.notify()
+
+    def _discard(self, rabbitmq: RabbitMQ) -> None:
+        with self._condition:
+            self._created -= 1
+            self._condition.notify()
+
+        self._disconnect(rabbitmq)
+
+    def _check_health(self, rabbitmq: RabbitMQ) -> None:
+        """
+        Services the connection's pending events, e.g. heartbeats, to find out
+        whether it was lost while idle, and reconnects if so.
+        """
+        if rabbitmq.connection is None:
+            rabbitmq.connect()
+            return
+
+        if rabbitmq.connection.is_open:
+            try:
+                rabbitmq.connection.process_data_events(time_limit=0)
+            except pika.exceptions.AMQPError:
+                logger.notice("Pooled RabbitMQ connection failed its health check.")
+
+        rabbitmq.ensure_connected()
+
+    def _disconnect(self, rabbitmq: RabbitMQ) -> None:
+        try:
+            rabbitmq.disconnect()
+        except Exception:
+            logger.notice("Failed to disconnect a pooled RabbitMQ connection.")
+
+
+_pool: RabbitMQPool = None
+_pool_pid: int = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> RabbitMQPool:
+    """
+    Returns:
+        RabbitMQPool: The process-wide pool, created on first use. A forked child
+            creates its own, as connections cannot be shared across processes.
+    """
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = RabbitMQPool()
+            _pool_pid = os.getpid()
+
+        return _pool
@@ -1,4 +1,11 @@
-from typing import Tuple, Dict, List, Callable
+import functools
+import math
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from datetime import datetime
+from typing import Tuple, Dict, List, Callable, Optional, Any
 
 import pika
 from pika.adapters.blocking_connection import BlockingChannel
@@ -7,13 +14,32 @@ from talos.config.settings import Settings
 from talos.exceptions.queuing import *
 from talos.logger import logger
 
+# added by the broker when dead-lettering a message
+DEAD_LETTER_HEADERS = ("x-death", "x-first-death-", "x-last-death-")
+
 
 class RabbitMQ:
+    CONFIRM_TIMEOUT_SECS = 30
+    THREADSAFE_TIMEOUT_SECS = 60
+    PROBE_TIMEOUT_SECS = 5
+
+    # the exchange and queues already declared on each connection
+    DECLARATIONS: "weakref.WeakKeyDictionary[pika.BlockingConnection, set]" = weakref.WeakKeyDictionary()
+
     CONFIG = {
         "host": Settings.RABBITMQ_HOSTNAME,
         "port": Settings.RABBITMQ_SERVICE_PORT,
     }
 
+    # the x-max-priority of each priority queue, others are FIFO
+    MAX_PRIORITIES = {
+        Settings.POST_RESCAN_QUEUE: Settings.POST_RESCAN_MAX_PRIORITY,
+    }
+
+    # delayed messages wait in queues with a TTL of 2 ** n seconds, for n up to MAX_DELAY_EXPONENT
+    MAX_DELAY_EXPONENT = 20
+    DUE_AT_HEADER = "x-talos-due-at"
+
     def __init__(self, queues: Tuple[str]):
         """
         Initialize the RabbitMQ object, should be used with a context manager.
@@ -23,6 +49,14 @@ class RabbitMQ:
         """
         self.connection: pika.BlockingConnection = None
         self.channel: BlockingChannel = None
+        self.confirm_channel: BlockingChannel = None
+
+        self._delivery_tag = 0
+        self._unconfirmed: Dict[int, int] = {}
+        self._outcomes: List[Optional[bool]] = []
+
+        # the thread which opened the connection, the only one which may use it
+        self._connection_thread: int = None
 
         if not isinstance(queues, tuple):
             queues = (queues,)
@@ -55,6 +89,25 @@ class RabbitMQ:
         """
         self.disconnect()
 
+    @classmethod
+    def is_ready(cls) -> bool:
+        """
+        Probes whether the RabbitMQ server accepts connections, by opening and
+        closing one.
+
+        Returns:
+            bool: True if a connection was opened, False otherwise.
+        """
+        try:
+            pika.BlockingConnection(
+                pika.ConnectionParameters(**cls.CONFIG, connection_attempts=1, socket_timeout=cls.PROBE_TIMEOUT_SECS)
+            ).close()
+        except (*NON_FATAL_EXCEPTIONS, OSError) as e:
+            logger.debug(f"RabbitMQ is not ready: {e!r}.")
+            return False
+
+        return True
+
     @log_reraise_fatal_exception
     @log_reraise_non_fatal_exception
     def connect(self) -> None:
@@ -69,6 +122,7 @@ class RabbitMQ:
             self.connection = pika.BlockingConnection(
                 pika.ConnectionParameters(**self.CONFIG)
             )
+            self._connection_thread = threading.get_ident()
 
         if not self.channel or self.channel.is_closed:
             self.channel = self.connection.channel()
@@ -76,9 +130,58 @@ class RabbitMQ:
         logger.debug("Connected to RabbitMQ.")
 
         if self.connection.is_open and self.channel.is_open:
-            self._declare_exchange()
-            for queue_name in self.queues:
-                self._declare_queue(queue_name)
+            self._declare(self.queues)
+
+    def add_queues(self, queues: Tuple[str]) -> None:
+        """
+        Adds queues to a connected instance, declaring any not yet declared on its connection.
+
+        Args:
+            queues (Tuple[str]): A tuple containing the names of the queues.
+
+        Raises:
+            RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
+            RabbitMQFatalException: For fatal internal AMPQ exceptions.
+        """
+        self._validate_connection()
+
+        self.queues = self.queues + tuple(queue for queue in queues if queue not in self.queues)
+        self._declare(queues)
+
+    def ensure_connected(self, owner_only: bool = False) -> None:
+        """
+        Reconnects if the connection or channel was lost, otherwise does nothing,
+        so that a long-lived instance can be reused without redeclaring the
+        exchange and queues on every use.
+
+        Args:
+            owner_only (bool = False): Only reconnect on the thread which opened the
+                connection, e.g. while it is consuming, as reconnecting from another
+                would replace the connection that thread is still using.
+
+        Raises:
+            RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions, or if
+                `owner_only` and the connection was lost on another thread.
+            RabbitMQFatalException: For fatal internal AMPQ exceptions.
+        """
+        if self.connection and self.connection.is_open and self.channel and self.channel.is_open:
+            return
+
+        if owner_only and not self._on_connection_thread():
+            logger.error("RabbitMQ connection lost, it can only be reopened by the thread which opened it.")
+            raise RabbitMQNonFatalException()
+
+        logger.notice("RabbitMQ connection lost, reconnecting...")
+        self.connect()
+
+    def adopt_connection(self) -> None:
+        """
+        Makes the calling thread the one which owns the connection, for an instance
+        used by one thread at a time but handed between threads, e.g. by RabbitMQPool.
+        Otherwise, publishes from any thread but the one which opened the connection
+        are handed to that thread, which isn't servicing the connection.
+        """
+        self._connection_thread = threading.get_ident()
 
     @log_reraise_fatal_exception
     def disconnect(self) -> None:
@@ -91,6 +194,9 @@ class RabbitMQ:
         if self.channel and self.channel.is_open:
             self.channel.close()
 
+        if self.confirm_channel and self.confirm_channel.is_open:
+            self.confirm_channel.close()
+
         if self.connection and self.connection.is_open:
             self.connection.close()
 
@@ -98,13 +204,15 @@ class RabbitMQ:
 
     @log_reraise_fatal_exception
     @log_reraise_non_fatal_exception
-    def publish_message(self, queue_name: str, message: str) -> None:
+    def publish_message(self, queue_name: str, message: str, expiration_ms: int = None, priority: int = None) -> None:
         """
         Publishes a message to a specific queue.
 
         Args:
             queue_name (str): The name of the queue.
             message (str): The message to be published.
+            expiration_ms (int = None): The time after which the broker drops the message if unconsumed.
+            priority (int = None): The priority of the message, if the queue is a priority queue (see MAX_PRIORITIES).
 
         Raises:
             RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
@@ -113,40 +221,172 @@ class RabbitMQ:
         self._validate_connection()
         self._validate_queue(queue_name)
 
+        if not self._on_connection_thread():
+            return self._call_threadsafe(self.publish_message, queue_name, message, expiration_ms, priority)
+
         self.channel.basic_publish(
             exchange=Settings.RABBITMQ_EXCHANGE_NAME,
             routing_key=queue_name,
             body=message,
             properties=pika.BasicProperties(
-                delivery_mode=pika.spec.PERSISTENT_DELIVERY_MODE
+                delivery_mode=pika.spec.PERSISTENT_DELIVERY_MODE,
+                expiration=str(expiration_ms) if expiration_ms is not None else None,
+                priority=priority
             )
         )
         logger.debug(f"Published to queue={queue_name} message={message}.")
 
     # should propogate up, no decorator
-    def publish_messages(self, queue_name: str, messages: List[Dict]) -> None:
+    def publish_messages(self, queue_name: str, messages: List[str], priorities: List[int] = None) -> None:
         """
-        Publishes a list of messages to a specific queue. 
+        Publishes a list of messages to a specific queue as one batch, see publish_batch().
 
         Args:
             queue_name (str): The name of the queue.
-            messages (List[Dict]): The list of messages to be published.
+            messages (List[str]): The list of messages to be published.
+            priorities (List[int] = None): The priority of each message, see publish_batch().
+
+        Raises:
+            PublishNotConfirmed (RabbitMQNonFatalException): If any message was not confirmed by the broker.
 
         Note: This function is not decorated, exceptions should propagate up.
         """
-        for message in messages:
-            self.publish_message(queue_name, message)
+        outcomes = self.publish_batch(queue_name, messages, priorities=priorities)
+
+        if not all(outcomes):
+            logger.error(f"{outcomes.count(False)} of {len(messages)} messages to queue={queue_name} were not confirmed.")
+            raise PublishNotConfirmed()
 
     @log_reraise_fatal_exception
     @log_reraise_non_fatal_exception
-    def continually_consume_messages(self, queue_name: str, callback_function: Callable) -> None:
+    def publish_batch(self, queue_name: str, messages: List[str], window: int = Settings.RABBITMQ_CONFIRM_WINDOW, priorities: List[int] = None) -> List[bool]:
+        """
+        Publishes messages to a specific queue with publisher confirms. Messages are
+        pipelined on a dedicated channel in confirm mode, with up to `window` of them
+        awaiting confirmation at once, rather than waiting on each in turn.
+        Called from another thread, e.g. a worker of continually_consume_messages(),
+        the batch is published by the connection's thread.
+
+        Args:
+            queue_name (str): The name of the queue.
+            messages (List[str]): The messages to be published.
+            window (int = Settings.RABBITMQ_CONFIRM_WINDOW): The most messages awaiting confirmation at once.
+            priorities (List[int] = None): The priority of each message, if the queue is a priority
+                queue (see MAX_PRIORITIES).
+
+        Returns:
+            List[bool]: For each message, True if the broker confirmed it, or False if it was
+                nacked or not confirmed within CONFIRM_TIMEOUT_SECS.
+
+        Raises:
+            RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
+            RabbitMQFatalException: For fatal internal AMPQ exceptions.
+        """
+        self._validate_connection()
+        self._validate_queue(queue_name)
+
+        if not messages:
+            return []
+
+        if not self._on_connection_thread():
+            return self._call_threadsafe(self.publish_batch, queue_name, messages, window, priorities)
+
+        properties = pika.BasicProperties(delivery_mode=pika.spec.PERSISTENT_DELIVERY_MODE)
+        # one set of properties per priority, rather than per message
+        prioritised = {
+            priority: pika.BasicProperties(delivery_mode=pika.spec.PERSISTENT_DELIVERY_MODE, priority=priority)
+            for priority in set(priorities or ())
+        }
+
+        outcomes = self._publish_confirmed(
+            publishes=[
+                (queue_name, message, prioritised[priorities[index]] if priorities else properties)
+                for index, message in enumerate(messages)
+            ],
+            window=window
+        )
+
+        logger.debug(f"Published batch to queue={queue_name}, {outcomes.count(True)} of {len(messages)} confirmed.")
+        return outcomes
+
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def publish_delayed(
+        self,
+        queue_name: str,
+        messages: List[str],
+        due_at: List[datetime],
+        priorities: List[int] = None,
+        window: int = Settings.RABBITMQ_CONFIRM_WINDOW
+    ) -> List[bool]:
+        """
+        Publishes messages to a specific queue with publisher confirms, as publish_batch() does,
+        each to be delivered once its `due_at` time has passed. A message which is not yet due
+        is held by the broker in a delay queue, whose TTL is the longest power of two seconds
+        within its delay, and which dead-letters it into `queue_name` when the TTL expires.
+        A consumer which receives a message over a second early holds it again for what
+        remains, see _hold_until_due(), so it is delivered within a second of being due after
+        at most MAX_DELAY_EXPONENT hops. Each delay queue has a single TTL, so unlike per-message
+        TTLs, a message is never held up behind one due later.
+
+        Args:
+            queue_name (str): The name of the queue.
+            messages (List[str]): The messages to be published.
+            due_at (List[datetime]): The timezone aware time at which each message is due.
+            priorities (List[int] = None): The priority of each message, see publish_batch().
+            window (int = Settings.RABBITMQ_CONFIRM_WINDOW): The most messages awaiting confirmation at once.
+
+        Returns:
+            List[bool]: For each message, True if the broker confirmed it, see publish_batch().
+
+        Raises:
+            RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
+            RabbitMQFatalException: For fatal internal AMPQ exceptions.
+        """
+        self._validate_connection()
+        self._validate_queue(queue_name)
+
+        if not messages:
+            return []
+
+        if not self._on_connection_thread():
+            return self._call_threadsafe(self.publish_delayed, queue_name, messages, due_at, priorities, window)
+
+        publishes = []
+        for index, (message, due) in enumerate(zip(messages, due_at)):
+            due_at_ms = int(due.timestamp() * 1000)
+
+            publishes.append((
+                self._get_delay_queue(queue_name, due_at_ms),
+                message,
+                pika.BasicProperties(
+                    delivery_mode=pika.spec.PERSISTENT_DELIVERY_MODE,
+                    priority=priorities[index] if priorities else None,
+                    headers={self.DUE_AT_HEADER: due_at_ms}
+                )
+            ))
+
+        outcomes = self._publish_confirmed(publishes, window)
+
+        logger.debug(f"Published delayed batch to queue={queue_name}, {outcomes.count(True)} of {len(messages)} confirmed.")
+        return outcomes
+
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def continually_consume_messages(self, queue_name: str, callback_function: Callable, prefetch_count: int = 1, workers: int = 1) -> None:
         """
         Consumes messages from a specific queue indefinitely. Each message is passed to a callback function.
         Messages are (n)ack'd within the function.
 
+        With more than one worker, messages are handled concurrently by a thread pool
+        while this thread keeps servicing the connection; see continually_dispatch_messages().
+
         Args:
             queue_name (str): The name of the queue to consume from.
             callback_function (Callable): The function to be called for each message.
+            prefetch_count (int = 1): The most unacknowledged messages the broker delivers at once,
+                should be at least `workers` to keep every worker busy.
+            workers (int = 1): The number of messages handled at once.
 
         Raises:
             RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
@@ -155,7 +395,14 @@ class RabbitMQ:
         self._validate_connection()
         self._validate_queue(queue_name)
 
+        if workers > 1:
+            self._consume_concurrently(queue_name, callback_function, prefetch_count, workers)
+            return
+
         def callback(ch, method, properties, body):
+            if self._hold_until_due(queue_name, method, properties, body):
+                return
+
             try:
                 logger.debug(f"Received message {body}.")
                 callback_function(body)
@@ -166,7 +413,7 @@ class RabbitMQ:
 
         logger.debug(f"Attempting to begin consuming from queue={queue_name} callback_function={callback_function}.")
 
-        self.channel.basic_qos(prefetch_count=1)
+        self.channel.basic_qos(prefetch_count=prefetch_count)
         self.channel.basic_consume(
             queue=queue_name,
             on_message_callback=callback,
@@ -174,6 +421,188 @@ class RabbitMQ:
         )
         self.channel.start_consuming()
 
+    def _consume_concurrently(self, queue_name: str, callback_function: Callable, prefetch_count: int, workers: int) -> None:
+        """
+        Hands each delivery to a pool of `workers` threads, see continually_dispatch_messages().
+        """
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="talos-consumer") as executor:
+            def dispatch(body: bytes, settle: Callable[[Optional[BaseException]], None]) -> None:
+                def work():
+                    error = None
+                    try:
+                        logger.debug(f"Received message {body}.")
+                        callback_function(body)
+                    except Exception as e:
+                        error = e
+
+                    settle(error)
+
+                executor.submit(work)
+
+            logger.debug(f"Attempting to begin consuming from queue={queue_name} with {workers} workers.")
+            self.continually_dispatch_messages(queue_name, dispatch, prefetch_count)
+
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def continually_dispatch_messages(self, queue_name: str, dispatch: Callable, prefetch_count: int) -> None:
+        """
+        Consumes messages from a specific queue indefinitely, handing each to `dispatch`
+        along with a function to settle it, which may be called from any thread once
+        the message is handled, e.g. by a worker thread or an event loop. The channel
+        may only be used by this thread, so settling schedules the (n)ack onto it with
+        add_callback_threadsafe(), as publish_message() and publish_batch() do when
+        called from another thread.
+
+        The first message settled with an exception is nacked, consuming stops and,
+        once the messages in flight are settled, the exception is raised here. A message
+        settled with requeue=True is nacked and requeued, and consuming carries on.
+
+        Args:
+            queue_name (str): The name of the queue to consume from.
+            dispatch (Callable[[bytes, Callable[[Optional[BaseException], bool], None]], None]): Starts
+                handling a message without blocking, e.g. by submitting it to a worker.
+            prefetch_count (int): The most unacknowledged messages the broker delivers at once,
+                and so the most in flight.
+
+        Raises:
+            RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
+            RabbitMQFatalException: For fatal internal AMPQ exceptions.
+        """
+        self._validate_connection()
+        self._validate_queue(queue_name)
+
+        in_flight = set()
+        errors = []
+
+        def settle(delivery_tag: int, error: Optional[BaseException], requeue: bool) -> None:
+            in_flight.discard(delivery_tag)
+
+            if error is None and not requeue:
+                self.channel.basic_ack(delivery_tag=delivery_tag)
+                return
+
+            self.channel.basic_nack(delivery_tag=delivery_tag, requeue=True)
+            if error is None:
+                return
+
+            if not errors:
+                errors.append(error)
+                self.channel.stop_consuming()
+
+        def callback(ch, method, properties, body):
+            if self._hold_until_due(queue_name, method, properties, body):
+                return
+
+            in_flight.add(method.delivery_tag)
+            dispatch(body, lambda error=None, requeue=False, tag=method.delivery_tag: self.connection.add_callback_threadsafe(
+                functools.partial(settle, tag, error, requeue)
+            ))
+
+        self.channel.basic_qos(prefetch_count=prefetch_count)
+        self.channel.basic_consume(
+            queue=queue_name,
+            on_message_callback=callback,
+            auto_ack=False
+        )
+
+        try:
+            self.channel.start_consuming()
+        finally:
+            # handlers may be waiting on this thread to settle or publish
+            while in_flight and self.connection.is_open:
+                self.connection.process_data_events(time_limit=1)
+
+        if errors:
+            raise errors[0]
+
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def continually_consume_batches(
+        self,
+        queue_name: str,
+        callback_function: Callable[[List[bytes]], List[bool]],
+        batch_size: int,
+        batch_window_ms: int,
+        prefetch_count: int,
+        workers: int = 1
+    ) -> None:
+        """
+        Consumes messages from a specific queue indefinitely, passing them to a callback
+        function in batches of up to `batch_size`, or fewer if no more arrived within
+        `batch_window_ms` of the first. Each message is (n)ack'd individually by the
+        outcome the callback function returns for it; nacked messages are requeued.
+        If the callback function raises, the whole batch is nacked and the exception
+        is raised, see continually_dispatch_messages().
+
+        Args:
+            queue_name (str): The name of the queue to consume from.
+            callback_function (Callable[[List[bytes]], List[bool]]): The function to be called for each
+                batch, returning for each message True to ack it or False to nack it.
+            batch_size (int): The most messages in a batch.
+            batch_window_ms (int): The longest to wait for a batch to fill.
+            prefetch_count (int): The most unacknowledged messages the broker delivers at once,
+                should be at least batch_size * workers for batches to fill.
+            workers (int = 1): The number of batches handled at once, on a thread pool if above 1.
+
+        Raises:
+            RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
+            RabbitMQFatalException: For fatal internal AMPQ exceptions.
+        """
+        batch = []
+        window_timer = []
+
+        def handle(messages: List[Tuple[bytes, Callable]]) -> None:
+            try:
+                outcomes = callback_function([body for body, _ in messages])
+            except Exception as e:
+                for _, settle in messages:
+                    settle(e)
+                return
+
+            for (_, settle), outcome in zip(messages, outcomes):
+                settle(requeue=not outcome)
+
+        def flush() -> None:
+            if window_timer:
+                self.connection.remove_timeout(window_timer.pop())
+
+            messages = batch[:]
+            batch.clear()
+
+            logger.debug(f"Handling batch of {len(messages)} messages from queue={queue_name}.")
+            if executor is not None:
+                executor.submit(handle, messages)
+            else:
+                handle(messages)
+
+        def on_window_elapsed() -> None:
+            window_timer.clear()
+            flush()
+
+        def dispatch(body: bytes, settle: Callable) -> None:
+            batch.append((body, settle))
+
+            if len(batch) >= batch_size:
+                flush()
+            elif not window_timer:
+                window_timer.append(self.connection.call_later(batch_window_ms / 1000, on_window_elapsed))
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="talos-consumer") if workers > 1 else None
+
+        logger.debug(f"Attempting to begin consuming from queue={queue_name} in batches of {batch_size}.")
+        try:
+            self.continually_dispatch_messages(queue_name, dispatch, prefetch_count)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def stop_consuming(self) -> None:
+        """
+        Stops continually_consume_messages(), continually_dispatch_messages() or
+        continually_consume_batches(), from any thread.
+        """
+        self.connection.add_callback_threadsafe(self.channel.stop_consuming)
+
     @log_reraise_fatal_exception
     @log_reraise_non_fatal_exception
     def consume_one_message(self, queue_name: str) -> str:
@@ -223,6 +652,44 @@ class RabbitMQ:
 
         return messages
 
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def get_message_count(self, queue_name: str) -> int:
+        """
+        Gets the number of messages ready to be consumed in a specific queue.
+
+        Args:
+            queue_name (str): The name of the queue.
+
+        Returns:
+            int: The number of messages in the queue.
+
+        Raises:
+            RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
+            RabbitMQFatalException: For fatal internal AMPQ exceptions.
+        """
+        self._validate_connection()
+        self._validate_queue(queue_name)
+
+        return self.channel.queue_declare(queue=queue_name, passive=True).method.message_count
+
+    def _declare(self, queues: Tuple[str]) -> None:
+        """
+        Declares the exchange and `queues`, skipping those already declared on
+        the connection, so reconnecting channels and pooled connections do not
+        redeclare them.
+        """
+        declared = self.DECLARATIONS.setdefault(self.connection, set())
+
+        if "exchange" not in declared:
+            self._declare_exchange()
+            declared.add("exchange")
+
+        for queue_name in queues:
+            if "queue:" + queue_name not in declared:
+                self._declare_queue(queue_name)
+                declared.add("queue:" + queue_name)
+
     @log_reraise_fatal_exception
     @log_reraise_non_fatal_exception
     def _declare_exchange(self) -> None:
@@ -246,7 +713,9 @@ class RabbitMQ:
     @log_reraise_non_fatal_exception
     def _declare_queue(self, queue_name: str) -> None:
         """
-        Declares a queue in the RabbitMQ server.
+        Declares a queue in the RabbitMQ server, as a priority queue if it has an entry
+        in MAX_PRIORITIES. A queue's arguments can't be changed once declared, so if
+        it already exists with a different x-max-priority it is used as it is.
 
         Args:
             queue_name (str): The name of the queue to declare.
@@ -255,7 +724,26 @@ class RabbitMQ:
             RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
             RabbitMQFatalException: For fatal internal AMPQ exceptions.
         """
-        self.channel.queue_declare(queue=queue_name, durable=True)
+        max_priority = self.MAX_PRIORITIES.get(queue_name, 0)
+
+        try:
+            self.channel.queue_declare(
+                queue=queue_name,
+                durable=True,
+                arguments={"x-max-priority": max_priority} if max_priority else None
+            )
+        except pika.exceptions.ChannelClosedByBroker as e:
+            if e.reply_code != pika.spec.PRECONDITION_FAILED:
+                raise
+
+            logger.alert(
+                f"queue={queue_name} exists with a different x-max-priority than {max_priority}, using it as declared. "
+                f"Delete the queue to change it."
+            )
+            # the broker closes the channel on a failed declaration
+            self.channel = self.connection.channel()
+            self.channel.queue_declare(queue=queue_name, passive=True)
+
         self.channel.queue_bind(
             exchange=Settings.RABBITMQ_EXCHANGE_NAME,
             queue=queue_name,
@@ -263,6 +751,248 @@ class RabbitMQ:
         )
         logger.debug(f"Declared queue={queue_name}, bound to exhange={Settings.RABBITMQ_EXCHANGE_NAME}.")
 
+    @log_reraise_fatal_exception
+    @log_reraise_non_fatal_exception
+    def _declare_delay_queue(self, delay_queue: str, queue_name: str, ttl_secs: int) -> None:
+        """
+        Declares a queue in the RabbitMQ server which holds messages for `ttl_secs`,
+        then dead-letters them into `queue_name`, see publish_delayed().
+
+        Args:
+            delay_queue (str): The name of the delay queue to declare.
+            queue_name (str): The name of the queue messages are delivered to once held.
+            ttl_secs (int): How long messages are held for.
+
+        Raises:
+            RabbitMQNonFatalException: For non-fatal internal AMPQ exceptions.
+            RabbitMQFatalException: For fatal internal AMPQ exceptions.
+        """
+        self.channel.queue_declare(
+            queue=delay_queue,
+            durable=True,
+            arguments={
+                "x-message-ttl": ttl_secs * 1000,
+                "x-dead-letter-exchange": Settings.RABBITMQ_EXCHANGE_NAME,
+                "x-dead-letter-routing-key": queue_name,
+            }
+        )
+        self.channel.queue_bind(
+            exchange=Settings.RABBITMQ_EXCHANGE_NAME,
+            queue=delay_queue,
+            routing_key=delay_queue
+        )
+        logger.debug(f"Declared delay queue={delay_queue}, dead-lettering into queue={queue_name} after {ttl_secs}s.")
+
+    def _get_delay_queue(self, queue_name: str, due_at_ms: int) -> str:
+        """
+        Gets the delay queue to hold a message due at `due_at_ms` in, declaring it
+        if not yet declared on the connection, see publish_delayed().
+
+        Returns:
+            str: The name of the delay queue, or `queue_name` if the message is due within a second.
+        """
+        remaining_secs = (due_at_ms - time.time() * 1000) / 1000
+        if remaining_secs < 1:
+            return queue_name
+
+        ttl_secs = 2 ** min(int(math.log2(remaining_secs)), self.MAX_DELAY_EXPONENT)
+        delay_queue = f"{queue_name}.delay.{ttl_secs}s"
+
+        declared = self.DECLARATIONS.setdefault(self.connection, set())
+        if "queue:" + delay_queue not in declared:
+            self._declare_delay_queue(delay_queue, queue_name, ttl_secs)
+            declared.add("queue:" + delay_queue)
+
+        return delay_queue
+
+    def _hold_until_due(self, queue_name: str, method: pika.spec.Basic.Deliver, properties: pika.BasicProperties, body: bytes) -> bool:
+        """
+        Called by the consumers on each delivery. A message from publish_delayed() which
+        arrived over a second before it's due is republished into a delay queue for
+        what remains, without its dead-lettering headers, then acked.
+
+        Returns:
+            bool: True if the message was held, and so must not be handled.
+        """
+        headers = properties.headers or {}
+        due_at_ms = headers.get(self.DUE_AT_HEADER)
+        if due_at_ms is None:
+            return False
+
+        delay_queue = self._get_delay_queue(queue_name, due_at_ms)
+        if delay_queue == queue_name:
+            return False
+
+        self.channel.basic_publish(
+            exchange=Settings.RABBITMQ_EXCHANGE_NAME,
+            routing_key=delay_queue,
+            body=body,
+            properties=pika.BasicProperties(
+                delivery_mode=pika.spec.PERSISTENT_DELIVERY_MODE,
+                priority=properties.priority,
+                headers={key: value for key, value in headers.items() if not key.startswith(DEAD_LETTER_HEADERS)}
+            )
+        )
+        self.channel.basic_ack(delivery_tag=method.delivery_tag)
+
+        logger.debug(f"Held message until due, in queue={delay_queue}.")
+        return True
+
+    def _publish_confirmed(self, publishes: List[Tuple[str, str, pika.BasicProperties]], window: int) -> List[bool]:
+        """
+        Publishes each message with its routing key and properties on the confirm mode
+        channel, with up to `window` awaiting confirmation at once, see publish_batch(),
+        and at least one, as with none allowed no message could be published. If no confirm arrives for CONFIRM_TIMEOUT_SECS, the remaining messages are not
+        published, and are reported unconfirmed along with those awaiting confirmation.
+
+        Returns:
+            List[bool]: For each message, True if the broker confirmed it.
+        """
+        window = max(1, window)
+        channel = _async_channel(self._get_confirm_channel())
+
+        self._unconfirmed = {}
+        self._outcomes = [None] * len(publishes)
+
+        for index, (routing_key, message, properties) in enumerate(publishes):
+            if not self._await_confirms(window - 1):
+                logger.error(f"No confirms within {self.CONFIRM_TIMEOUT_SECS} seconds, {len(publishes) - index} messages were not published.")
+                break
+
+            channel.basic_publish(
+                exchange=Settings.RABBITMQ_EXCHANGE_NAME,
+                routing_key=routing_key,
+                body=message,
+                properties=properties
+            )
+            self._delivery_tag += 1
+            self._unconfirmed[self._delivery_tag] = index
+
+        self._await_confirms(0)
+
+        outcomes = [bool(outcome) for outcome in self._outcomes]
+        self._unconfirmed = {}
+
+        return outcomes
+
+    def _await_confirms(self, most_unconfirmed: int) -> bool:
+        """
+        Services the connection until at most `most_unconfirmed` messages await
+        confirmation, or no confirm has arrived for CONFIRM_TIMEOUT_SECS.
+
+        Returns:
+            bool: False if it timed out.
+        """
+        deadline = time.monotonic() + self.CONFIRM_TIMEOUT_SECS
+
+        while len(self._unconfirmed) > most_unconfirmed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            unconfirmed = len(self._unconfirmed)
+            self.connection.process_data_events(time_limit=min(remaining, 1))
+
+            if len(self._unconfirmed) < unconfirmed:
+                deadline = time.monotonic() + self.CONFIRM_TIMEOUT_SECS
+
+        return True
+
+    def _get_confirm_channel(self) -> BlockingChannel:
+        """
+        Opens the channel used by publish_batch(), in confirm mode, if not already open.
+        Confirms are handled by _on_confirm() as they arrive, rather than by the
+        blocking channel which would wait for each publish to be confirmed.
+
+        Returns:
+            BlockingChannel: The confirm mode channel.
+
+        Raises:
+            RabbitMQNonFatalException: If the broker didn't put the channel in confirm
+                mode within CONFIRM_TIMEOUT_SECS.
+        """
+        if self.confirm_channel and self.confirm_channel.is_open:
+            return self.confirm_channel
+
+        channel = self.connection.channel()
+        self._delivery_tag = 0
+
+        selected = []
+        _async_channel(channel).confirm_delivery(
+            ack_nack_callback=self._on_confirm,
+            callback=selected.append
+        )
+
+        deadline = time.monotonic() + self.CONFIRM_TIMEOUT_SECS
+        while not selected and time.monotonic() < deadline:
+            self.connection.process_data_events(time_limit=1)
+
+        if not selected:
+            logger.error(f"Confirm mode was not selected within {self.CONFIRM_TIMEOUT_SECS} seconds.")
+            if channel.is_open:
+                channel.close()
+            raise RabbitMQNonFatalException()
+
+        self.confirm_channel = channel
+        logger.debug("Opened confirm mode channel.")
+        return self.confirm_channel
+
+    def _on_connection_thread(self) -> bool:
+        """
+        Returns:
+            bool: True if called from the thread which opened, or adopted, the connection.
+        """
+        return self._connection_thread is None or threading.get_ident() == self._connection_thread
+
+    def _call_threadsafe(self, function: Callable, *args: Any) -> Any:
+        """
+        Calls `function` on the connection's thread, which services callbacks added
+        with add_callback_threadsafe() while consuming, and waits for its result.
+
+        Raises:
+            RabbitMQNonFatalException: If the connection's thread did not call it
+                within THREADSAFE_TIMEOUT_SECS.
+            Any exception raised by `function`.
+        """
+        future = Future()
+
+        def call():
+            if not future.set_running_or_notify_cancel():
+                return
+
+            try:
+                future.set_result(function(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+        self.connection.add_callback_threadsafe(call)
+
+        try:
+            return future.result(timeout=self.THREADSAFE_TIMEOUT_SECS)
+        except TimeoutError:
+            if future.cancel():
+                logger.error(f"The connection's thread did not call {function.__name__}() within {self.THREADSAFE_TIMEOUT_SECS} seconds.")
+                raise RabbitMQNonFatalException()
+
+            return future.result()
+
+    def _on_confirm(self, frame: pika.frame.Method) -> None:
+        """
+        Records the outcome of the messages a Basic.Ack or Basic.Nack refers to.
+        """
+        method = frame.method
+        acked = isinstance(method, pika.spec.Basic.Ack)
+
+        if method.multiple:
+            tags = [tag for tag in self._unconfirmed if tag <= method.delivery_tag]
+        else:
+            tags = [method.delivery_tag]
+
+        for tag in tags:
+            index = self._unconfirmed.pop(tag, None)
+            if index is not None:
+                self._outcomes[index] = acked
+
     def _validate_connection(self):
         """
         Checks if the connection and channel are established, raises an exception if not.
@@ -285,3 +1015,13 @@ class RabbitMQ:
         """
         if queue_name not in self.queues:
             raise UnknownQueueException()
+
+
+def _async_channel(channel: BlockingChannel) -> pika.channel.Channel:
+    """
+    The asynchronous channel a BlockingChannel wraps, through pika's private `_impl`.
+    Its basic_publish() and confirm_delivery() let confirms be handled by a callback
+    as they arrive; pika's public BlockingChannel API only supports confirm mode by
+    blocking each basic_publish() until that message is confirmed.
+    """
+    return channel._impl
@@ -0,0 +1,113 @@
+import json
+from typing import Any, Callable, Dict, NamedTuple, Union
+
+from talos.config import Settings
+from talos.exceptions.config import UnknownSerializer
+from talos.logger import logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class Serializer(NamedTuple):
+    """
+    A JSON backend. `dumps` returns str, so messages and JSONB parameters are the
+    same whichever backend is used, and `loads` raises json.JSONDecodeError on
+    invalid input.
+    """
+    name: str
+    dumps: Callable[[Any], str]
+    loads: Callable[[Union[str, bytes, bytearray]], Any]
+
+
+def _ujson_loads(data: Union[str, bytes, bytearray]) -> Any:
+    if isinstance(data, bytearray):
+        data = bytes(data)
+
+    try:
+        return ujson.loads(data)
+    except ValueError as ex:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="replace")
+        raise json.JSONDecodeError(str(ex), data, 0) from ex
+
+
+SERIALIZERS: Dict[str, Serializer] = {
+    "json": Serializer(
+        name="json",
+        dumps=json.dumps,
+        loads=json.loads
+    )
+}
+
+if ujson is not None:
+    SERIALIZERS["ujson"] = Serializer(
+        name="ujson",
+        dumps=ujson.dumps,
+        loads=_ujson_loads
+    )
+
+if orjson is not None:
+    # orjson.JSONDecodeError already subclasses json.JSONDecodeError
+    SERIALIZERS["orjson"] = Serializer(
+        name="orjson",
+        dumps=lambda obj: orjson.dumps(obj).decode("utf-8"),
+        loads=orjson.loads
+    )
+
+PREFERENCE = ("orjson", "ujson", "json")
+
+
+def get_serializer(name: str = "auto") -> Serializer:
+    """
+    Gets a JSON backend by name, falling back to the stdlib, with a warning, if it
+    is not installed.
+
+    Args:
+        name (str = "auto"): One of "orjson", "ujson", "json", or "auto" for the
+            fastest installed backend.
+
+    Returns:
+        Serializer: The backend.
+
+    Raises:
+        UnknownSerializer (FatalException): If `name` is not a known backend.
+    """
+    if name == "auto":
+        return next(SERIALIZERS[candidate] for candidate in PREFERENCE if candidate in SERIALIZERS)
+
+    if name not in PREFERENCE:
+        raise UnknownSerializer(name)
+
+    if name not in SERIALIZERS:
+        logger.warning(f"JSON serializer {name} is not installed, falling back to json.")
+        return SERIALIZERS["json"]
+
+    return SERIALIZERS[name]
+
+
+serializer = get_serializer(Settings.JSON_SERIALIZER)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serializes `obj` to a JSON string with the configured backend, see Settings.JSON_SERIALIZER.
+    """
+    return serializer.dumps(obj)
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Deserializes a JSON string, bytes or bytearray with the configured backend, see Settings.JSON_SERIALIZER.
+
+    Raises:
+        json.JSONDecodeError: If `data` is not valid JSON.
+    """
+    return serializer.loads(data)
@@ -0,0 +1,75 @@
+import logging
+import pathlib
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+from talos.components import BaseComponent
+from talos.config import Settings
+from talos.exceptions.api import APINonFatalException
+from talos.queuing.messages import PostRescanType, encode_post_rescan
+
+# the service's own `lib` package is imported relative to its source directory
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "docker-images" / "post-rescanner" / "src"))
+
+import post_rescanner
+from post_rescanner import PostRescanner
+
+
+class TestPostRescanner(unittest.TestCase):
+    """
+    Coverage:
+        * _handle_batch() requeues a message whose API request raises a NonFatalException,
+          drops (acks) one which can't be decoded or whose response is missing data,
+          and stores the rest of the batch
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        # skips probing Postgres and RabbitMQ
+        patch.object(BaseComponent, "wait_until_ready").start()
+
+        self.mock_tdb = patch.object(post_rescanner, "TransactionalDatabase").start()
+        self.mock_queue = patch.object(post_rescanner.queue_helpers, "queue_post_rescan_messages").start()
+        self.mock_store = patch.object(PostRescanner, "store_post_data", return_value=[]).start()
+        patch.object(PostRescanner, "get_rabbitmq").start()
+
+        self.component = PostRescanner(
+            retry_attempts=1,
+            time_between_attempts=0,
+            producing_queue=Settings.POST_RESCAN_QUEUE
+        )
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_handle_batch(self):
+        def collect_post_data(message):
+            if message["post_id"] == "unreachable":
+                raise APINonFatalException()
+            if message["post_id"] == "missing":
+                raise KeyError("missing")
+
+            return None, [], [], []
+
+        patch.object(PostRescanner, "collect_post_data", side_effect=collect_post_data).start()
+
+        messages = [
+            encode_post_rescan(post_id=post_id, post_rescans_id=index, type=PostRescanType.BASE)
+            for index, post_id in enumerate(("stored", "unreachable", "missing"))
+        ] + [b"\xff not a post rescan"]
+
+        outcomes = self.component._handle_batch(messages)
+
+        with self.subTest("outcomes"):
+            self.assertEqual(outcomes, [True, False, True, True])
+
+        with self.subTest("stored"):
+            self.mock_store.assert_called_once()
+            self.assertEqual(self.mock_store.call_args.args[1]["post_id"], "stored")
+            self.mock_queue.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
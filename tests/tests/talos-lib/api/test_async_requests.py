@@ -0,0 +1,201 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+
+from requests.adapters import HTTPAdapter
+
+from talos.config import Settings
+from talos.api import AsyncRequests, Requests
+from talos.api.rate_limiter import RateLimiter
+from talos.exceptions.api import *
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Stands in for the Reddit API. Echoes back the request it received as JSON,
+    sleeping first on /slow, and gzipped if the client accepts it.
+    """
+
+    def _respond(self, body: dict = None):
+        if self.path == "/slow":
+            time.sleep(0.2)
+
+        payload = json.dumps({
+            "method": self.command,
+            "path": self.path,
+            "authorization": self.headers.get("Authorization"),
+            "accept_encoding": self.headers.get("Accept-Encoding"),
+            "body": body,
+            "padding": "x" * 10000
+        }).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            payload = gzip.compress(payload)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self._respond(json.loads(self.rfile.read(length)))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncRequests(unittest.IsolatedAsyncioTestCase):
+    """
+    Runs against a local stand-in HTTP server rather than mocks.
+
+    Coverage:
+        * send() GETs and POSTs, returning the parsed JSON if is_json
+        * send_from_message() proxies the message like Requests.send_from_message(),
+          sending with a token
+        * responses are gzipped when negotiated, and streamed and decoded with
+          bytes received and decoded counted in metrics
+        * requests are in flight concurrently, not one after another
+        * no token is used for more than REQUESTS_PER_TOKEN requests, even when
+          sent concurrently
+        * an invalid type raises APIFatalException, an unreachable host raises
+          APINonFatalException
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        self.async_requests = AsyncRequests(max_concurrency=10)
+        self.async_requests.requests.rate_limiter = RateLimiter(
+            initial_rate=1000, max_rate=1000, burst=1000
+        )
+
+    def tearDown(self):
+        self.async_requests.close()
+
+    async def test_send(self):
+        with self.subTest("get"):
+            response = await self.async_requests.send(
+                url=self.url + "/get",
+                type=Requests.TYPE_GET,
+                is_json=True
+            )
+
+            self.assertEqual(response["method"], "GET")
+            self.assertEqual(response["path"], "/get")
+
+        with self.subTest("post"):
+            response = await self.async_requests.send(
+                url=self.url + "/post",
+                type=Requests.TYPE_POST,
+                body={"key": "value"},
+                is_json=True
+            )
+
+            self.assertEqual(response["method"], "POST")
+            self.assertEqual(response["body"], {"key": "value"})
+
+        with self.subTest("not_json"):
+            response = await self.async_requests.send(
+                url=self.url + "/get",
+                type=Requests.TYPE_GET
+            )
+
+            self.assertEqual(response.status_code, 200)
+
+    async def test_send_from_message(self):
+        self.async_requests.requests.token_pool.generate_token = lambda: "token"
+
+        response = await self.async_requests.send_from_message({
+            "url": self.url + "/morecomments",
+            "method": Requests.TYPE_POST,
+            "body": {"token": "abc"}
+        })
+
+        self.assertEqual(response["body"], {"token": "abc"})
+        self.assertEqual(response["authorization"], "Bearer token")
+
+    async def test_compression(self):
+        response = await self.async_requests.send(
+            url=self.url + "/get",
+            type=Requests.TYPE_GET,
+            is_json=True
+        )
+
+        self.assertIn("gzip", response["accept_encoding"])
+        self.assertEqual(len(response["padding"]), 10000)
+
+        metrics = self.async_requests.requests.metrics
+        self.assertEqual(metrics["responses"], 1)
+        self.assertGreater(metrics["bytes_decoded"], 10000)
+        self.assertLess(metrics["bytes_received"], metrics["bytes_decoded"])
+        self.assertGreater(metrics["decode_seconds"], 0)
+
+    async def test_concurrency(self):
+        start = time.monotonic()
+
+        responses = await asyncio.gather(*(
+            self.async_requests.send(
+                url=self.url + "/slow",
+                type=Requests.TYPE_GET,
+                is_json=True
+            ) for _ in range(10)
+        ))
+
+        self.assertEqual(len(responses), 10)
+        # serially this would be 10 * 0.2s
+        self.assertLess(time.monotonic() - start, 1)
+
+    async def test_token_rotation(self):
+        tokens = (f"token-{i}" for i in range(1000))
+        self.async_requests.requests.token_pool.generate_token = lambda: next(tokens)
+
+        responses = await asyncio.gather(*(
+            self.async_requests.send(
+                url=self.url + "/get",
+                type=Requests.TYPE_GET,
+                is_json=True,
+                with_auth=True
+            ) for _ in range(Settings.REQUESTS_PER_TOKEN * 3)
+        ))
+
+        uses = Counter(response["authorization"] for response in responses)
+        self.assertLessEqual(max(uses.values()), Settings.REQUESTS_PER_TOKEN)
+
+    async def test_error_mapping(self):
+        with self.subTest("invalid_type"):
+            with self.assertRaises(APIFatalException):
+                await self.async_requests.send(url=self.url, type=3)
+
+        with self.subTest("unreachable"):
+            # no urllib3 retries, we only care about the mapping
+            self.async_requests.requests.session.mount("http://", HTTPAdapter(max_retries=0))
+
+            with self.assertRaises(APINonFatalException):
+                await self.async_requests.send(
+                    url="http://127.0.0.1:1/",
+                    type=Requests.TYPE_GET
+                )
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import logging
+
+import requests
+
+from talos.api import Requests
+from talos.api.cassette import CassetteAdapter
+from talos.exceptions.api import *
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """
+    Responds with the path requested and the number of requests served so far.
+    """
+    served = 0
+
+    def do_GET(self):
+        CountingHandler.served += 1
+
+        payload = json.dumps({"path": self.path, "served": CountingHandler.served}).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("x-ratelimit-remaining", "100")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCassetteAdapter(unittest.TestCase):
+    """
+    Runs against a local stand-in HTTP server rather than mocks.
+
+    Coverage:
+        * record mode sends the request and saves the response, which the
+          caller can still read, with a UTF-8 body saved as text, through a
+          temporary file of its own
+        * replay mode serves the saved response without touching the network,
+          through Requests.send() with is_json
+        * the key ignores headers, so a different token replays the same cassette,
+          and normalises JSON bodies
+        * replaying a request which was never recorded raises APIFatalException
+        * replayed responses are delayed by latency_ms
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        self.server = HTTPServer(("127.0.0.1", 0), CountingHandler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.requests = Requests()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.requests.close()
+        self.directory.cleanup()
+
+    def _mount(self, mode: str, latency_ms: int = 0):
+        self.requests.session.mount(
+            "http://",
+            CassetteAdapter(mode=mode, directory=self.directory.name, latency_ms=latency_ms)
+        )
+
+    def test_record_replay(self):
+        self._mount(CassetteAdapter.MODE_RECORD)
+        recorded = self.requests.send(url=self.url + "/postcomments", type=Requests.TYPE_GET, is_json=True)
+
+        with self.subTest("saved"):
+            cassettes = os.listdir(self.directory.name)
+            self.assertEqual(len(cassettes), 1)
+            self.assertTrue(cassettes[0].endswith(".json"))
+
+            with open(os.path.join(self.directory.name, cassettes[0])) as file:
+                self.assertEqual(json.loads(json.load(file)["response"]["text"]), recorded)
+
+        self.server.shutdown()
+        self._mount(CassetteAdapter.MODE_REPLAY)
+
+        with self.subTest("replayed"):
+            replayed = self.requests.send(url=self.url + "/postcomments", type=Requests.TYPE_GET, is_json=True)
+            self.assertEqual(replayed, recorded)
+
+        with self.subTest("headers"):
+            response = self.requests.send(url=self.url + "/postcomments", type=Requests.TYPE_GET)
+            self.assertEqual(response.headers["x-ratelimit-remaining"], "100")
+            self.assertNotIn("Content-Length", response.headers)
+
+        with self.subTest("not_recorded"):
+            with self.assertRaises(APIFatalException):
+                self.requests.send(url=self.url + "/morecomments", type=Requests.TYPE_GET)
+
+    def test_key(self):
+        def prepare(headers=None, body=None):
+            return requests.Request("POST", self.url, headers=headers, data=body).prepare()
+
+        with self.subTest("headers_ignored"):
+            self.assertEqual(
+                CassetteAdapter.get_key(prepare(headers={"Authorization": "Bearer a"})),
+                CassetteAdapter.get_key(prepare(headers={"Authorization": "Bearer b"}))
+            )
+
+        with self.subTest("json_normalised"):
+            self.assertEqual(
+                CassetteAdapter.get_key(prepare(body='{"a":1,"b":2}')),
+                CassetteAdapter.get_key(prepare(body='{"b": 2, "a": 1}'))
+            )
+
+        with self.subTest("body_differs"):
+            self.assertNotEqual(
+                CassetteAdapter.get_key(prepare(body='{"token": "a"}')),
+                CassetteAdapter.get_key(prepare(body='{"token": "b"}'))
+            )
+
+    def test_latency(self):
+        self._mount(CassetteAdapter.MODE_RECORD)
+        self.requests.send(url=self.url + "/get", type=Requests.TYPE_GET)
+
+        self._mount(CassetteAdapter.MODE_REPLAY, latency_ms=200)
+
+        start = time.monotonic()
+        self.requests.send(url=self.url + "/get", type=Requests.TYPE_GET)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
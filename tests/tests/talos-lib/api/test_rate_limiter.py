@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import patch
+import logging
+
+from talos.api.rate_limiter import TokenBucket, RateLimiter
+
+
+class TestTokenBucket(unittest.TestCase):
+    """
+    Coverage:
+        * no wait while the bucket holds tokens
+        * once empty, callers queue up 1/rate apart
+        * pause() makes callers wait until the pause ends
+    """
+
+    @patch("time.monotonic", return_value=100.0)
+    def test_burst_then_wait(self, mock_time):
+        bucket = TokenBucket(rate=2, capacity=2)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+    @patch("time.monotonic", return_value=100.0)
+    def test_pause(self, mock_time):
+        bucket = TokenBucket(rate=2, capacity=2)
+        bucket.pause(10)
+
+        self.assertAlmostEqual(bucket.reserve(), 10)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """
+    Coverage:
+        * wait() sleeps once the bucket of the endpoint/token is empty
+        * buckets are separate per endpoint and per token
+        * a success increases the endpoint rate up to max_rate
+        * a 429 halves the endpoint rate and pauses the bucket for retry-after
+        * x-ratelimit-remaining/reset caps the bucket rate, and pauses it
+          until the reset once none remain
+        * idle buckets are discarded
+    """
+    URL = "https://gateway.reddit.com/desktopapi/v1/postcomments/abc"
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        self.limiter = RateLimiter(initial_rate=1, max_rate=1.5, burst=1)
+
+    @patch("time.sleep")
+    def test_wait(self, mock_sleep):
+        self.limiter.wait(self.URL, "token")
+        mock_sleep.assert_not_called()
+
+        self.limiter.wait(self.URL, "token")
+        mock_sleep.assert_called_once()
+
+    @patch("time.sleep")
+    def test_separate_buckets(self, mock_sleep):
+        self.limiter.wait(self.URL, "token-1")
+        self.limiter.wait(self.URL, "token-2")
+        self.limiter.wait("https://gql.reddit.com/", "token-1")
+
+        mock_sleep.assert_not_called()
+        self.assertEqual(len(self.limiter.buckets), 3)
+
+    def test_increase(self):
+        for _ in range(10):
+            self.limiter.update(self.URL, "token", 200, {})
+
+        self.assertEqual(self.limiter.endpoint_rates["gateway.reddit.com"], 1.5)
+
+    def test_too_many_requests(self):
+        self.limiter.update(self.URL, "token", 429, {"retry-after": "30"})
+
+        bucket = self.limiter.buckets[("gateway.reddit.com", "token")]
+        self.assertEqual(self.limiter.endpoint_rates["gateway.reddit.com"], 0.5)
+        self.assertGreater(bucket.reserve(), 29)
+
+    def test_ratelimit_headers(self):
+        with self.subTest("remaining"):
+            self.limiter.update(self.URL, "token", 200, {
+                "x-ratelimit-remaining": "10",
+                "x-ratelimit-reset": "100"
+            })
+
+            bucket = self.limiter.buckets[("gateway.reddit.com", "token")]
+            self.assertAlmostEqual(bucket.rate, 0.1)
+
+        with self.subTest("none_remaining"):
+            self.limiter.update(self.URL, "token", 200, {
+                "x-ratelimit-remaining": "0",
+                "x-ratelimit-reset": "100"
+            })
+
+            self.assertGreater(bucket.reserve(), 99)
+
+        with self.subTest("malformed"):
+            self.limiter.update(self.URL, "token", 200, {
+                "x-ratelimit-remaining": "lots",
+                "x-ratelimit-reset": "100"
+            })
+
+    def test_discard_idle(self):
+        self.limiter.wait(self.URL, "old")
+
+        with patch("time.monotonic", return_value=10 ** 9):
+            self.limiter.wait(self.URL, "new")
+
+        self.assertNotIn(("gateway.reddit.com", "old"), self.limiter.buckets)
@@ -14,7 +14,7 @@ send() returns dict if is_json
 send() returns response if not is_json
 
 with_auth causes _get_token() to be called
-_get_token() only calls generate_token() every REQUESTS_PER_TOKEN requests
+_get_token() takes a token from the token pool
 
 _generate_token() raises NonFatalExcpe
 
@@ -26,12 +26,16 @@ class TestRequests(unittest.TestCase):
     Coverage:
         * test that send() with get/post proxy to requests.get
           or requests.post() with correct params
+        * the session is created once, mounts a pooled adapter and is reused
+          across send() calls
         * test send() with invalid request type raises APIFatalException
-        * test is_json param on send() proxies to requests.Response.json()
-            ^ likely too closely coupled to implementation, changing
-              down the line gonna be an issue
+        * test is_json param on send() parses the streamed response body with
+          the configured serializer, invalid JSON raises APINonFatalException
+        * compressed responses are negotiated and decoded, and counted in
+          metrics, see test_async_requests.py
         * with_auth makes a call to _get_token()
-        * if MAX_REQUESTS_PER_TOKEN is met, a new token is generated
+        * tokens are taken from the token pool, see test_token_pool.py
+        * responses update the rate limiter, a 429 raises RateLimited (non-fatal)
         * if no token is found, TokenNotFound() (fatal error) is raised
     
     """
@@ -44,6 +48,7 @@ class TestRequests(unittest.TestCase):
         self.test_requests = Requests()
 
     def tearDown(self):
+        self.test_requests.close()
         self.test_requests = None
 
     @patch.object(Requests, "_post")
@@ -69,6 +74,24 @@ class TestRequests(unittest.TestCase):
             headers=ANY
         )
 
+    @patch("requests.Session.get")
+    def test_session_reused(self, mock_get):
+        session = self.test_requests.session
+
+        for _ in range(3):
+            self.test_requests.send(
+                url=self.FAKE_URL,
+                type=Requests.TYPE_GET
+            )
+
+        self.assertIs(self.test_requests.session, session)
+        self.assertEqual(mock_get.call_count, 3)
+
+        adapter = session.get_adapter(self.FAKE_URL)
+        self.assertEqual(adapter._pool_connections, Settings.REQUESTS_POOL_CONNECTIONS)
+        self.assertEqual(adapter._pool_maxsize, Settings.REQUESTS_POOL_MAXSIZE)
+        self.assertEqual(adapter.max_retries.total, Settings.REQUESTS_MAX_RETRIES)
+
     def test_invalid_type(self):
         with self.assertRaises(APIFatalException):
             self.test_requests.send(
@@ -76,50 +99,61 @@ class TestRequests(unittest.TestCase):
                 type=3
             )
 
-    @patch("requests.post")
-    @patch("requests.get")
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
     def test_is_json(self, mock_get, mock_post):
+        # streamed in chunks
+        mock_get.return_value.iter_content.return_value = [b'{"type": ', b'"get"}']
+        mock_post.return_value.iter_content.return_value = [b'{"type": "post"}']
+
         with self.subTest("is_json_true"):
             options = {
                 "url": self.FAKE_URL,
                 "is_json": True
             }
 
-            self.test_requests.send(
+            get_response = self.test_requests.send(
                 **options,
                 type=Requests.TYPE_GET
             )
-            self.test_requests.send(
+            post_response = self.test_requests.send(
                 **options,
                 type=Requests.TYPE_POST
             )
 
-            mock_get.return_value.json.assert_called_once()
-            mock_post.return_value.json.assert_called_once()
+            self.assertEqual(get_response, {"type": "get"})
+            self.assertEqual(post_response, {"type": "post"})
 
         with self.subTest("is_json_false"):
-            mock_get.return_value.json.reset_mock()
-            mock_post.return_value.json.reset_mock()
-
             options = {
                 "url": self.FAKE_URL,
                 "is_json": False
             }
 
-            self.test_requests.send(
+            get_response = self.test_requests.send(
                 **options,
                 type=Requests.TYPE_GET
             )
-            self.test_requests.send(
+            post_response = self.test_requests.send(
                 **options,
                 type=Requests.TYPE_POST
             )
 
-            mock_get.return_value.json.assert_not_called()
-            mock_post.return_value.json.assert_not_called()
+            self.assertIs(get_response, mock_get.return_value)
+            self.assertIs(post_response, mock_post.return_value)
 
-    @patch("requests.post")
-    @patch("requests.get")
+        with self.subTest("invalid_json"):
+            mock_get.return_value.iter_content.return_value = [b"<html>"]
+
+            with self.assertRaises(APINonFatalException):
+                self.test_requests.send(
+                    url=self.FAKE_URL,
+                    type=Requests.TYPE_GET,
+                    is_json=True
+                )
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
     def test_with_auth(self, mock_get, mock_post):
         with patch.object(Requests, "_get_token") as mock_get_token:
             self.test_requests.send(
@@ -130,28 +164,35 @@ class TestRequests(unittest.TestCase):
 
             mock_get_token.assert_called_once()
 
-    @patch("requests.get")
-    @patch.object(Requests, "_generate_token")
-    def test_token_rotation(self, mock_generate, mock_get):
-        mock_generate.return_value = "token"
-
-        # send max requests on that token, 1 gen on first
-        for _ in range(Settings.REQUESTS_PER_TOKEN):
-            self.test_requests.send(
-                url=self.FAKE_URL,
-                type=Requests.TYPE_GET,
-                with_auth=True
-            )
-
-        # send max + 1, causing second gen
+    @patch("requests.Session.get")
+    @patch("talos.api.token_pool.TokenPool.acquire", return_value="token")
+    def test_token_from_pool(self, mock_acquire, mock_get):
         self.test_requests.send(
             url=self.FAKE_URL,
             type=Requests.TYPE_GET,
             with_auth=True
         )
 
-        # assert we rotated
-        self.assertEqual(mock_generate.call_count, 2)
+        mock_acquire.assert_called_once()
+        self.assertEqual(
+            mock_get.call_args.kwargs["headers"]["Authorization"], "Bearer token"
+        )
+
+    @patch("requests.Session.get")
+    def test_rate_limited(self, mock_get):
+        mock_get.return_value.status_code = 429
+        mock_get.return_value.headers = {"retry-after": "5"}
+
+        with patch.object(self.test_requests.rate_limiter, "update") as mock_update:
+            with self.assertRaises(RateLimited):
+                self.test_requests.send(
+                    url=self.FAKE_URL,
+                    type=Requests.TYPE_GET
+                )
+
+            mock_update.assert_called_once_with(
+                self.FAKE_URL, None, 429, {"retry-after": "5"}
+            )
 
     @patch.object(Requests, "_get")
     def test_no_token(self, mock_get):
@@ -0,0 +1,93 @@
+import json
+import time
+import unittest
+from unittest.mock import patch, Mock
+import logging
+
+from talos.config import Settings
+from talos.api.token_broker import TokenBroker, BrokeredTokenSource
+from talos.api.token_pool import Token, TokenPool
+from talos.exceptions.api import TokenNotFound
+
+
+class TestTokenBroker(unittest.TestCase):
+    """
+    Coverage:
+        * top_up() mints tokens until TOKEN_QUEUE holds queue_depth tokens, each
+          published with REQUESTS_PER_TOKEN uses and a TTL
+        * top_up() mints nothing if the queue is full
+        * BrokeredTokenSource returns a Token with the lease's uses and expiry
+        * BrokeredTokenSource skips expired leases
+        * BrokeredTokenSource raises TokenNotFound if the queue is empty
+        * the TokenPool keeps the uses and expiry of Tokens from the source
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+    def test_top_up(self):
+        rabbitmq = Mock()
+        rabbitmq.get_message_count.return_value = 3
+
+        broker = TokenBroker(generate_token=lambda: "token", queue_depth=5)
+        self.assertEqual(broker.top_up(rabbitmq), 2)
+
+        self.assertEqual(rabbitmq.publish_message.call_count, 2)
+
+        kwargs = rabbitmq.publish_message.call_args.kwargs
+        lease = json.loads(kwargs["message"])
+
+        self.assertEqual(kwargs["queue_name"], Settings.TOKEN_QUEUE)
+        self.assertEqual(kwargs["expiration_ms"], Settings.TOKEN_LIFETIME_SECS * 1000)
+        self.assertEqual(lease["token"], "token")
+        self.assertEqual(lease["uses"], Settings.REQUESTS_PER_TOKEN)
+
+    def test_top_up_full(self):
+        rabbitmq = Mock()
+        rabbitmq.get_message_count.return_value = 6
+
+        broker = TokenBroker(generate_token=lambda: "token", queue_depth=5)
+        self.assertEqual(broker.top_up(rabbitmq), 0)
+
+        rabbitmq.publish_message.assert_not_called()
+
+    @patch("talos.queuing.rabbitmq.RabbitMQ.connect")
+    @patch("talos.queuing.rabbitmq.RabbitMQ.consume_one_message")
+    def test_source(self, mock_consume, mock_connect):
+        valid = {"token": "valid", "uses": 7, "expires_at": time.time() + 60}
+        expired = {"token": "expired", "uses": 7, "expires_at": time.time() - 1}
+
+        with self.subTest("consumes_token"):
+            mock_consume.side_effect = [json.dumps(valid)]
+
+            token = BrokeredTokenSource()()
+            self.assertEqual(token.value, "valid")
+            self.assertEqual(token.uses_remaining, 7)
+
+        with self.subTest("skips_expired"):
+            mock_consume.side_effect = [json.dumps(expired), json.dumps(valid)]
+
+            self.assertEqual(BrokeredTokenSource()().value, "valid")
+
+        with self.subTest("empty_queue"):
+            mock_consume.side_effect = [None]
+
+            with patch("talos.queuing.rabbitmq.RabbitMQ.disconnect") as mock_disconnect:
+                with self.assertRaises(TokenNotFound):
+                    BrokeredTokenSource()()
+
+                mock_disconnect.assert_called_once()
+
+    def test_pool_keeps_lease(self):
+        expires_at = time.time() + 600
+        pool = TokenPool(
+            generate_token=lambda: Token("token", 7, expires_at),
+            size=1,
+            refresh_ahead=0
+        )
+
+        pool._refill()
+
+        self.assertEqual(len(pool.tokens), 1)
+        self.assertEqual(pool.tokens[0].uses_remaining, 7)
+        self.assertEqual(pool.tokens[0].expires_at, expires_at)
@@ -0,0 +1,145 @@
+import time
+import unittest
+from unittest.mock import patch, Mock
+import logging
+
+from talos.api.token_pool import Token, TokenPool
+from talos.exceptions.api import InvalidTokenPoolConfig, TokenNotFound
+
+
+class TestTokenPool(unittest.TestCase):
+    """
+    The refresh thread is not started in these tests, _refill() is called
+    directly in its place.
+
+    Coverage:
+        * _refill() fills the pool with `size` tokens
+        * acquire() rotates between the tokens in the pool
+        * a token is never handed out more than requests_per_token times
+        * a token reaching refresh_ahead uses left is replaced ahead of time,
+          and the old token is kept until exhausted
+        * expired tokens are discarded
+        * a failed generation is reported, not raised
+        * _refill() generates at most `size` tokens, reporting a pool it couldn't
+          fill with healthy tokens
+        * a config under which no token would be healthy raises InvalidTokenPoolConfig
+        * acquire() on an empty pool raises TokenNotFound after the timeout
+        * with the refresh thread, acquire() blocks until the first token arrives
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        self.generated = 0
+
+        def generate_token():
+            self.generated += 1
+            return f"token-{self.generated}"
+
+        self.pool = TokenPool(
+            generate_token=generate_token,
+            size=2,
+            refresh_ahead=1,
+            requests_per_token=3,
+            token_lifetime_secs=3600
+        )
+
+        self.start_patcher = patch.object(TokenPool, "start")
+        self.start_patcher.start()
+
+    def tearDown(self):
+        patch.stopall()
+        self.pool.stop()
+
+    def test_refill(self):
+        self.assertTrue(self.pool._refill())
+
+        self.assertEqual(
+            [token.value for token in self.pool.tokens], ["token-1", "token-2"]
+        )
+
+    def test_rotation(self):
+        self.pool._refill()
+
+        self.assertEqual(self.pool.acquire(), "token-1")
+        self.assertEqual(self.pool.acquire(), "token-2")
+        self.assertEqual(self.pool.acquire(), "token-1")
+
+    def test_uses_limited(self):
+        self.pool._refill()
+
+        acquired = []
+        for _ in range(12):
+            self.pool._refill()
+            acquired.append(self.pool.acquire())
+
+        for value in set(acquired):
+            self.assertLessEqual(acquired.count(value), 3)
+
+    def test_refresh_ahead(self):
+        self.pool._refill()
+
+        # token-1 and token-2 both down to 1 use, i.e. at refresh_ahead
+        for _ in range(4):
+            self.pool.acquire()
+
+        self.assertTrue(self.pool._needs_refresh())
+        self.pool._refill()
+        self.assertEqual(self.generated, 4)
+
+        # old tokens are still handed out until exhausted
+        self.assertEqual(
+            [token.value for token in self.pool.tokens],
+            ["token-1", "token-2", "token-3", "token-4"]
+        )
+        self.assertFalse(self.pool._needs_refresh())
+
+    def test_expiry(self):
+        self.pool._refill()
+        self.pool.tokens[0].expires_at = time.time() - 1
+
+        self.assertEqual(self.pool.acquire(), "token-2")
+        self.assertEqual(len(self.pool.tokens), 1)
+
+    def test_failed_generation(self):
+        self.pool.generate_token = Mock(side_effect=Exception())
+
+        self.assertFalse(self.pool._refill())
+        self.assertEqual(self.pool.tokens, [])
+
+    def test_refill_capped(self):
+        self.pool.generate_token = Mock(side_effect=lambda: Token("near expiry", 3, time.time() + 30))
+
+        self.assertFalse(self.pool._refill())
+        self.assertEqual(self.pool.generate_token.call_count, 2)
+        self.assertEqual(len(self.pool.tokens), 2)
+
+    def test_invalid_config(self):
+        valid = {"size": 2, "refresh_ahead": 1, "requests_per_token": 3, "token_lifetime_secs": 3600}
+
+        for name, value in (("size", 0), ("refresh_ahead", 3), ("refresh_ahead", -1), ("token_lifetime_secs", TokenPool.EXPIRY_MARGIN_SECS)):
+            with self.subTest(name, value=value):
+                with self.assertRaises(InvalidTokenPoolConfig):
+                    TokenPool(generate_token=Mock(), **{**valid, name: value})
+
+    @patch.object(TokenPool, "ACQUIRE_TIMEOUT_SECS", 0)
+    def test_empty_pool_times_out(self):
+        with self.assertRaises(TokenNotFound):
+            self.pool.acquire()
+
+    def test_waits_for_first_token(self):
+        self.start_patcher.stop()
+
+        self.assertEqual(self.pool.acquire(), "token-1")
+
+
+class TestToken(unittest.TestCase):
+    def test_usable(self):
+        self.assertTrue(Token("token", 1, time.time() + 60).is_usable())
+        self.assertFalse(Token("token", 0, time.time() + 60).is_usable())
+        self.assertFalse(Token("token", 1, time.time() - 1).is_usable())
+
+    def test_healthy(self):
+        self.assertTrue(Token("token", 5, time.time() + 120).is_healthy(4, 60))
+        self.assertFalse(Token("token", 4, time.time() + 120).is_healthy(4, 60))
+        self.assertFalse(Token("token", 5, time.time() + 30).is_healthy(4, 60))
@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch, AsyncMock
+import logging
+
+from talos.components import AsyncConsumerComponent
+from talos.config import Settings
+
+
+class ConcreteAsyncConsumerComponent(AsyncConsumerComponent):
+    def handle_critical_error(self):
+        pass
+
+    async def _handle_one_pass(self, message):
+        pass
+
+
+class TestAsyncConsumerComponent(unittest.IsolatedAsyncioTestCase):
+    """
+    Coverage:
+        * __init__ sets the fields correctly in AsyncConsumerComponent
+        * _run() consumes from producing_queue with an AsyncRabbitMQ declared with the
+          producing and publishing queues, handling up to max_concurrency messages at once
+        * an exception raised while consuming causes route_error() to be called with it
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        self.test_component = ConcreteAsyncConsumerComponent(
+            retry_attempts=5,
+            time_between_attempts=0,
+            producing_queue='test_queue',
+            publishing_queues=('other_queue', 'test_queue')
+        )
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_init(self):
+        self.assertEqual(self.test_component.producing_queue, 'test_queue')
+        self.assertEqual(self.test_component.publishing_queues, ('other_queue',))
+        self.assertEqual(self.test_component.max_concurrency, Settings.ASYNC_CONSUMER_MAX_CONCURRENCY)
+
+    @patch("talos.queuing.async_rabbitmq.AsyncRabbitMQ.disconnect", new_callable=AsyncMock)
+    @patch("talos.queuing.async_rabbitmq.AsyncRabbitMQ.connect", new_callable=AsyncMock)
+    @patch("talos.queuing.async_rabbitmq.AsyncRabbitMQ.continually_consume_messages", new_callable=AsyncMock)
+    async def test_run(self, mock_consume, mock_connect, mock_disconnect):
+        await self.test_component._run()
+
+        self.assertEqual(self.test_component.rabbitmq.queues, ('test_queue', 'other_queue'))
+        mock_connect.assert_awaited_once()
+        mock_consume.assert_awaited_once_with(
+            queue_name=self.test_component.producing_queue,
+            callback_function=self.test_component.handle_one_pass_with_retry,
+            prefetch_count=self.test_component.max_concurrency
+        )
+        mock_disconnect.assert_awaited_once()
+
+    @patch("talos.queuing.async_rabbitmq.AsyncRabbitMQ.connect", new_callable=AsyncMock, side_effect=Exception)
+    async def test_error_propagation(self, mock_connect):
+        with patch.object(self.test_component, "route_error") as mock_route_error:
+            await self.test_component._run()
+
+        mock_route_error.assert_called_once()
+        self.assertIsInstance(mock_route_error.call_args.args[0], Exception)
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch, Mock
+import logging
+
+from talos.components import AsyncProducerComponent, BaseComponent
+from talos.exceptions.base import NonFatalException
+from talos.exceptions.components import DependenciesNotReadyException
+
+
+class StopRunning(Exception):
+    pass
+
+
+class ConcreteAsyncProducerComponent(AsyncProducerComponent):
+    def __init__(self, passes):
+        super().__init__(retry_attempts=3, time_between_attempts=0)
+        self.passes = passes
+
+    def handle_critical_error(self):
+        pass
+
+    async def _handle_one_pass(self):
+        self.passes.pop(0)()
+
+
+class TestAsyncProducerComponent(unittest.IsolatedAsyncioTestCase):
+    """
+    Coverage:
+        * handle_one_pass_with_retry() awaits _handle_one_pass(), retrying NonFatalExceptions
+          and reraising once retry_attempts is exceeded
+        * _run() continually runs one pass, an exception raised from a pass causes
+          route_error() to be called with it
+        * run() calls super().run() then runs _run() on an event loop
+        * run() refers DependenciesNotReadyException to route_error() without running _run()
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        # skips probing Postgres and RabbitMQ
+        self.mock_wait_until_ready = patch.object(BaseComponent, "wait_until_ready").start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    async def test_retry(self):
+        def fail():
+            raise NonFatalException()
+
+        with self.subTest("recovers"):
+            component = ConcreteAsyncProducerComponent([fail, fail, lambda: None])
+            await component.handle_one_pass_with_retry()
+
+            self.assertEqual(component.passes, [])
+
+        with self.subTest("exceeded"):
+            component = ConcreteAsyncProducerComponent([fail] * 3)
+
+            with self.assertRaises(NonFatalException):
+                await component.handle_one_pass_with_retry()
+
+    async def test_run_routes_errors(self):
+        component = ConcreteAsyncProducerComponent([lambda: None, Mock(side_effect=ValueError), Mock(side_effect=ValueError)])
+        # the second error breaks out of the loop
+        component.route_error = Mock(side_effect=[None, StopRunning()])
+
+        with self.assertRaises(StopRunning):
+            await component._run()
+
+        self.assertEqual(component.route_error.call_count, 2)
+        self.assertIsInstance(component.route_error.call_args_list[0].args[0], ValueError)
+
+    def test_run(self):
+        component = ConcreteAsyncProducerComponent([Mock(side_effect=ValueError)])
+
+        with patch.object(component, "route_error", side_effect=StopRunning):
+            with self.assertRaises(StopRunning):
+                component.run()
+
+        self.mock_wait_until_ready.assert_called_once()
+
+    def test_not_ready(self):
+        self.mock_wait_until_ready.side_effect = DependenciesNotReadyException(["postgres"], 0)
+        component = ConcreteAsyncProducerComponent([])
+
+        with patch.object(component, "route_error") as mock_route_error, \
+                patch.object(component, "_run") as mock_run:
+            component.run()
+
+        self.assertIsInstance(mock_route_error.call_args.args[0], DependenciesNotReadyException)
+        mock_run.assert_not_called()
@@ -1,16 +1,21 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 import logging
 
 from talos.components import BaseComponent
 from talos.exceptions.base import NonFatalException
+from talos.exceptions.components import DependenciesNotReadyException
 
 
 class ConcreteBaseComponent(BaseComponent):
     """
     Coverage:
         * __init__ sets the fields correctly in BaseComponent
-        * run() makes a log message and sleeps
+        * run() waits until the dependencies are ready
+        * wait_until_ready() probes until every dependency is ready, only re-probing
+          those which weren't, with a doubling backoff capped at STARTUP_MAX_BACKOFF_SECS
+        * wait_until_ready() raises DependenciesNotReadyException naming the dependencies
+          not ready within startup_timeout_secs
         * a NonFatalException followed by success results in two calls,
           i.e. we retry a NonFatalException in _handle_one_pass
         * if `retry_attempts` NonFatalExceptions are raised, then we reraise
@@ -37,13 +42,37 @@ class TestBaseComponent(unittest.TestCase):
         self.assertEqual(self.test_component.retry_attempts, 5)
         self.assertEqual(self.test_component.time_between_attempts, 0)
 
-    @patch('time.sleep')
-    @patch.object(logging.getLogger("talos.logger"), 'info')
-    def test_run_calls_logger_and_sleep(self, mock_info, mock_sleep):
+    @patch.object(ConcreteBaseComponent, 'wait_until_ready')
+    def test_run_waits_until_ready(self, mock_wait_until_ready):
         self.test_component.run()
 
-        mock_info.assert_called_once()
-        mock_sleep.assert_called_once()
+        mock_wait_until_ready.assert_called_once()
+
+    @patch('talos.components.base_component.time.sleep')
+    def test_wait_until_ready(self, mock_sleep):
+        postgres = Mock(side_effect=[False, False, True])
+        rabbitmq = Mock(side_effect=[False, True])
+        self.test_component.readiness_probes = lambda: {"postgres": postgres, "rabbitmq": rabbitmq}
+        self.test_component.STARTUP_MAX_BACKOFF_SECS = 0.75
+
+        self.test_component.wait_until_ready()
+
+        self.assertEqual(postgres.call_count, 3)
+        self.assertEqual(rabbitmq.call_count, 2)
+        self.assertEqual(
+            [call.args[0] for call in mock_sleep.call_args_list],
+            [0.5, 0.75]
+        )
+
+    def test_wait_until_ready_timeout(self):
+        self.test_component.readiness_probes = lambda: {"postgres": lambda: True, "rabbitmq": lambda: False}
+        self.test_component.startup_timeout_secs = 0
+
+        with self.assertRaises(DependenciesNotReadyException) as context:
+            self.test_component.wait_until_ready()
+
+        self.assertIn("rabbitmq", str(context.exception))
+        self.assertNotIn("postgres", str(context.exception))
 
     @patch.object(ConcreteBaseComponent, '_handle_one_pass', side_effect=[NonFatalException, None])
     def test_retry_on_non_fatal(self, mock_handle_one_pass):
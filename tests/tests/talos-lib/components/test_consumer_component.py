@@ -1,8 +1,13 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 import logging
+import threading
 
-from talos.components import ConsumerComponent
+from talos.components import BaseComponent, ConsumerComponent
+from talos.config import Settings
+from talos.exceptions.base import NonFatalException
+from talos.exceptions.components import DependenciesNotReadyException
+from talos.exceptions.queuing import RabbitMQNonFatalException
 
 
 class ConcreteConsumerComponent(ConsumerComponent):
@@ -18,11 +23,18 @@ class TestConsumerComponent(unittest.TestCase):
     Coverage:
         * __init__ sets the fields correctly in ConsumerComponent
         * run() calls super().run()  and calls RabbitMQ.continually_consume_messages()
-          with the correct parameters
+          with the correct parameters, including the prefetch count and workers
         * RabbitMQ(...) context manager created with correct parameter(s)
         * an exception raised from handle_one_pass_with_retry() causes route_error()
           to be called with the exception as a parameter
         * route_error() being called results in handle_critical_error() being called
+        * run() refers DependenciesNotReadyException to route_error() without consuming
+        * in batch mode, run() calls RabbitMQ.continually_consume_batches() with handle_batch_with_retry()
+        * _handle_batch() handles each message in turn by default, requeueing those which
+          raise a NonFatalException
+        * get_rabbitmq() reuses one RabbitMQ instance, declared with the producing
+          and publishing queues, and reconnects only if the connection was lost, and only
+          on the connection's own thread, raising RabbitMQNonFatalException on a worker
     """
 
     def setUp(self):
@@ -34,18 +46,18 @@ class TestConsumerComponent(unittest.TestCase):
 
         logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
 
-        # stops 30s sleeps for the test case
-        self.mock_sleep = patch(
-            "talos.components.base_component.time.sleep", return_value=None
-        ).start()
+        # skips probing Postgres and RabbitMQ
+        self.mock_wait_until_ready = patch.object(BaseComponent, "wait_until_ready").start()
 
     def tearDown(self):
-        self.mock_sleep.reset_mock()
+        patch.stopall()
 
     def test_init(self):
         self.assertEqual(self.test_component.retry_attempts, 5)
         self.assertEqual(self.test_component.time_between_attempts, 0)
         self.assertEqual(self.test_component.producing_queue, 'test_queue')
+        self.assertEqual(self.test_component.prefetch_count, Settings.CONSUMER_PREFETCH_COUNT)
+        self.assertEqual(self.test_component.workers, Settings.CONSUMER_WORKERS)
 
     @patch("talos.queuing.rabbitmq.RabbitMQ.continually_consume_messages", return_value=None)
     @patch.object(logging.getLogger("talos.logger"), 'info')
@@ -55,14 +67,48 @@ class TestConsumerComponent(unittest.TestCase):
 
         # from super().__init__
         mock_logger.assert_called_once()
-        self.mock_sleep.assert_called_once()
+        self.mock_wait_until_ready.assert_called_once()
 
         # primary purpose of class, consumption
         mock_consume.assert_called_once_with(
             queue_name=self.test_component.producing_queue,
-            callback_function=self.test_component.handle_one_pass_with_retry
+            callback_function=self.test_component.handle_one_pass_with_retry,
+            prefetch_count=self.test_component.prefetch_count,
+            workers=self.test_component.workers
         )
 
+    @patch("talos.queuing.rabbitmq.RabbitMQ.continually_consume_batches", return_value=None)
+    def test_run_batches(self, mock_consume):
+        component = ConcreteConsumerComponent(
+            retry_attempts=5,
+            time_between_attempts=0,
+            producing_queue='test_queue',
+            batch_size=3
+        )
+
+        with patch("talos.queuing.rabbitmq.RabbitMQ.connect"):
+            component.run()
+
+        mock_consume.assert_called_once_with(
+            queue_name=component.producing_queue,
+            callback_function=component.handle_batch_with_retry,
+            batch_size=3,
+            batch_window_ms=Settings.CONSUMER_BATCH_WINDOW_MS,
+            prefetch_count=component.prefetch_count,
+            workers=component.workers
+        )
+
+    def test_handle_batch(self):
+        def handle(message):
+            if message == b"bad":
+                raise NonFatalException()
+
+        with patch.object(self.test_component, "_handle_one_pass", side_effect=handle) as mock_handle:
+            outcomes = self.test_component.handle_batch_with_retry([b"m1", b"bad", b"m3"])
+
+        self.assertEqual(outcomes, [True, False, True])
+        self.assertEqual(mock_handle.call_count, 3)
+
     @patch("talos.queuing.rabbitmq.RabbitMQ.__init__")
     def test_rabbitmq_params(self, mock_rabbitmq):
         with patch("talos.queuing.rabbitmq.RabbitMQ.connect") as mock_connect:
@@ -72,6 +118,16 @@ class TestConsumerComponent(unittest.TestCase):
             (self.test_component.producing_queue,)
         )
 
+    @patch.object(ConcreteConsumerComponent, "route_error")
+    @patch("talos.components.consumer_component.RabbitMQ")
+    def test_not_ready(self, mock_rabbitmq, mock_route_error):
+        self.mock_wait_until_ready.side_effect = DependenciesNotReadyException(["rabbitmq"], 0)
+
+        self.test_component.run()
+
+        self.assertIsInstance(mock_route_error.call_args.args[0], DependenciesNotReadyException)
+        mock_rabbitmq.assert_not_called()
+
     @patch.object(ConcreteConsumerComponent, "route_error")
     @patch.object(ConcreteConsumerComponent, "handle_one_pass_with_retry", side_effect=Exception)
     def test_error_propagation(self, mock_handle_pass, mock_route_error):
@@ -83,6 +139,45 @@ class TestConsumerComponent(unittest.TestCase):
             mock_route_error.call_args.args[0], Exception
         )
 
+    @patch("pika.BlockingConnection")
+    def test_get_rabbitmq(self, mock_connection):
+        component = ConcreteConsumerComponent(
+            retry_attempts=5,
+            time_between_attempts=0,
+            producing_queue='test_queue',
+            publishing_queues=('other_queue', 'test_queue')
+        )
+
+        rabbitmq = component.get_rabbitmq()
+        self.assertIs(component.get_rabbitmq(), rabbitmq)
+        self.assertEqual(rabbitmq.queues, ('test_queue', 'other_queue'))
+        mock_connection.assert_called_once()
+
+        with self.subTest("reconnect"):
+            rabbitmq.connection.is_open = False
+            rabbitmq.connection.is_closed = True
+
+            self.assertIs(component.get_rabbitmq(), rabbitmq)
+            self.assertEqual(mock_connection.call_count, 2)
+
+        with self.subTest("lost on a worker thread"):
+            rabbitmq.connection.is_open = False
+            rabbitmq.connection.is_closed = True
+            outcome = []
+
+            def worker():
+                try:
+                    component.get_rabbitmq()
+                except RabbitMQNonFatalException:
+                    outcome.append("requeued")
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+            self.assertEqual(outcome, ["requeued"])
+            self.assertEqual(mock_connection.call_count, 2)
+
     @patch.object(ConcreteConsumerComponent, "handle_critical_error")
     def test_error_handling(self, mock_handle_error):
         self.test_component.route_error(Exception)
@@ -2,7 +2,8 @@ import unittest
 from unittest.mock import patch
 import logging
 
-from talos.components import ProducerComponent
+from talos.components import BaseComponent, ProducerComponent
+from talos.exceptions.components import DependenciesNotReadyException
 
 
 class ConcreteProducerComponent(ProducerComponent):
@@ -21,6 +22,7 @@ class TestProducerComponent(unittest.TestCase):
         * an exception raised from handle_one_pass() causes route_error() to be
           called with the exception as a parameter
         * route_error() being called results in handle_fatal_error() being called
+        * run() refers DependenciesNotReadyException to route_error() without running a pass
 
     The last two are duplicates of TestConsumerComponent, or vice versa, this is because
     the logic for error propogation lays in BaseComponent, but testing it requires
@@ -35,13 +37,11 @@ class TestProducerComponent(unittest.TestCase):
 
         logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
 
-        # stops 30s sleeps for the test case
-        self.mock_sleep = patch(
-            "talos.components.base_component.time.sleep", return_value=None
-        ).start()
+        # skips probing Postgres and RabbitMQ
+        self.mock_wait_until_ready = patch.object(BaseComponent, "wait_until_ready").start()
 
     def tearDown(self):
-        self.mock_sleep.stop()
+        patch.stopall()
 
     def test_init(self):
         self.assertEqual(self.test_component.retry_attempts, 5)
@@ -58,7 +58,7 @@ class TestProducerComponent(unittest.TestCase):
 
         # from super().__init__
         mock_logger.assert_called_once()
-        self.mock_sleep.assert_called_once()
+        self.mock_wait_until_ready.assert_called_once()
 
         # primary purpose of class, consumption
         mock_one_pass.assert_called_once()
@@ -76,6 +76,16 @@ class TestProducerComponent(unittest.TestCase):
             mock_route_error.call_args.args[0], Exception
         )
 
+    @patch.object(ConcreteProducerComponent, "route_error")
+    @patch.object(ConcreteProducerComponent, "handle_one_pass_with_retry")
+    def test_not_ready(self, mock_one_pass, mock_route_error):
+        self.mock_wait_until_ready.side_effect = DependenciesNotReadyException(["postgres"], 0)
+
+        self.test_component.run()
+
+        self.assertIsInstance(mock_route_error.call_args.args[0], DependenciesNotReadyException)
+        mock_one_pass.assert_not_called()
+
     @patch.object(ConcreteProducerComponent, "handle_critical_error")
     def test_error_handling(self, mock_handle_error):
         self.test_component.route_error(Exception)
@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+import logging
+
+from talos.components import BaseComponent, Supervisor
+from talos.config import Settings
+from talos.exceptions.components import ConnectionBudgetExceeded
+
+
+class ConcreteComponent(BaseComponent):
+    """
+    Reports its pid to `events`, then exits with `exit_code`,
+    or keeps running if it is None.
+    """
+
+    def __init__(self, events: multiprocessing.Queue, exit_code: int = None):
+        super().__init__(retry_attempts=1, time_between_attempts=0)
+        self.events = events
+        self.exit_code = exit_code
+
+    def handle_critical_error(self):
+        pass
+
+    def _handle_one_pass(self):
+        pass
+
+    def run(self):
+        self.events.put(os.getpid())
+
+        if self.exit_code is None:
+            # not time.sleep(), which other tests patch
+            threading.Event().wait(60)
+
+        sys.exit(self.exit_code)
+
+
+class TestSupervisor(unittest.TestCase):
+    """
+    Workers are real forked processes.
+
+    Coverage:
+        * `workers` defaults to one per core when 0
+        * workers whose database pools could exceed `db_connection_budget` raise
+          ConnectionBudgetExceeded
+        * each worker runs the component in its own process
+        * a worker which exits is restarted
+        * workers exiting soon after starting are restarted after a doubling backoff,
+          reset once a worker stays up for MIN_UPTIME_SECS
+        * stop() terminates the workers
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        self.events = multiprocessing.get_context("fork").Queue()
+
+    def _collect(self, supervisor: Supervisor, n: int):
+        events = []
+        deadline = time.monotonic() + 10
+
+        while len(events) < n and time.monotonic() < deadline:
+            supervisor.supervise_once(timeout=0.05)
+            while not self.events.empty():
+                events.append(self.events.get())
+
+        return events
+
+    def test_workers(self):
+        supervisor = Supervisor(ConcreteComponent(self.events), workers=0, db_connection_budget=10 ** 6)
+        self.assertEqual(supervisor.workers, multiprocessing.cpu_count())
+
+    def test_connection_budget(self):
+        Supervisor(ConcreteComponent(self.events), workers=2, db_connection_budget=2 * Settings.DB_POOL_MAX_SIZE)
+
+        with self.assertRaises(ConnectionBudgetExceeded):
+            Supervisor(ConcreteComponent(self.events), workers=3, db_connection_budget=2 * Settings.DB_POOL_MAX_SIZE)
+
+    def test_restart(self):
+        supervisor = Supervisor(ConcreteComponent(self.events, exit_code=1), workers=2)
+        supervisor.MAX_BACKOFF_SECS = 0
+
+        for index in range(2):
+            supervisor._start(index)
+
+        events = self._collect(supervisor, 4)[:4]
+        supervisor.stop()
+
+        self.assertEqual(len(events), 4)
+        self.assertEqual(len(set(events)), 4)
+        self.assertNotIn(os.getpid(), events)
+
+    def test_backoff(self):
+        supervisor = Supervisor(ConcreteComponent(self.events), workers=1)
+        process = Mock(pid=1, exitcode=1)
+
+        backoffs = []
+        for uptime in (1, 1, 1, supervisor.MIN_UPTIME_SECS + 1):
+            supervisor._started_at[0] = 1000 - uptime
+            supervisor._schedule_restart(0, process, now=1000)
+            backoffs.append(supervisor._restart_at[0] - 1000)
+
+        self.assertEqual(backoffs, [1, 3, 7, 0])
+        self.assertIsNone(supervisor.processes[0])
+
+    def test_stop(self):
+        supervisor = Supervisor(ConcreteComponent(self.events), workers=2)
+
+        for index in range(2):
+            supervisor._start(index)
+        self._collect(supervisor, 2)
+
+        supervisor.stop()
+
+        for process in supervisor.processes:
+            self.assertFalse(process.is_alive())
+            self.assertEqual(process.exitcode, -signal.SIGTERM)
@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch, Mock
+import logging
+import threading
+
+import psycopg2.extensions
+
+from talos.db import AsyncDatabase, ContextDatabase, TransactionalDatabase
+from talos.db.base_database import BaseDatabase
+from talos.db.pool import DatabasePool
+
+
+class TestAsyncDatabase(unittest.IsolatedAsyncioTestCase):
+    """
+    Coverage:
+        * run() calls the function with a connected ContextDatabase and the args, off
+          the event loop's thread, and returns its result, returning the connection
+          to the pool
+        * run_transaction() commits if the function returns, and rolls back and
+          reraises if it raises
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        self.pool = DatabasePool(BaseDatabase.CONFIG, min_size=1, max_size=2, max_lifetime_secs=60)
+        patch("talos.db.base_database.get_pool", return_value=self.pool).start()
+
+        self.mock_connect = patch("psycopg2.connect").start()
+        self.mock_connect.return_value.closed = False
+        self.mock_connect.return_value.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        self.mock_connect.return_value.cursor.return_value.closed = False
+        self.database = AsyncDatabase(max_concurrency=2)
+
+    def tearDown(self):
+        self.database.close()
+        patch.stopall()
+
+    async def test_run(self):
+        def function(cdb, value):
+            self.assertIsInstance(cdb, ContextDatabase)
+            self.assertIsNotNone(cdb.cursor)
+            return value, threading.get_ident()
+
+        value, thread = await self.database.run(function, 4)
+
+        self.assertEqual(value, 4)
+        self.assertNotEqual(thread, threading.get_ident())
+        self.mock_connect.return_value.close.assert_not_called()
+        self.assertEqual(len(self.pool.idle), 1)
+
+    async def test_run_transaction(self):
+        connection = self.mock_connect.return_value
+
+        with self.subTest("commit"):
+            self.assertEqual(await self.database.run_transaction(lambda tdb: type(tdb)), TransactionalDatabase)
+
+            connection.commit.assert_called_once()
+            connection.rollback.assert_not_called()
+
+        with self.subTest("rollback"):
+            with self.assertRaises(ValueError):
+                await self.database.run_transaction(Mock(side_effect=ValueError))
+
+            connection.rollback.assert_called_once()
@@ -1,9 +1,12 @@
 import unittest
 from unittest.mock import patch, MagicMock, Mock
 import logging
+from datetime import datetime
 
+from talos.config import Settings
 from talos.db.base_database import BaseDatabase
-from talos.exceptions.db import DatabaseNotInitialisedException
+from talos.db.pool import DatabasePool
+from talos.exceptions.db import DatabaseFatalException, DatabaseNotInitialisedException
 from talos.logger import logger
 
 
@@ -16,17 +19,33 @@ class TestBaseDatabase(unittest.TestCase):
         * __init__ fields are set
         * connect() sets connection and cursor
         * connect() is idemptotent, calling it twice no error
-        * disconnect() closes connection and cursor <- poorly implemented
-        * disconnect() is idempotent <- poorly implemented
+        * connect() checks out a new connection if the one held was closed
+        * disconnect() closes the cursor and returns the connection to the pool
+        * disconnect() is idempotent
         * fetchone() relays to psycopg2 fetchone
         * fetchall() relays to psycopg2 fetchall
         * commit() relays to psycopg2 commit
+        * insert_rows() relays to execute_values with a multi-row INSERT, with a
+          template and RETURNING, and doesn't query for no rows
+        * copy_rows() streams the rows to COPY FROM STDIN in its text format,
+          escaping values, and doesn't query for no rows
+        * insert_rows() skips or updates rows which conflict on the `on_conflict`
+          columns, inserts every row without them, and raises on `update` without them
+        * iter_rows() executes the query on a named cursor, yields its rows a chunk
+          of `batch_size` at a time, and closes the cursor, also when the caller
+          stops early
         * _validate_connection raises exception when no connection
         * commit, fetchone, fetchall, call _validate_connection
     """
     def setUp(self):
         logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
 
+        self.pool = DatabasePool(BaseDatabase.CONFIG, min_size=1, max_size=2, max_lifetime_secs=60)
+        patch("talos.db.base_database.get_pool", return_value=self.pool).start()
+
+    def tearDown(self):
+        patch.stopall()
+
     def test_init_sets_fields(self):
         db = BaseDatabase()
 
@@ -55,31 +74,48 @@ class TestBaseDatabase(unittest.TestCase):
         mock_connect.assert_called_once_with(**db.CONFIG)
 
     @patch("psycopg2.connect")
-    def test_disconnect_closes_objects(self, mock_connect):
+    def test_connect_replaces_closed(self, mock_connect):
+        mock_connect.side_effect = lambda **config: MagicMock(closed=0)
+
         db = BaseDatabase()
         db.connect()
-        # this pretty stupid basically guarantees the assert
-        db.cursor.closed = False
-        db.connection.closed = False
+        closed = db.connection
+        closed.closed = 1
+        db.connect()
+
+        self.assertEqual(mock_connect.call_count, 2)
+        self.assertIsNot(db.connection, closed)
+        closed.close.assert_called_once()
+
+    @patch("psycopg2.connect")
+    def test_disconnect_returns_connection(self, mock_connect):
+        mock_connect.return_value.closed = 0
+        mock_connect.return_value.cursor.return_value.closed = False
+
+        db = BaseDatabase()
+        db.connect()
+        connection, cursor = db.connection, db.cursor
         db.disconnect()
 
-        db.connection.close.assert_called_once()
-        db.cursor.close.assert_called_once()
+        cursor.close.assert_called_once()
+        connection.close.assert_not_called()
+        self.assertEqual([entry[0] for entry in self.pool.idle], [connection])
+        self.assertIsNone(db.connection)
+        self.assertIsNone(db.cursor)
 
     @patch('psycopg2.connect')
     def test_disconnect_idempotency(self, mock_connect):
+        mock_connect.return_value.closed = 0
+        mock_connect.return_value.cursor.return_value.closed = False
+
         db = BaseDatabase()
         db.connect()
-        # this also pretty stupid basically guarantees the assert
-        db.cursor.closed = False
-        db.connection.closed = False
+        cursor = db.cursor
         db.disconnect()
-        db.cursor.closed = True
-        db.connection.closed = True
         db.disconnect()
 
-        db.connection.close.assert_called_once()
-        db.cursor.close.assert_called_once()
+        cursor.close.assert_called_once()
+        self.assertEqual(len(self.pool.idle), 1)
 
     @patch('psycopg2.connect')
     def test_fetchone(self, mock_connect):
@@ -105,6 +141,125 @@ class TestBaseDatabase(unittest.TestCase):
 
         db.connection.commit.assert_called_once()
 
+    @patch("psycopg2.extras.execute_values")
+    @patch("psycopg2.connect")
+    def test_insert_rows(self, mock_connect, mock_execute_values):
+        db = BaseDatabase()
+        db.connect()
+
+        with self.subTest("no rows"):
+            self.assertEqual(db.insert_rows("comments", ("id", "data"), []), [])
+            mock_execute_values.assert_not_called()
+
+        with self.subTest("rows"):
+            self.assertEqual(db.insert_rows("comments", ("id", "data"), [("a", "{}"), ("b", "{}")], page_size=50), [])
+            mock_execute_values.assert_called_once_with(
+                db.cursor,
+                "INSERT INTO comments (id, data) VALUES %s",
+                [("a", "{}"), ("b", "{}")],
+                template=None,
+                page_size=50,
+                fetch=False
+            )
+
+        with self.subTest("returning"):
+            mock_execute_values.reset_mock()
+            mock_execute_values.return_value = [(1, "a")]
+
+            inserted = db.insert_rows("rescans", ("post_id", "seen"), [("a",)], template="(%s, NOW())", returning=("id", "post_id"))
+
+            self.assertEqual(inserted, [(1, "a")])
+            mock_execute_values.assert_called_once_with(
+                db.cursor,
+                "INSERT INTO rescans (post_id, seen) VALUES %s RETURNING id, post_id",
+                [("a",)],
+                template="(%s, NOW())",
+                page_size=Settings.DB_INSERT_PAGE_SIZE,
+                fetch=True
+            )
+
+    @patch("psycopg2.connect")
+    def test_copy_rows(self, mock_connect):
+        copied = []
+        db = BaseDatabase()
+        db.connect()
+        db.cursor.copy_expert.side_effect = lambda query, data: copied.append((query, data.read()))
+
+        db.copy_rows("comments", ("id", "parent_id", "data", "seen"), iter([]))
+        db.cursor.copy_expert.assert_not_called()
+
+        db.copy_rows("comments", ("id", "parent_id", "data", "seen"), iter([
+            ("a", None, '{"body": "tab\\there\\nline\tend"}', True),
+            (7, "a", "{}", datetime(2024, 1, 2, 3, 4, 5)),
+        ]))
+
+        self.assertEqual(copied, [(
+            "COPY comments (id, parent_id, data, seen) FROM STDIN",
+            'a\t\\N\t{"body": "tab\\\\there\\\\nline\\tend"}\tt\n'
+            "7\ta\t{}\t2024-01-02T03:04:05\n"
+        )])
+
+    @patch("psycopg2.extras.execute_values")
+    @patch("psycopg2.connect")
+    def test_upsert(self, mock_connect, mock_execute_values):
+        db = BaseDatabase()
+        db.connect()
+
+        with self.subTest("insert_rows skips"):
+            db.insert_rows("posts", ("id", "data"), [("a", "{}")], on_conflict=("id",))
+
+            self.assertEqual(
+                mock_execute_values.call_args.args[1],
+                "INSERT INTO posts (id, data) VALUES %s ON CONFLICT (id) DO NOTHING"
+            )
+
+        with self.subTest("insert_rows updates"):
+            db.insert_rows("posts", ("id", "rescan", "data"), [("a", 1, "{}")], returning=("id",), on_conflict=("id", "rescan"), update=("data",))
+
+            self.assertEqual(
+                mock_execute_values.call_args.args[1],
+                "INSERT INTO posts (id, rescan, data) VALUES %s ON CONFLICT (id, rescan) DO UPDATE SET data = EXCLUDED.data RETURNING id"
+            )
+
+        with self.subTest("no conflict keys"):
+            db.insert_rows("posts", ("id", "data"), [("a", "{}")], on_conflict=())
+
+            self.assertEqual(mock_execute_values.call_args.args[1], "INSERT INTO posts (id, data) VALUES %s")
+
+        with self.subTest("update without on_conflict"):
+            with self.assertRaises(DatabaseFatalException):
+                db.insert_rows("posts", ("id", "data"), [("a", "{}")], update=("data",))
+
+    @patch("psycopg2.connect")
+    def test_iter_rows(self, mock_connect):
+        db = BaseDatabase()
+        db.connect()
+        db.connection.closed = 0
+        named = db.connection.cursor.return_value
+        named.closed = False
+
+        with self.subTest("all chunks"):
+            named.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+            chunks = list(db.iter_rows("SELECT id FROM t WHERE x=%s", ("y",), batch_size=2))
+
+            self.assertEqual(chunks, [[(1,), (2,)], [(3,)]])
+            self.assertTrue(db.connection.cursor.call_args.kwargs["name"])
+            named.execute.assert_called_once_with("SELECT id FROM t WHERE x=%s", ("y",))
+            named.fetchmany.assert_called_with(2)
+            named.close.assert_called_once()
+
+        with self.subTest("stopped early"):
+            named.reset_mock()
+            named.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+            rows = db.iter_rows("SELECT id FROM t", batch_size=2)
+            self.assertEqual(next(rows), [(1,), (2,)])
+            rows.close()
+
+            named.fetchmany.assert_called_once_with(2)
+            named.close.assert_called_once()
+
     def test_validate_connection(self):
         db = BaseDatabase()
 
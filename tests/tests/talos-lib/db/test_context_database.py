@@ -4,6 +4,8 @@ from unittest.mock import patch, Mock
 import logging
 
 from talos.db import ContextDatabase
+from talos.db.base_database import BaseDatabase
+from talos.db.pool import DatabasePool
 
 class TestContextDatabase(unittest.TestCase):
     """
@@ -24,6 +26,12 @@ class TestContextDatabase(unittest.TestCase):
     def setUp(self):
         logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
 
+        pool = DatabasePool(BaseDatabase.CONFIG, min_size=1, max_size=2, max_lifetime_secs=60)
+        patch("talos.db.base_database.get_pool", return_value=pool).start()
+
+    def tearDown(self):
+        patch.stopall()
+
     @patch("talos.db.base_database.BaseDatabase.connect")
     def test_enter(self, mock_connect):
         db = ContextDatabase()
@@ -51,25 +59,28 @@ class TestContextDatabase(unittest.TestCase):
             db = ContextDatabase()
             with db:
                 db.execute("SELECT * FROM table", auto_commit=False)
+                cursor, connection = db.cursor, db.connection
 
-            db.cursor.execute.assert_called_with("SELECT * FROM table", None)
-            db.connection.commit.assert_not_called()
+            cursor.execute.assert_called_with("SELECT * FROM table", None)
+            connection.commit.assert_not_called()
 
         with self.subTest(msg="execute_with_param"):
             db = ContextDatabase()
             with db:
                 db.execute("SELECT * FROM table WHERE x=%s", ("y",), auto_commit=False)
+                cursor, connection = db.cursor, db.connection
 
-            db.cursor.execute.assert_called_with("SELECT * FROM table WHERE x=%s", ("y",))
-            db.connection.commit.assert_not_called()
+            cursor.execute.assert_called_with("SELECT * FROM table WHERE x=%s", ("y",))
+            connection.commit.assert_not_called()
     
         with self.subTest(msg="execute_with_auto_commit"):
             db = ContextDatabase()
             with db:
                 db.execute("SELECT * FROM table", auto_commit=True)
+                cursor, connection = db.cursor, db.connection
 
-            db.cursor.execute.assert_called_with("SELECT * FROM table", None)
-            db.connection.commit.assert_called_once()
+            cursor.execute.assert_called_with("SELECT * FROM table", None)
+            connection.commit.assert_called_once()
 
        
 
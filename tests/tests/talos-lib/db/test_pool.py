@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+
+import psycopg2
+import psycopg2.extensions
+
+from talos.db import DatabasePool
+from talos.exceptions.db import *
+
+
+class TestDatabasePool(unittest.TestCase):
+    """
+    Coverage:
+        * checkout() connects lazily and reuses the connection after checkin()
+        * no more than `max_size` connections are opened, checkout() raises
+          DatabasePoolExhausted once they are all checked out for ACQUIRE_TIMEOUT_SECS
+        * checkin() rolls back an open transaction, and closes a connection which
+          was closed, is in an unknown state or has outlived `max_lifetime_secs`
+        * a connection idle for HEALTH_CHECK_IDLE_SECS is probed, and replaced if
+          the probe fails
+        * idle connections beyond `min_size` are closed after MAX_IDLE_SECS
+        * close() closes the idle connections
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        def open_connection(**config):
+            connection = MagicMock(closed=0)
+            connection.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+            return connection
+
+        self.mock_connect = patch("psycopg2.connect", side_effect=open_connection).start()
+        self.mock_time = patch("talos.db.pool.time.monotonic", return_value=1000.0).start()
+
+        self.pool = DatabasePool({"database": "talos"}, min_size=1, max_size=2, max_lifetime_secs=600)
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_reuse(self):
+        first = self.pool.checkout()
+        self.pool.checkin(first)
+        second = self.pool.checkout()
+
+        self.assertIs(first, second)
+        self.mock_connect.assert_called_once_with(database="talos")
+
+    def test_size(self):
+        self.pool.ACQUIRE_TIMEOUT_SECS = 0
+        first, second = self.pool.checkout(), self.pool.checkout()
+
+        self.assertIsNot(first, second)
+        with self.assertRaises(DatabasePoolExhausted):
+            self.pool.checkout()
+
+        self.pool.checkin(first)
+        self.assertIs(self.pool.checkout(), first)
+        self.assertEqual(self.mock_connect.call_count, 2)
+
+    def test_checkin(self):
+        with self.subTest("in transaction"):
+            connection = self.pool.checkout()
+            connection.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_INERROR
+            self.pool.checkin(connection)
+
+            connection.rollback.assert_called_once()
+            connection.close.assert_not_called()
+            self.assertIs(self.pool.checkout(), connection)
+            connection.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+            self.pool.checkin(connection)
+
+        for name in ("closed", "unknown", "expired"):
+            with self.subTest(name):
+                connection = self.pool.checkout()
+                connection.close.reset_mock()
+                if name == "closed":
+                    connection.closed = 1
+                elif name == "unknown":
+                    connection.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+                else:
+                    self.mock_time.return_value += 601
+
+                self.pool.checkin(connection)
+
+                connection.close.assert_called_once()
+                self.assertEqual(self.pool.idle, [])
+                self.assertEqual(self.pool._created, 0)
+
+    def test_health_check(self):
+        connection = self.pool.checkout()
+        self.pool.checkin(connection)
+        self.mock_time.return_value += self.pool.HEALTH_CHECK_IDLE_SECS + 1
+
+        with self.subTest("healthy"):
+            self.assertIs(self.pool.checkout(), connection)
+            connection.cursor.return_value.__enter__.return_value.execute.assert_called_once_with("SELECT 1")
+            self.pool.checkin(connection)
+
+        with self.subTest("failed"):
+            self.mock_time.return_value += self.pool.HEALTH_CHECK_IDLE_SECS + 1
+            connection.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError()
+
+            replacement = self.pool.checkout()
+
+            self.assertIsNot(replacement, connection)
+            connection.close.assert_called_once()
+            self.assertEqual(self.mock_connect.call_count, 2)
+
+    def test_prune(self):
+        first, second = self.pool.checkout(), self.pool.checkout()
+        self.pool.checkin(first)
+        self.mock_time.return_value += self.pool.MAX_IDLE_SECS + 1
+        self.pool.checkin(second)
+
+        first.close.assert_called_once()
+        second.close.assert_not_called()
+        self.assertEqual([entry[0] for entry in self.pool.idle], [second])
+
+    def test_close(self):
+        connection = self.pool.checkout()
+        self.pool.checkin(connection)
+        self.pool.close()
+
+        connection.close.assert_called_once()
+        self.assertEqual(self.pool.idle, [])
+        self.assertEqual(self.pool._created, 0)
@@ -3,6 +3,8 @@ from unittest.mock import patch, Mock
 import logging
 
 from talos.db import TransactionalDatabase
+from talos.db.base_database import BaseDatabase
+from talos.db.pool import DatabasePool
 from talos.exceptions.db import DatabaseFatalException
 
 class TestTransactionalDatabase(unittest.TestCase):
@@ -21,6 +23,12 @@ class TestTransactionalDatabase(unittest.TestCase):
     def setUp(self):
         logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
 
+        pool = DatabasePool(BaseDatabase.CONFIG, min_size=1, max_size=2, max_lifetime_secs=60)
+        patch("talos.db.base_database.get_pool", return_value=pool).start()
+
+    def tearDown(self):
+        patch.stopall()
+
     @patch("talos.db.base_database.BaseDatabase._validate_connection")
     @patch("talos.db.transactional_database.TransactionalDatabase.rollback_transaction")
     @patch("talos.db.transactional_database.TransactionalDatabase.begin_transaction")
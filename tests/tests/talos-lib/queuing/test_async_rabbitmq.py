@@ -0,0 +1,106 @@
+import asyncio
+import queue
+import threading
+import unittest
+from unittest.mock import patch, Mock
+import logging
+
+import pika
+
+from talos.queuing import AsyncRabbitMQ
+from talos.exceptions.queuing import *
+
+
+class TestAsyncRabbitMQ(unittest.IsolatedAsyncioTestCase):
+    """
+    The mocked channel delivers the messages once consuming starts, then services
+    the callbacks added with add_callback_threadsafe() like BlockingConnection does.
+
+    Coverage:
+        * connect() and disconnect() run on the connection's thread
+        * continually_consume_messages() awaits the callback for every message at
+          once, up to prefetch_count, and acks each once awaited
+        * publishing from a callback is carried out on the connection's thread
+        * an exception raised by the callback nacks its message and is raised
+          as a RabbitMQFatalException
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        self.connection = patch("pika.BlockingConnection").start().return_value
+        self.channel = self.connection.channel.return_value
+        self.channel_threads = set()
+        self.settled = {}
+
+        callbacks = queue.Queue()
+        stopped = threading.Event()
+
+        def process_data_events(time_limit):
+            try:
+                callbacks.get(timeout=time_limit)()
+            except queue.Empty:
+                pass
+
+        def start_consuming():
+            self.channel_threads.add(threading.get_ident())
+            on_message = self.channel.basic_consume.call_args.kwargs["on_message_callback"]
+            for tag, body in enumerate(self.bodies, start=1):
+                on_message(self.channel, Mock(delivery_tag=tag), pika.BasicProperties(), body)
+
+            while not stopped.is_set() and len(self.settled) < len(self.bodies):
+                process_data_events(time_limit=1)
+
+        def record(outcome):
+            def settle(delivery_tag, **kwargs):
+                self.channel_threads.add(threading.get_ident())
+                self.settled[delivery_tag] = outcome
+            return settle
+
+        self.connection.add_callback_threadsafe.side_effect = callbacks.put
+        self.connection.process_data_events.side_effect = process_data_events
+        self.channel.start_consuming.side_effect = start_consuming
+        self.channel.stop_consuming.side_effect = stopped.set
+        self.channel.basic_ack.side_effect = record("ack")
+        self.channel.basic_nack.side_effect = record("nack")
+        self.channel.basic_publish.side_effect = lambda **kwargs: self.channel_threads.add(threading.get_ident())
+
+    def tearDown(self):
+        patch.stopall()
+
+    async def test_consume(self):
+        self.bodies = [b"m1", b"m2", b"m3", b"m4"]
+        in_flight = []
+        all_in_flight = asyncio.Event()
+
+        async with AsyncRabbitMQ("queue1") as q:
+            async def callback(message):
+                in_flight.append(message)
+                if len(in_flight) == len(self.bodies):
+                    all_in_flight.set()
+
+                # only passed if every message is handled at once
+                await asyncio.wait_for(all_in_flight.wait(), timeout=5)
+                await q.publish_message("queue1", message)
+
+            await q.continually_consume_messages("queue1", callback, prefetch_count=4)
+
+        self.channel.basic_qos.assert_called_once_with(prefetch_count=4)
+        self.assertEqual(self.settled, {1: "ack", 2: "ack", 3: "ack", 4: "ack"})
+        self.assertEqual(self.channel.basic_publish.call_count, 4)
+        # the thread which connected
+        self.assertEqual(len(self.channel_threads), 1)
+        self.assertNotIn(threading.get_ident(), self.channel_threads)
+
+    async def test_error(self):
+        self.bodies = [b"m1", b"bad"]
+
+        async def callback(message):
+            if message == b"bad":
+                raise InterruptedError()
+
+        async with AsyncRabbitMQ("queue1") as q:
+            with self.assertRaises(RabbitMQFatalException):
+                await q.continually_consume_messages("queue1", callback, prefetch_count=2)
+
+        self.assertEqual(self.settled[2], "nack")
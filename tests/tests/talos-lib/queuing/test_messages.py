@@ -0,0 +1,112 @@
+import json
+import unittest
+
+from talos.exceptions.queuing import UnknownMessageFormat
+from talos.queuing.messages import PostRescanType, COMPACT_HEADERS, encode_post_rescan, decode_post_rescan, post_rescan_priority
+
+
+class TestMessages(unittest.TestCase):
+    """
+    Coverage:
+        * each type of post rescan message round trips in both formats, with the
+          API request rebuilt from the IDs and token of a compact message
+        * JSON messages as queued before the compact format, and version 1 compact
+          messages, are still decoded, with a depth of 0
+        * compact messages are smaller than JSON ones
+        * decode_post_rescan() raises UnknownMessageFormat on an unknown version
+          or a truncated message
+        * post_rescan_priority() puts base rescans first, then nested sections deepest
+          first, within 0 and max_priority
+    """
+    MESSAGES = {
+        PostRescanType.BASE: (
+            {"post_id": "t3_abc", "post_rescans_id": 2 ** 40, "type": PostRescanType.BASE},
+            {
+                "post_id": "t3_abc",
+                "post_rescans_id": 2 ** 40,
+                "type": "base",
+                "depth": 0,
+                "api_request": {
+                    "url": "https://gateway.reddit.com/desktopapi/v1/postcomments/t3_abc",
+                    "method": 0
+                }
+            }
+        ),
+        PostRescanType.MORE: (
+            {"post_id": "t3_abc", "post_rescans_id": 7, "type": PostRescanType.MORE, "token": "tökén", "depth": 3},
+            {
+                "post_id": "t3_abc",
+                "post_rescans_id": 7,
+                "type": "more",
+                "depth": 3,
+                "api_request": {
+                    "url": "https://gateway.reddit.com/desktopapi/v1/morecomments/t3_abc",
+                    "method": 1,
+                    "body": {
+                        "token": "tökén"
+                    }
+                }
+            }
+        ),
+        PostRescanType.CONTINUE: (
+            {"post_id": "t3_abc", "post_rescans_id": 7, "type": PostRescanType.CONTINUE, "parent_id": "t1_def", "depth": 1},
+            {
+                "post_id": "t3_abc",
+                "post_rescans_id": 7,
+                "type": "continue",
+                "depth": 1,
+                "api_request": {
+                    "url": "https://gateway.reddit.com/desktopapi/v1/postcomments/t3_abc/t1_def",
+                    "method": 0
+                }
+            }
+        ),
+    }
+
+    def test_round_trip(self):
+        for type, (arguments, expected) in self.MESSAGES.items():
+            for format in ("compact", "json"):
+                with self.subTest(type=type.name, format=format):
+                    message = encode_post_rescan(**arguments, format=format)
+
+                    self.assertIsInstance(message, bytes if format == "compact" else str)
+                    self.assertEqual(decode_post_rescan(message), expected)
+
+    def test_legacy(self):
+        for type, (_, expected) in self.MESSAGES.items():
+            expected = {**expected, "depth": 0}
+
+            with self.subTest(type.name, format="json"):
+                legacy = {key: value for key, value in expected.items() if key != "depth"}
+                self.assertEqual(decode_post_rescan(json.dumps(legacy).encode("utf-8")), expected)
+
+        with self.subTest(format="compact version 1"):
+            message = COMPACT_HEADERS[1].pack(1, PostRescanType.CONTINUE, 7) + b"\x00\x06t3_abc\x00\x06t1_def"
+            self.assertEqual(decode_post_rescan(message), {**self.MESSAGES[PostRescanType.CONTINUE][1], "depth": 0})
+
+    def test_size(self):
+        for type, (arguments, _) in self.MESSAGES.items():
+            with self.subTest(type.name):
+                compact = encode_post_rescan(**arguments, format="compact")
+                legacy = encode_post_rescan(**arguments, format="json").encode("utf-8")
+
+                self.assertLess(len(compact) * 3, len(legacy))
+
+    def test_unknown(self):
+        message = encode_post_rescan(**self.MESSAGES[PostRescanType.MORE][0], format="compact")
+
+        for name, data in (("version", b"\x09" + message[1:]), ("type", message[:1] + b"\x09" + message[2:]), ("truncated", message[:-1])):
+            with self.subTest(name):
+                with self.assertRaises(UnknownMessageFormat):
+                    decode_post_rescan(data)
+
+    def test_priority(self):
+        priorities = [
+            post_rescan_priority(PostRescanType.BASE, depth=0, max_priority=5),
+            post_rescan_priority(PostRescanType.MORE, depth=9, max_priority=5),
+            post_rescan_priority(PostRescanType.CONTINUE, depth=2, max_priority=5),
+            post_rescan_priority(PostRescanType.MORE, depth=1, max_priority=5),
+        ]
+
+        self.assertEqual(priorities, [5, 4, 2, 1])
+        self.assertEqual(post_rescan_priority(PostRescanType.MORE, depth=3, max_priority=0), 0)
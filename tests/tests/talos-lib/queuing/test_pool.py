@@ -0,0 +1,130 @@
+import threading
+import unittest
+from unittest.mock import patch, Mock
+import logging
+
+import pika
+
+from talos.queuing import RabbitMQ, RabbitMQPool
+from talos.exceptions.queuing import *
+
+
+class TestRabbitMQPool(unittest.TestCase):
+    """
+    Coverage:
+        * acquire() connects lazily and reuses the connection on the next checkout
+        * the exchange and each queue are declared once per connection
+        * no more than `size` connections are opened, acquire() raises
+          PoolExhausted once they are all checked out for ACQUIRE_TIMEOUT_SECS
+        * a connection which fails its health check is reopened
+        * an instance checked out when an exception is raised is discarded
+        * close() disconnects the idle instances
+        * an instance checked out on another thread than the one which connected it
+          publishes directly, rather than waiting on the connection's old thread
+    """
+
+    def setUp(self):
+        logging.getLogger("talos.logger").setLevel(logging.CRITICAL)
+
+        def open_connection(parameters):
+            connection = Mock(is_open=True, is_closed=False)
+            connection.channel.side_effect = lambda: Mock(is_open=True, is_closed=False)
+            return connection
+
+        self.mock_connection = patch("pika.BlockingConnection", side_effect=open_connection).start()
+
+        self.pool = RabbitMQPool(size=2)
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_reuse(self):
+        with self.pool.acquire(("queue1",)) as first:
+            pass
+
+        with self.pool.acquire(("queue1", "queue2")) as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(self.mock_connection.call_count, 1)
+        self.assertEqual(second.queues, ("queue1", "queue2"))
+
+    @patch("talos.queuing.rabbitmq.RabbitMQ._declare_queue")
+    @patch("talos.queuing.rabbitmq.RabbitMQ._declare_exchange")
+    def test_declarations_cached(self, mock_declare_exchange, mock_declare_queue):
+        for _ in range(3):
+            with self.pool.acquire("queue1") as rabbitmq:
+                rabbitmq.connect()
+
+        mock_declare_exchange.assert_called_once()
+        mock_declare_queue.assert_called_once_with("queue1")
+
+    def test_size(self):
+        self.pool.ACQUIRE_TIMEOUT_SECS = 0.01
+
+        with self.pool.acquire("queue1") as first, self.pool.acquire("queue1") as second:
+            self.assertIsNot(first, second)
+
+            with self.assertRaises(PoolExhausted):
+                with self.pool.acquire("queue1"):
+                    pass
+
+        self.assertEqual(self.mock_connection.call_count, 2)
+
+    def test_health_check(self):
+        with self.pool.acquire("queue1") as rabbitmq:
+            lost = rabbitmq.connection
+
+        def lose_connection(time_limit):
+            lost.is_open, lost.is_closed = False, True
+            raise pika.exceptions.StreamLostError()
+
+        lost.process_data_events.side_effect = lose_connection
+
+        with self.pool.acquire("queue1") as rabbitmq:
+            self.assertIsNot(rabbitmq.connection, lost)
+
+        self.assertEqual(self.mock_connection.call_count, 2)
+
+    def test_discard(self):
+        with self.assertRaises(InterruptedError):
+            with self.pool.acquire("queue1") as rabbitmq:
+                raise InterruptedError()
+
+        rabbitmq.connection.close.assert_called_once()
+        self.assertEqual(self.pool.idle, [])
+
+        with self.pool.acquire("queue1") as other:
+            self.assertIsNot(other, rabbitmq)
+
+    def test_close(self):
+        with self.pool.acquire("queue1") as rabbitmq:
+            pass
+
+        self.pool.close()
+
+        rabbitmq.connection.close.assert_called_once()
+        self.assertEqual(self.pool.idle, [])
+
+    def test_threads(self):
+        # fails fast rather than after 60 seconds if handed to the old thread
+        patch.object(RabbitMQ, "THREADSAFE_TIMEOUT_SECS", 0.01).start()
+        instances = []
+        errors = []
+
+        def publish():
+            try:
+                with self.pool.acquire("queue1") as rabbitmq:
+                    rabbitmq.publish_message("queue1", "message")
+                    instances.append(rabbitmq)
+            except Exception as e:
+                errors.append(e)
+
+        for _ in range(2):
+            thread = threading.Thread(target=publish)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertIs(instances[0], instances[1])
+        self.assertEqual(instances[0].channel.basic_publish.call_count, 2)
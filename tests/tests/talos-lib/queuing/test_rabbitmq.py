@@ -1,7 +1,11 @@
+import queue
+import threading
 import unittest
+from datetime import datetime, timezone
 from unittest.mock import patch, Mock
 
 import logging
+from talos.config import Settings
 from talos.queuing import RabbitMQ
 from talos.exceptions.queuing import *
 import pika
@@ -16,10 +20,31 @@ class TestRabbitMQ(unittest.TestCase):
         * tests object __init__ sets correct fields, accept string/tuple queues
         * test connect() creates a BlockingConnection with correct config,
           declares the respective queues and exchanges
+        * connect() declares the exchange and each queue once per connection
+        * queues in MAX_PRIORITIES are declared with x-max-priority, and a queue which
+          exists with other arguments is used as declared, on a new channel
         * test that disconnect() closes the channel and connection object
         * tests __enter__ and __exit__ function accordingly, connecting and disconnecting
         * tests _validate_connection() and _validate_queue() functionality
         * tests that required funcs call _validate_connection()
+        * get_message_count() passively declares the queue
+        * publish_batch() publishes on a confirm mode channel, returns per-message
+          outcomes from (multiple) acks and nacks, keeps at most `window`
+          messages unconfirmed, at least one for a window below 1, and sets each message's priority; publish_messages()
+          raises PublishNotConfirmed if any message is not confirmed
+        * publish_batch() waits CONFIRM_TIMEOUT_SECS from the latest confirm, stops
+          publishing once it passes, and raises if confirm mode isn't selected
+        * publish_delayed() publishes messages not yet due into the delay queue with the
+          longest TTL (a power of two seconds, capped) within their delay, dead-lettering
+          into the queue, and messages due within a second into the queue itself
+        * consumers republish a delayed message received over a second early into a
+          delay queue for the remainder, without its dead-letter headers, and ack it
+        * continually_consume_messages() with workers handles messages concurrently,
+          (n)acks and publishes on the connection's thread, and raises the first
+          exception from the callback once the messages in flight are settled
+        * continually_consume_batches() hands over batches of up to batch_size, or
+          what arrived within the window, (n)acks each message by its outcome and
+          nacks the whole batch if the callback raises
     (E2E)
         * use publish_message
         * use publish_messages
@@ -66,6 +91,45 @@ class TestRabbitMQ(unittest.TestCase):
         mock_declare_exchange.assert_called_once()
         mock_declare_queue.assert_called_once_with("queue")
 
+    @patch("talos.queuing.rabbitmq.RabbitMQ._declare_queue")
+    @patch("talos.queuing.rabbitmq.RabbitMQ._declare_exchange")
+    @patch("pika.BlockingConnection")
+    def test_connect_caches_declarations(self, mock_connection, mock_declare_exchange, mock_declare_queue):
+        q = RabbitMQ(("queue1", "queue2"))
+        q.connect()
+
+        # a second instance on the same connection, e.g. after the channel was lost
+        other = RabbitMQ(("queue2", "queue3"))
+        other.connection = q.connection
+        other.connect()
+
+        mock_declare_exchange.assert_called_once()
+        self.assertEqual(
+            [c.args[0] for c in mock_declare_queue.call_args_list],
+            ["queue1", "queue2", "queue3"]
+        )
+
+    @patch.object(RabbitMQ, "MAX_PRIORITIES", {"queue1": 5})
+    @patch("pika.BlockingConnection")
+    def test_declare_priority_queue(self, mock_connection):
+        with self.subTest("declared"):
+            with RabbitMQ(("queue1", "queue2")) as q:
+                q.channel.queue_declare.assert_any_call(queue="queue1", durable=True, arguments={"x-max-priority": 5})
+                q.channel.queue_declare.assert_any_call(queue="queue2", durable=True, arguments=None)
+
+        with self.subTest("exists"):
+            # a new connection, on which nothing is declared yet
+            mock_connection.return_value = Mock()
+            channel, fallback = Mock(), Mock()
+            channel.queue_declare.side_effect = pika.exceptions.ChannelClosedByBroker(406, "PRECONDITION_FAILED")
+            mock_connection.return_value.channel.side_effect = [channel, fallback]
+
+            with RabbitMQ("queue1") as q:
+                self.assertIs(q.channel, fallback)
+
+            fallback.queue_declare.assert_called_once_with(queue="queue1", passive=True)
+            fallback.queue_bind.assert_called_once()
+
     @patch("talos.queuing.rabbitmq.RabbitMQ._declare_queue")
     @patch("talos.queuing.rabbitmq.RabbitMQ._declare_exchange")
     @patch("pika.BlockingConnection")
@@ -92,6 +156,314 @@ class TestRabbitMQ(unittest.TestCase):
         mock_connect.assert_called_once()
         mock_disconnect.assert_called_once()
 
+    @patch("pika.BlockingConnection")
+    def test_get_message_count(self, mock_connection):
+        channel = mock_connection.return_value.channel.return_value
+        channel.queue_declare.return_value.method.message_count = 4
+
+        with RabbitMQ("queue1") as q:
+            self.assertEqual(q.get_message_count("queue1"), 4)
+
+        channel.queue_declare.assert_called_with(queue="queue1", passive=True)
+
+    def _mock_confirms(self, mock_connection, nacked=()):
+        """
+        Makes the mocked confirm channel ack (or nack) everything published
+        whenever data events are processed, recording the most in flight.
+        """
+        channel, confirm_channel = Mock(), Mock()
+        mock_connection.return_value.channel.side_effect = [channel, confirm_channel]
+
+        published = []
+        state = {"confirmed": 0, "max_in_flight": 0, "priorities": [], "routing_keys": [], "headers": []}
+
+        def confirm_delivery(ack_nack_callback, callback):
+            state["on_confirm"] = ack_nack_callback
+            callback(Mock())
+
+        def basic_publish(**kwargs):
+            published.append(kwargs["body"])
+            state["priorities"].append(kwargs["properties"].priority)
+            state["routing_keys"].append(kwargs["routing_key"])
+            state["headers"].append(kwargs["properties"].headers)
+            state["max_in_flight"] = max(state["max_in_flight"], len(published) - state["confirmed"])
+
+        def process_data_events(time_limit):
+            for tag in range(state["confirmed"] + 1, len(published) + 1):
+                method = pika.spec.Basic.Nack(tag) if tag in nacked else pika.spec.Basic.Ack(tag)
+                state["on_confirm"](Mock(method=method))
+            state["confirmed"] = len(published)
+
+        confirm_channel._impl.confirm_delivery.side_effect = confirm_delivery
+        confirm_channel._impl.basic_publish.side_effect = basic_publish
+        mock_connection.return_value.process_data_events.side_effect = process_data_events
+
+        return published, state
+
+    @patch("pika.BlockingConnection")
+    def test_publish_batch(self, mock_connection):
+        with self.subTest("outcomes"):
+            published, state = self._mock_confirms(mock_connection, nacked=(2,))
+
+            with RabbitMQ("queue1") as q:
+                outcomes = q.publish_batch("queue1", ["m1", "m2", "m3"], window=2)
+
+            self.assertEqual(published, ["m1", "m2", "m3"])
+            self.assertEqual(outcomes, [True, False, True])
+            self.assertLessEqual(state["max_in_flight"], 2)
+
+        with self.subTest("no window"):
+            published, state = self._mock_confirms(mock_connection)
+
+            with RabbitMQ("queue1") as q:
+                outcomes = q.publish_batch("queue1", ["m1", "m2"], window=0)
+
+            self.assertEqual(outcomes, [True, True])
+            self.assertEqual(state["max_in_flight"], 1)
+
+        with self.subTest("multiple"):
+            published, state = self._mock_confirms(mock_connection)
+            mock_connection.return_value.process_data_events.side_effect = lambda time_limit: \
+                state["on_confirm"](Mock(method=pika.spec.Basic.Ack(len(published), multiple=True)))
+
+            with RabbitMQ("queue1") as q:
+                self.assertEqual(q.publish_batch("queue1", ["m1", "m2", "m3"]), [True] * 3)
+
+        with self.subTest("priorities"):
+            published, state = self._mock_confirms(mock_connection)
+
+            with RabbitMQ("queue1") as q:
+                q.publish_batch("queue1", ["m1", "m2", "m3"])
+                q.publish_messages("queue1", ["m4", "m5"], priorities=[5, 1])
+
+            self.assertEqual(state["priorities"], [None, None, None, 5, 1])
+
+        with self.subTest("publish_messages"):
+            self._mock_confirms(mock_connection, nacked=(1,))
+
+            with RabbitMQ("queue1") as q:
+                with self.assertRaises(PublishNotConfirmed):
+                    q.publish_messages("queue1", ["m1", "m2"])
+
+        with self.subTest("empty"):
+            self._mock_confirms(mock_connection)
+
+            with RabbitMQ("queue1") as q:
+                self.assertEqual(q.publish_batch("queue1", []), [])
+
+    @patch("talos.queuing.rabbitmq.time.monotonic")
+    @patch("pika.BlockingConnection")
+    def test_publish_batch_timeout(self, mock_connection, mock_monotonic):
+        clock = [0]
+        mock_monotonic.side_effect = lambda: clock[0]
+
+        with self.subTest("progress resets the deadline"):
+            published, state = self._mock_confirms(mock_connection)
+
+            def confirm_oldest(time_limit):
+                clock[0] += RabbitMQ.CONFIRM_TIMEOUT_SECS * 2 / 3
+                state["on_confirm"](Mock(method=pika.spec.Basic.Ack(state["confirmed"] + 1)))
+                state["confirmed"] += 1
+
+            mock_connection.return_value.process_data_events.side_effect = confirm_oldest
+
+            with RabbitMQ("queue1") as q:
+                self.assertEqual(q.publish_batch("queue1", ["m1", "m2", "m3", "m4"], window=1), [True] * 4)
+
+        with self.subTest("no progress stops publishing"):
+            published, state = self._mock_confirms(mock_connection)
+
+            def stall(time_limit):
+                clock[0] += time_limit
+
+            mock_connection.return_value.process_data_events.side_effect = stall
+
+            with RabbitMQ("queue1") as q:
+                self.assertEqual(q.publish_batch("queue1", ["m1", "m2", "m3", "m4"], window=2), [False] * 4)
+
+            self.assertEqual(published, ["m1", "m2"])
+
+        with self.subTest("confirm mode not selected"):
+            _, confirm_channel = Mock(), Mock()
+            mock_connection.return_value.channel.side_effect = [Mock(), confirm_channel]
+
+            with RabbitMQ("queue1") as q:
+                with self.assertRaises(RabbitMQNonFatalException):
+                    q.publish_batch("queue1", ["m1"])
+
+            confirm_channel._impl.basic_publish.assert_not_called()
+
+    @patch("talos.queuing.rabbitmq.time.time", return_value=1_000_000)
+    @patch("pika.BlockingConnection")
+    def test_publish_delayed(self, mock_connection, mock_time):
+        _, state = self._mock_confirms(mock_connection)
+
+        due_at = [datetime.fromtimestamp(1_000_000 + delay, timezone.utc) for delay in (0.5, 10, 2 ** 30)]
+
+        with RabbitMQ("queue1") as q:
+            channel = q.channel
+            outcomes = q.publish_delayed("queue1", ["m1", "m2", "m3"], due_at, priorities=[5, 5, 5])
+
+        self.assertEqual(outcomes, [True] * 3)
+        self.assertEqual(state["routing_keys"], ["queue1", "queue1.delay.8s", f"queue1.delay.{2 ** RabbitMQ.MAX_DELAY_EXPONENT}s"])
+        self.assertEqual(state["priorities"], [5, 5, 5])
+        self.assertEqual(
+            [headers[RabbitMQ.DUE_AT_HEADER] for headers in state["headers"]],
+            [1_000_000_500, 1_000_010_000, (1_000_000 + 2 ** 30) * 1000]
+        )
+        channel.queue_declare.assert_any_call(
+            queue="queue1.delay.8s",
+            durable=True,
+            arguments={
+                "x-message-ttl": 8000,
+                "x-dead-letter-exchange": Settings.RABBITMQ_EXCHANGE_NAME,
+                "x-dead-letter-routing-key": "queue1",
+            }
+        )
+
+    @patch("talos.queuing.rabbitmq.time.time", return_value=1_000_000)
+    @patch("pika.BlockingConnection")
+    def test_hold_until_due(self, mock_connection, mock_time):
+        with RabbitMQ("queue1") as q:
+            with self.subTest("early"):
+                properties = pika.BasicProperties(priority=5, headers={
+                    RabbitMQ.DUE_AT_HEADER: 1_000_100_000,
+                    "x-death": [{"queue": "queue1.delay.64s"}],
+                    "x-first-death-queue": "queue1.delay.64s",
+                    "x-last-death-reason": "expired",
+                })
+
+                self.assertTrue(q._hold_until_due("queue1", Mock(delivery_tag=1), properties, b"m1"))
+
+                kwargs = q.channel.basic_publish.call_args.kwargs
+                self.assertEqual(kwargs["routing_key"], "queue1.delay.64s")
+                self.assertEqual(kwargs["body"], b"m1")
+                self.assertEqual(kwargs["properties"].priority, 5)
+                self.assertEqual(kwargs["properties"].headers, {RabbitMQ.DUE_AT_HEADER: 1_000_100_000})
+                q.channel.basic_ack.assert_called_once_with(delivery_tag=1)
+
+            with self.subTest("due"):
+                properties = pika.BasicProperties(headers={RabbitMQ.DUE_AT_HEADER: 1_000_000_500})
+                self.assertFalse(q._hold_until_due("queue1", Mock(delivery_tag=2), properties, b"m2"))
+
+            with self.subTest("not delayed"):
+                self.assertFalse(q._hold_until_due("queue1", Mock(delivery_tag=3), pika.BasicProperties(), b"m3"))
+
+            q.channel.basic_publish.assert_called_once()
+
+    def _mock_consumer(self, mock_connection, bodies):
+        """
+        Makes the mocked channel deliver `bodies` once consuming starts, then service
+        the callbacks added with add_callback_threadsafe() until every delivery is
+        settled or consuming is stopped. Records the thread each channel call is made on.
+        """
+        connection = mock_connection.return_value
+        channel = connection.channel.return_value
+        callbacks = queue.Queue()
+        state = {"settled": {}, "threads": set(), "stopped": False}
+
+        def process_data_events(time_limit):
+            try:
+                callbacks.get(timeout=time_limit)()
+            except queue.Empty:
+                pass
+
+        def start_consuming():
+            on_message = channel.basic_consume.call_args.kwargs["on_message_callback"]
+            for tag, body in enumerate(bodies, start=1):
+                on_message(channel, Mock(delivery_tag=tag), pika.BasicProperties(), body)
+
+            while not state["stopped"] and len(state["settled"]) < len(bodies):
+                process_data_events(time_limit=1)
+
+        def settle(outcome):
+            def record(delivery_tag, **kwargs):
+                state["threads"].add(threading.get_ident())
+                state["settled"][delivery_tag] = outcome
+            return record
+
+        def stop_consuming():
+            state["stopped"] = True
+
+        def call_later(delay, callback):
+            timer = threading.Timer(delay, callbacks.put, [callback])
+            timer.start()
+            return timer
+
+        connection.add_callback_threadsafe.side_effect = callbacks.put
+        connection.call_later.side_effect = call_later
+        connection.remove_timeout.side_effect = lambda timer: timer.cancel()
+        connection.process_data_events.side_effect = process_data_events
+        channel.start_consuming.side_effect = start_consuming
+        channel.stop_consuming.side_effect = stop_consuming
+        channel.basic_ack.side_effect = settle("ack")
+        channel.basic_nack.side_effect = settle("nack")
+        channel.basic_publish.side_effect = lambda **kwargs: state["threads"].add(threading.get_ident())
+
+        return channel, state
+
+    @patch("pika.BlockingConnection")
+    def test_consume_concurrently(self, mock_connection):
+        with self.subTest("concurrent"):
+            channel, state = self._mock_consumer(mock_connection, [b"m1", b"m2", b"m3", b"m4"])
+            # only passed if two messages are handled at once
+            barrier = threading.Barrier(2, timeout=5)
+
+            with RabbitMQ("queue1") as q:
+                def callback(message):
+                    barrier.wait()
+                    q.publish_message("queue1", message)
+
+                q.continually_consume_messages("queue1", callback, prefetch_count=4, workers=2)
+
+            channel.basic_qos.assert_called_once_with(prefetch_count=4)
+            self.assertEqual(state["settled"], {1: "ack", 2: "ack", 3: "ack", 4: "ack"})
+            self.assertEqual(channel.basic_publish.call_count, 4)
+            self.assertEqual(state["threads"], {threading.get_ident()})
+
+        with self.subTest("error"):
+            channel, state = self._mock_consumer(mock_connection, [b"m1", b"bad", b"m3"])
+
+            def callback(message):
+                if message == b"bad":
+                    raise InterruptedError()
+
+            with RabbitMQ("queue1") as q:
+                with self.assertRaises(RabbitMQFatalException):
+                    q.continually_consume_messages("queue1", callback, prefetch_count=3, workers=2)
+
+            channel.stop_consuming.assert_called_once()
+            self.assertEqual(state["settled"][2], "nack")
+
+    @patch("pika.BlockingConnection")
+    def test_consume_batches(self, mock_connection):
+        for workers in (1, 2):
+            with self.subTest("outcomes", workers=workers):
+                channel, state = self._mock_consumer(mock_connection, [b"m1", b"m2", b"m3", b"m4", b"m5"])
+                batches = []
+
+                def callback(messages):
+                    batches.append(messages)
+                    return [message != b"m3" for message in messages]
+
+                with RabbitMQ("queue1") as q:
+                    q.continually_consume_batches("queue1", callback, batch_size=2, batch_window_ms=50, prefetch_count=5, workers=workers)
+
+                self.assertEqual(sorted(batches), [[b"m1", b"m2"], [b"m3", b"m4"], [b"m5"]])
+                self.assertEqual(state["settled"], {1: "ack", 2: "ack", 3: "nack", 4: "ack", 5: "ack"})
+                self.assertEqual(state["threads"], {threading.get_ident()})
+                channel.stop_consuming.assert_not_called()
+
+        with self.subTest("error"):
+            channel, state = self._mock_consumer(mock_connection, [b"m1", b"m2"])
+
+            with RabbitMQ("queue1") as q:
+                with self.assertRaises(RabbitMQFatalException):
+                    q.continually_consume_batches("queue1", Mock(side_effect=InterruptedError), batch_size=2, batch_window_ms=50, prefetch_count=2)
+
+            self.assertEqual(state["settled"], {1: "nack", 2: "nack"})
+            channel.stop_consuming.assert_called_once()
+
     def test_validate_connection(self):
         with self.assertRaises(NotInitialisedException):
             q = RabbitMQ(("queue",))
@@ -0,0 +1,62 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from talos.exceptions.config import UnknownSerializer
+from talos.util import serialization
+from talos.util.serialization import get_serializer, SERIALIZERS
+
+
+class TestSerialization(unittest.TestCase):
+    """
+    Coverage:
+        * every installed backend round trips str and bytes, including non-ASCII
+        * every installed backend returns str from dumps()
+        * every installed backend raises json.JSONDecodeError on invalid JSON
+        * get_serializer() prefers orjson, then ujson, and falls back to the stdlib,
+          with a warning if a named backend is not installed, and raises
+          UnknownSerializer on a name which is not a backend
+    """
+    DATA = {
+        "comments": {"t1_abc": {"id": "t1_abc", "parentId": None, "score": 12, "text": "héllo 👋"}},
+        "nested": [1, 2.5, True, None, []]
+    }
+
+    def test_round_trip(self):
+        for name, serializer in SERIALIZERS.items():
+            with self.subTest(name):
+                dumped = serializer.dumps(self.DATA)
+
+                self.assertIsInstance(dumped, str)
+                self.assertEqual(serializer.loads(dumped), self.DATA)
+                self.assertEqual(serializer.loads(dumped.encode("utf-8")), self.DATA)
+                self.assertEqual(json.loads(dumped), self.DATA)
+
+    def test_invalid(self):
+        for name, serializer in SERIALIZERS.items():
+            for data in ("<html>", b"<html>", b"{\"a\": "):
+                with self.subTest(name=name, data=data):
+                    with self.assertRaises(json.JSONDecodeError):
+                        serializer.loads(data)
+
+    def test_get_serializer(self):
+        with self.subTest("auto"):
+            expected = next(name for name in serialization.PREFERENCE if name in SERIALIZERS)
+            self.assertEqual(get_serializer("auto").name, expected)
+
+        with self.subTest("json"):
+            self.assertEqual(get_serializer("json").name, "json")
+
+        with self.subTest("not installed"):
+            with patch.dict(SERIALIZERS, clear=True, json=SERIALIZERS["json"]):
+                with patch.object(serialization, "logger") as mock_logger:
+                    self.assertEqual(get_serializer("orjson").name, "json")
+
+            mock_logger.warning.assert_called_once()
+
+        with self.subTest("unknown"):
+            with self.assertRaises(UnknownSerializer):
+                get_serializer("orjosn")
+
+    def test_module_functions(self):
+        self.assertEqual(serialization.loads(serialization.dumps(self.DATA)), self.DATA)